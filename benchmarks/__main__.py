@@ -0,0 +1,65 @@
+from benchmarks.harness import compare, load_results, save_results
+from benchmarks.suite import BENCHMARKS
+from typing import List
+from argparse import ArgumentParser
+import sys
+
+
+def run(args) -> int:
+    results = {}
+    for name in args.only or list(BENCHMARKS):
+        for case, result in BENCHMARKS[name](args.warmup, args.repeat).items():
+            results[case] = result
+            print(
+                f"{case:32} median {result['median'] * 1000:9.3f} ms"
+                f"  p95 {result['p95'] * 1000:9.3f} ms"
+            )
+    if args.output:
+        save_results(args.output, results)
+    if args.baseline:
+        return report(load_results(args.baseline), results, args.threshold)
+    return 0
+
+
+def report(baseline: dict, current: dict, threshold: float) -> int:
+    regressions = 0
+    for name, before, after, ratio, regressed in compare(baseline, current, threshold):
+        flag = "REGRESSION" if regressed else ""
+        print(
+            f"{name:32} {before * 1000:9.3f} ms -> {after * 1000:9.3f} ms"
+            f"  x{ratio:.2f} {flag}"
+        )
+        regressions += regressed
+    return 1 if regressions else 0
+
+
+def main(argv: List[str]) -> int:
+    parser = ArgumentParser(
+        prog="python -m benchmarks",
+        description="Times the simulation and rendering of the game.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS))
+    run_parser.add_argument("--warmup", type=int, default=2)
+    run_parser.add_argument("--repeat", type=int, default=10)
+    run_parser.add_argument("--output", help="save the results as JSON")
+    run_parser.add_argument("--baseline", help="compare with saved results")
+    run_parser.add_argument("--threshold", type=float, default=0.2)
+
+    compare_parser = commands.add_parser("compare", help="compare saved results")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+
+    args = parser.parse_args(argv[1:])
+    if args.command == "run":
+        return run(args)
+    return report(
+        load_results(args.baseline), load_results(args.current), args.threshold
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,96 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from math import ceil
+from statistics import median
+import json
+import platform
+import sys
+import time
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Returns the sample below which the fraction of the samples lies,
+    by the nearest rank.
+    """
+
+    ordered = sorted(samples)
+    return ordered[max(ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def measure(
+    run: Callable[..., object],
+    setup: Optional[Callable[[], tuple]] = None,
+    warmup: int = 2,
+    repeat: int = 10,
+) -> Dict[str, float]:
+    """
+    Times the function, called with the arguments returned by setup,
+    which is called anew before every run and not timed.
+    The first warmup runs are not counted.
+    Returns the median, the 95th percentile and the fastest run
+    in seconds, and the number of runs counted.
+    """
+
+    samples = []
+    for number in range(warmup + repeat):
+        arguments = setup() if setup is not None else ()
+        start = time.perf_counter()
+        run(*arguments)
+        elapsed = time.perf_counter() - start
+        if number >= warmup:
+            samples.append(elapsed)
+    return {
+        "median": median(samples),
+        "p95": percentile(samples, 0.95),
+        "min": min(samples),
+        "runs": len(samples),
+    }
+
+
+def save_results(path: str, results: Dict[str, Dict[str, float]]) -> None:
+    """
+    Writes the results, with the machine they were measured on,
+    into a JSON file.
+    """
+
+    document = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(document, file, indent=2)
+        file.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Dict[str, float]]:
+    """
+    Reads the results from a JSON file written by save_results.
+    """
+
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def compare(
+    baseline: Dict[str, Dict[str, float]],
+    current: Dict[str, Dict[str, float]],
+    threshold: float = 0.2,
+) -> List[Tuple[str, float, float, float, bool]]:
+    """
+    Compares the medians of the benchmarks present in both results.
+    Returns the name, both medians and their ratio for every benchmark,
+    with True if the current median is slower than the baseline
+    by more than the threshold.
+    """
+
+    rows = []
+    for name in current:
+        if name not in baseline:
+            continue
+        before = baseline[name]["median"]
+        after = current[name]["median"]
+        ratio = after / before if before else float("inf")
+        rows.append((name, before, after, ratio, ratio > 1 + threshold))
+    return rows
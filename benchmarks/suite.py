@@ -0,0 +1,263 @@
+from benchmarks.harness import measure
+from lib.target import Target
+from lib.bullet import Bullet, MAX_X, MAX_Y, TIME_STEP
+from lib.level import Level
+from lib.integrator import AdaptiveIntegrator, FixedStepIntegrator
+from lib.bitboard import first_cells
+from lib.occupancy import OccupancyIndex
+from lib.attempt_log import AttemptLog, replay_block, session_blocks, start_replay
+from lib.level_pack import level_line
+from lib.renderer import BoardCache, create_renderer
+from zle_ptaki import default_levels
+from typing import Dict, List
+from io import BytesIO
+import os
+import random
+
+
+TARGET_COUNTS = (1, 10, 100, 10000)
+ANGLES = range(1, 90)
+FORCES = range(101)
+SAMPLED_ANGLES = range(1, 90, 4)
+SAMPLED_FORCES = range(5, 101, 5)
+SHOT = (45, 80)
+
+
+def random_targets(count: int, seed: int = 0) -> List[Target]:
+    """
+    Returns count targets placed at random on the board.
+    Beyond the number of cells, targets share cells.
+    """
+
+    rng = random.Random(seed)
+    return [Target(rng.randint(1, MAX_X), rng.randint(0, MAX_Y)) for _ in range(count)]
+
+
+def bench_trajectory(warmup: int, repeat: int) -> Dict[str, dict]:
+    """
+    Times Bullet.calculate_trajectory over the full grid of shots,
+    every angle and force, for every count of targets.
+    One run is the whole grid.
+    """
+
+    results = {}
+    shots = [(angle, force) for angle in ANGLES for force in FORCES]
+    for count in TARGET_COUNTS:
+        targets = random_targets(count)
+        index = OccupancyIndex(targets)
+
+        def run() -> None:
+            for angle, force in shots:
+                Bullet(angle, force).calculate_trajectory(targets, index)
+
+        results[f"trajectory[{count} targets]"] = measure(run, None, warmup, repeat)
+    return results
+
+
+def bench_bitboard(warmup: int, repeat: int) -> Dict[str, dict]:
+    """
+    Times first_cells over the full grid of shots
+    on the bitmask of every count of targets.
+    The paths are cached by the first run.
+    """
+
+    results = {}
+    shots = [(angle, force) for angle in ANGLES for force in FORCES]
+    for count in TARGET_COUNTS:
+        mask = OccupancyIndex(random_targets(count)).mask
+        results[f"bitboard[{count} targets]"] = measure(
+            lambda: first_cells(mask, shots), None, warmup, repeat
+        )
+    return results
+
+
+def bench_integrators(warmup: int, repeat: int) -> Dict[str, dict]:
+    """
+    Times the drag integrators against the drag-free stepping engine
+    over a sample of the grid of shots, every fourth angle
+    and every fifth force, with 100 targets, as the fine fixed step
+    would take minutes over the full grid.
+    The fine fixed step is what drag would need without step control.
+    """
+
+    targets = random_targets(100)
+    index = OccupancyIndex(targets)
+    shots = [(angle, force) for angle in SAMPLED_ANGLES for force in SAMPLED_FORCES]
+    engines = {
+        "step": Bullet.calculate_trajectory,
+        "rk4 fine": FixedStepIntegrator(time_step=TIME_STEP / 10),
+        "adaptive": AdaptiveIntegrator(),
+    }
+
+    results = {}
+    for name, engine in engines.items():
+
+        def run() -> None:
+            for angle, force in shots:
+                engine(Bullet(angle, force), targets, index)
+
+        results[f"integrator[{name}, sampled]"] = measure(run, None, warmup, repeat)
+    return results
+
+
+def last_level() -> tuple:
+    """
+    Returns a new copy of the last level of the game.
+    """
+
+    attempts, targets = default_levels()[-1]
+    return (Level(attempts, targets),)
+
+
+def bench_simulate_attempt(warmup: int, repeat: int) -> Dict[str, dict]:
+    """
+    Times Level.simulate_attempt on a new copy of the last level.
+    """
+
+    def run(level: Level) -> None:
+        level.simulate_attempt(*SHOT)
+
+    return {"simulate_attempt": measure(run, last_level, warmup, repeat * 10)}
+
+
+def bench_replay(warmup: int, repeat: int) -> Dict[str, dict]:
+    """
+    Times replaying a block of 100 sessions of the levels of the game,
+    each of 10 random shots on every level, recorded with the stepping
+    engine and replayed with each engine.
+    """
+
+    rng = random.Random(0)
+    file = BytesIO()
+    log = AttemptLog(file)
+    for _ in range(100):
+        log.start()
+        for number, (attempts, targets) in enumerate(default_levels()):
+            level = Level(10, targets)
+            for _ in range(10):
+                angle, force = rng.randint(1, 89), rng.randint(1, 100)
+                log.attempt(number, angle, force, level.simulate_attempt(angle, force))
+                if level.result:
+                    break
+    file.seek(0)
+    block = b"".join(data for data, _ in session_blocks(file))
+    lines = [level_line(10, targets) for _, targets in default_levels()]
+
+    results = {}
+    for engine in ("step", "bitboard"):
+        start_replay(lines, engine)
+        results[f"replay[{engine}]"] = measure(
+            lambda: replay_block(block, 0), None, warmup, repeat
+        )
+    return results
+
+
+def renderer_names() -> List[str]:
+    """
+    Returns the renderers whose drawing library is installed.
+    """
+
+    names = ["matplotlib"]
+    try:
+        import PySide2  # noqa: F401
+
+        names.append("qpainter")
+    except ImportError:
+        pass
+    return names
+
+
+def bench_draw(warmup: int, repeat: int) -> Dict[str, dict]:
+    """
+    Times Level.draw_board and Level.draw_trajectory
+    after a shot, with every renderer installed.
+    """
+
+    results = {}
+    for name in renderer_names():
+        attempts, targets = default_levels()[-1]
+        level = Level(attempts, targets, renderer=name)
+        level.simulate_attempt(*SHOT)
+        results[f"draw_board[{name}]"] = measure(level.draw_board, None, warmup, repeat)
+        results[f"draw_trajectory[{name}]"] = measure(
+            level.draw_trajectory, None, warmup, repeat
+        )
+    return results
+
+
+def bench_render(warmup: int, repeat: int) -> Dict[str, dict]:
+    """
+    Times rendering the board of the last level and its trajectory
+    after a shot, with every renderer installed, with the boards
+    taken from the cache and, as "uncached", with a cache too small
+    to hold any of them.
+    """
+
+    attempts, targets = default_levels()[-1]
+    level = Level(attempts, targets)
+    level.simulate_attempt(*SHOT)
+    x, y = level.trajectory_xy
+
+    results = {}
+    for name in renderer_names():
+        for label, cache in (("", BoardCache()), (", uncached", BoardCache(0))):
+            renderer = create_renderer(name, cache)
+
+            def board() -> None:
+                renderer.sync(level.targets)
+                renderer.hide_trajectory()
+                renderer.render()
+
+            def trajectory() -> None:
+                renderer.set_trajectory(x, y)
+                renderer.render()
+
+            results[f"render_board[{name}{label}]"] = measure(
+                board, None, warmup, repeat
+            )
+            results[f"render_trajectory[{name}{label}]"] = measure(
+                trajectory, None, warmup, repeat
+            )
+    return results
+
+
+def bench_set_plot(warmup: int, repeat: int) -> Dict[str, dict]:
+    """
+    Times ZlePtakiWindow.setPlot under the offscreen Qt platform,
+    with a raw frame and with a PNG image.
+    Skipped if PySide2 is not installed.
+    """
+
+    try:
+        from PySide2.QtWidgets import QApplication
+    except ImportError:
+        return {}
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from lib.window import ZlePtakiWindow
+
+    app = QApplication.instance() or QApplication([])
+    window = ZlePtakiWindow(animate=False)
+    attempts, targets = default_levels()[-1]
+    level = Level(attempts, targets, renderer="qpainter")
+    frame = level.render_board()
+    image = level.draw_board()
+
+    results = {
+        "set_plot[frame]": measure(window.setPlot, lambda: (frame,), warmup, repeat),
+        "set_plot[png]": measure(window.setPlot, lambda: (image,), warmup, repeat),
+    }
+    window.close()
+    app.processEvents()
+    return results
+
+
+BENCHMARKS = {
+    "trajectory": bench_trajectory,
+    "bitboard": bench_bitboard,
+    "integrators": bench_integrators,
+    "simulate_attempt": bench_simulate_attempt,
+    "replay": bench_replay,
+    "draw": bench_draw,
+    "render": bench_render,
+    "set_plot": bench_set_plot,
+}
@@ -0,0 +1,200 @@
+from lib.target import Obstacle
+from lib.level import Level
+from lib.level_pack import LevelPack, level_line, parse_target
+from lib.generator import ANGLES, FORCES, shots_needed
+from lib.planner import Planner
+from lib.atlas import constants
+from typing import Dict, Iterable, List, Optional
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import os
+import sys
+
+
+VERSION = 1
+DEFAULT_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "zle_ptaki", "analysis")
+TRIVIAL_FRACTION = 0.2
+
+
+def canonical(line: str) -> str:
+    """
+    Returns the attempts and targets of the level pack line
+    as JSON with sorted keys, leaving out any other keys.
+    """
+
+    entry = json.loads(line)
+    level = {"attempts": entry["attempts"], "targets": entry["targets"]}
+    return json.dumps(level, sort_keys=True, separators=(",", ":"))
+
+
+def content_key(line: str) -> str:
+    """
+    Returns the key of the report of the level,
+    a hash of its content, the physics constants
+    and the version of the analysis.
+    """
+
+    content = f"{VERSION}/{constants()}/{canonical(line)}"
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def analyze_line(line: str) -> Dict:
+    """
+    Analyzes the level described by the line of a level pack.
+    Returns the report of the level:
+    the fraction of the shots (ANGLES x FORCES) on the first board
+    that hits each target, in the order of the targets,
+    the fraction of shots hitting a target or boss,
+    the fewest shots needed to win, or None if the level
+    cannot be won, and whether the attempts are sufficient.
+    """
+
+    entry = json.loads(line)
+    attempts = entry["attempts"]
+    targets = [parse_target(target) for target in entry["targets"]]
+    needed = shots_needed(targets)
+
+    level = Level(max(needed, 1), targets)
+    codes = level.sweep(ANGLES, FORCES)
+    counts = [0] * len(targets)
+    for code in codes[codes >= 0].tolist():
+        counts[code] += 1
+    fractions = [count / codes.size for count in counts]
+    win_fraction = sum(
+        fraction
+        for fraction, target in zip(fractions, targets)
+        if not isinstance(target, Obstacle)
+    )
+
+    shots = None
+    if needed:
+        shots = Planner().plan(level)
+    minimum = None if shots is None else len(shots)
+    return {
+        "attempts": attempts,
+        "targets": [
+            {"type": target["type"], "fraction": fraction}
+            for target, fraction in zip(entry["targets"], fractions)
+        ],
+        "win_fraction": win_fraction,
+        "min_shots": minimum,
+        "winnable": minimum is not None,
+        "sufficient": minimum is not None and minimum <= attempts,
+    }
+
+
+def analyze_lines(
+    lines: Iterable[str],
+    workers: Optional[int] = None,
+    cache: Optional[str] = DEFAULT_CACHE,
+) -> List[Dict]:
+    """
+    Analyzes the levels described by the lines of a level pack.
+    Reports found in the cache directory are reused,
+    the others are calculated in a pool of worker processes
+    and stored in the cache. If cache is None, nothing is cached.
+    Returns the reports in the order of the lines,
+    each holding also the key of the level.
+    """
+
+    lines = list(lines)
+    keys = [content_key(line) for line in lines]
+    reports = [None] * len(lines)
+    missing = []
+    for number, key in enumerate(keys):
+        path = None if cache is None else os.path.join(cache, key + ".json")
+        if path is not None and os.path.exists(path):
+            with open(path) as file:
+                reports[number] = json.load(file)
+        else:
+            missing.append(number)
+
+    if missing:
+        shard = [lines[number] for number in missing]
+        if workers == 1 or len(shard) == 1:
+            calculated = list(map(analyze_line, shard))
+        else:
+            chunk = max(len(shard) // (4 * (workers or os.cpu_count() or 1)), 1)
+            with ProcessPoolExecutor(workers) as executor:
+                calculated = list(executor.map(analyze_line, shard, chunksize=chunk))
+        if cache is not None:
+            os.makedirs(cache, exist_ok=True)
+        for number, report in zip(missing, calculated):
+            report["key"] = keys[number]
+            reports[number] = report
+            if cache is not None:
+                save_report(os.path.join(cache, keys[number] + ".json"), report)
+    return reports
+
+
+def save_report(path: str, report: Dict) -> None:
+    """
+    Writes the report atomically,
+    so other processes never read a partial one.
+    """
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(report, file)
+    os.replace(temporary, path)
+
+
+def level_lines(levels: Iterable[Level]) -> List[str]:
+    """
+    Returns the level pack lines describing the current state of the levels.
+    """
+
+    return [level_line(level.attempts, level.targets) for level in levels]
+
+
+def pack_lines(pack: LevelPack) -> List[str]:
+    """
+    Returns the lines of every level of the pack.
+    """
+
+    return [pack.line(number) for number in range(len(pack))]
+
+
+def rejected(report: Dict, trivial: float = TRIVIAL_FRACTION) -> Optional[str]:
+    """
+    Returns why the level should not be shipped:
+    it cannot be won, its attempts are not sufficient,
+    or more than the trivial fraction of shots win it at once.
+    Returns None if the level is fine.
+    """
+
+    if not report["winnable"]:
+        return "unwinnable"
+    if not report["sufficient"]:
+        return "insufficient attempts"
+    if report["win_fraction"] > trivial:
+        return "trivial"
+    return None
+
+
+def main(args: List[str]) -> int:
+    parser = ArgumentParser(description="Reports the difficulty of a level pack.")
+    parser.add_argument("pack", help="path of the level pack")
+    parser.add_argument("--workers", type=int, help="processes, all CPUs by default")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="report cache directory")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--trivial", type=float, default=TRIVIAL_FRACTION)
+    options = parser.parse_args(args[1:])
+
+    pack = LevelPack(options.pack)
+    cache = None if options.no_cache else options.cache
+    reports = analyze_lines(pack_lines(pack), options.workers, cache)
+    pack.close()
+
+    failures = 0
+    for number, report in enumerate(reports):
+        reason = rejected(report, options.trivial)
+        failures += reason is not None
+        print(json.dumps({"level": number + 1, "rejected": reason, **report}))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
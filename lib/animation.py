@@ -0,0 +1,162 @@
+from lib.bullet import TIME_STEP
+from lib.renderer import Renderer
+from typing import Sequence
+from PySide2.QtCore import QElapsedTimer, QEvent, QPointF, QRect, Qt, QTimer, Signal
+from PySide2.QtGui import QPainter, QPen, QPolygonF
+from PySide2.QtWidgets import QWidget
+
+
+FRAMES_PER_SECOND = 60
+
+
+class TrajectoryReplay(QWidget):
+    """
+    Class TrajectoryReplay. A transparent overlay of the plot,
+    replaying the trajectory of a shot at display frame rate.
+    Every frame only the region of the newly flown segment
+    is repainted, the board under it is never re-rendered.
+    Contains attributes:
+    :param speed: how many times faster than real time the shot is replayed
+    :param type: float
+
+    :param shown: number of points of the trajectory shown so far
+    :param type: int
+    """
+
+    finished = Signal()
+
+    def __init__(self, plot: QWidget, speed: float = 1) -> None:
+        """
+        Creates an instance of class TrajectoryReplay.
+        Takes two arguments:
+        the plot widget showing the board image
+        and the speed of the replay.
+        """
+
+        super().__init__(plot)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WA_NoSystemBackground)
+        self.setGeometry(plot.rect())
+        plot.installEventFilter(self)
+
+        self._renderer = Renderer()
+        self._speed = speed
+        self._points = []
+        self._shown = 0
+        self._clock = QElapsedTimer()
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(1000 // FRAMES_PER_SECOND)
+        self._timer.timeout.connect(self.advance)
+        self.hide()
+
+    @property
+    def speed(self) -> float:
+        """
+        Returns the speed of the replay.
+        """
+
+        return self._speed
+
+    @property
+    def shown(self) -> int:
+        """
+        Returns the number of points of the trajectory shown so far.
+        """
+
+        return self._shown
+
+    def start(self, renderer: Renderer, x: Sequence[float], y: Sequence[float]) -> None:
+        """
+        Starts replaying the trajectory
+        over the board drawn by the renderer.
+        """
+
+        self._renderer = renderer
+        self._points = [
+            QPointF(*self._renderer.to_pixel(px, py)) for px, py in zip(x, y)
+        ]
+        self._shown = min(1, len(self._points))
+        self.setGeometry(self.parentWidget().rect())
+        self.show()
+        self.update()
+        self._clock.start()
+        self._timer.start()
+
+    def stop(self) -> None:
+        """
+        Stops the replay and hides the trajectory.
+        """
+
+        self._timer.stop()
+        self._points = []
+        self._shown = 0
+        self.hide()
+
+    def advance(self) -> None:
+        """
+        Shows the points flown since the last frame
+        and repaints only the region they cover.
+        Emits finished after the last point.
+        """
+
+        elapsed = self._clock.elapsed() / 1000 * self._speed
+        shown = min(len(self._points), 1 + int(elapsed / TIME_STEP))
+        if shown > self._shown:
+            self.update(self.segment_rect(self._shown - 1, shown))
+            self._shown = shown
+        if self._shown >= len(self._points):
+            self._timer.stop()
+            self.finished.emit()
+
+    def segment_rect(self, start: int, stop: int) -> QRect:
+        """
+        Returns the region of the widget covered by the points
+        from start to stop, widened by the width of the pen.
+        """
+
+        segment = QPolygonF(self._points[max(start, 0) : stop])
+        scale_x, scale_y = self.scale()
+        rect = segment.boundingRect()
+        return QRect(
+            int(rect.left() * scale_x) - 4,
+            int(rect.top() * scale_y) - 4,
+            int(rect.width() * scale_x) + 9,
+            int(rect.height() * scale_y) + 9,
+        )
+
+    def scale(self):
+        """
+        Returns how much the plot stretches the board image.
+        """
+
+        return (
+            self.width() / self._renderer.width,
+            self.height() / self._renderer.height,
+        )
+
+    def paintEvent(self, event) -> None:
+        """
+        Paints the trajectory flown so far.
+        Qt clips the painting to the region being updated.
+        """
+
+        if self._shown < 2:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.scale(*self.scale())
+        pen = QPen(Qt.black, 4, Qt.DotLine)
+        pen.setCapStyle(Qt.RoundCap)
+        painter.setPen(pen)
+        painter.drawPolyline(QPolygonF(self._points[: self._shown]))
+        painter.end()
+
+    def eventFilter(self, watched, event) -> bool:
+        """
+        Follows the size of the plot.
+        """
+
+        if watched is self.parentWidget() and event.type() == QEvent.Resize:
+            self.setGeometry(watched.rect())
+        return False
@@ -0,0 +1,182 @@
+from lib.target import Target
+from lib.bullet import Bullet, MAX_X, MAX_Y, MAX_FORCE, GRAVITY, TIME_STEP
+from lib.occupancy import OccupancyIndex
+from typing import List, Tuple
+from math import cos, sin
+import mmap
+import os
+import struct
+import sys
+
+
+MAGIC = b"ZPATLAS\0"
+VERSION = 1
+HEADER = struct.Struct("<8sI5dII")
+ANGLES = range(1, 90)
+FORCES = range(101)
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "zle_ptaki", "atlas.bin")
+
+
+class StaleAtlasError(Exception):
+    def __init__(self) -> None:
+        super().__init__("Atlas was built with different physics constants!")
+
+
+def constants() -> Tuple[float, float, float, float, float]:
+    """
+    Returns the physics constants the trajectories depend on.
+    """
+
+    return (MAX_X, MAX_Y, MAX_FORCE, GRAVITY, TIME_STEP)
+
+
+def shot_cells(angle: int, force: int) -> bytes:
+    """
+    Returns the cells the stepping engine visits for the shot,
+    without repeating a cell, as pairs of x and y bytes.
+    """
+
+    from lib.vectorized import trajectory_arrays
+    import numpy as np
+
+    bullet = Bullet(angle, force)
+    x, y = trajectory_arrays(
+        bullet.force * cos(bullet.angle), bullet.force * sin(bullet.angle)
+    )
+    cells = np.stack((np.rint(x[:-1]), np.rint(y[:-1])), axis=1).astype(np.uint8)
+    changed = np.ones(len(cells), dtype=bool)
+    changed[1:] = (cells[1:] != cells[:-1]).any(axis=1)
+    return cells[changed].tobytes()
+
+
+def build_atlas(path: str = DEFAULT_PATH) -> None:
+    """
+    Writes the cells of every trajectory into the atlas file.
+    The file holds the header with the physics constants,
+    the table of offsets of every shot and the cells themselves.
+    The file is replaced atomically,
+    so processes reading the old atlas are not disturbed.
+    """
+
+    shots = [shot_cells(angle, force) for angle in ANGLES for force in FORCES]
+    offsets = [0]
+    for cells in shots:
+        offsets.append(offsets[-1] + len(cells) // 2)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, *constants(), len(ANGLES), len(FORCES)))
+        file.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        for cells in shots:
+            file.write(cells)
+    os.replace(temporary, path)
+
+
+class Atlas:
+    """
+    Class Atlas. A read-only, memory-mapped file
+    holding the cells of every trajectory.
+    It is also an engine for Level, calculating the trajectory
+    by reading the path of the shot from the file.
+    Contains attributes:
+    :param path: path of the atlas file
+    :param type: str
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        """
+        Creates an instance of class Atlas.
+        Takes one argument:
+        the path of the atlas file.
+        Raises StaleAtlasError if the atlas was built
+        with different physics constants or for different shots.
+        """
+
+        self._path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = HEADER.unpack_from(self._map)
+        if (
+            header[:2] != (MAGIC, VERSION)
+            or header[2:7] != constants()
+            or header[7:] != (len(ANGLES), len(FORCES))
+        ):
+            self._map.close()
+            raise StaleAtlasError()
+
+        self._offsets = HEADER.size
+        self._cells = HEADER.size + 4 * (len(ANGLES) * len(FORCES) + 1)
+
+    @property
+    def path(self) -> str:
+        """
+        Returns the path of the atlas file.
+        """
+
+        return self._path
+
+    def cells(self, angle: int, force: int) -> List[Tuple[int, int]]:
+        """
+        Returns the cells visited by the shot, in flight order.
+        """
+
+        shot = (angle - ANGLES.start) * len(FORCES) + (force - FORCES.start)
+        start, stop = struct.unpack_from("<2I", self._map, self._offsets + 4 * shot)
+        data = self._map[self._cells + 2 * start : self._cells + 2 * stop]
+        return list(zip(data[0::2], data[1::2]))
+
+    def close(self) -> None:
+        """
+        Unmaps the atlas file.
+        """
+
+        self._map.close()
+
+    def __call__(
+        self, bullet: Bullet, targets: List[Target], index: OccupancyIndex = None
+    ) -> Target:
+        """
+        Calculates the trajectory of the bullet from the atlas.
+        Returns the target that was hit.
+        If the bullet missed, returns None.
+        """
+
+        cells = self.cells(bullet.angle_degrees, bullet.force_percentage)
+        return bullet.follow_cells(cells, targets, index)
+
+
+_atlases = {}
+
+
+def load_atlas(path: str = DEFAULT_PATH) -> Atlas:
+    """
+    Opens the atlas file, building it first
+    if it does not exist or is stale.
+    The atlas is opened once per process.
+    """
+
+    if path not in _atlases:
+        try:
+            _atlases[path] = Atlas(path)
+        except (FileNotFoundError, ValueError, StaleAtlasError, struct.error):
+            build_atlas(path)
+            _atlases[path] = Atlas(path)
+    return _atlases[path]
+
+
+def atlas_trajectory(
+    bullet: Bullet, targets: List[Target], index: OccupancyIndex = None
+) -> Target:
+    """
+    Calculates the trajectory of the bullet from the default atlas.
+    """
+
+    return load_atlas()(bullet, targets, index)
+
+
+if __name__ == "__main__":
+    build_atlas(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH)
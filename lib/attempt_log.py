@@ -0,0 +1,520 @@
+from lib.target import Target
+from lib.level import Level, ENGINES
+from lib.level_pack import LevelPack, level_line
+from lib.snapshot import NothingToUndoError
+from lib.bullet import InvalidAngleError, InvalidForceError
+from lib.atlas import constants
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+import json
+import os
+import struct
+import sys
+
+
+MAGIC = b"ZPLOG"
+VERSION = 1
+CONSTANTS = struct.Struct("<5d")
+HEADER_SIZE = len(MAGIC) + 1 + CONSTANTS.size
+ATTEMPT, UNDO, START = 0, 1, 2
+KIND_BITS = 2
+READ_SIZE = 1 << 20
+BLOCK_SIZE = 1 << 18
+MAX_FAILURES = 100
+
+Record = Tuple[int, int, int, int, int, int]
+
+_replay_pack = None
+
+
+class InvalidLogError(Exception):
+    def __init__(self) -> None:
+        super().__init__("File is not an attempt log of a known version!")
+
+
+def varint(value: int) -> bytes:
+    """
+    Returns the non-negative integer as a variable length quantity,
+    seven bits per byte, least significant first,
+    with the high bit set on every byte but the last.
+    """
+
+    data = bytearray()
+    while value > 0x7F:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def read_varint(data: bytes, position: int) -> Optional[Tuple[int, int]]:
+    """
+    Returns the integer starting at the position of the data
+    and the position after it, or None if the data ends inside it.
+    """
+
+    value = shift = 0
+    while position < len(data):
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+    return None
+
+
+def outcome(hit: Optional[Target]) -> int:
+    """
+    Returns the outcome of an attempt as stored in the log:
+    the entity hit plus one, or 0 for a miss.
+    """
+
+    return 0 if hit is None else hit.entity + 1
+
+
+def header() -> bytes:
+    """
+    Returns the header of a new log, holding the version of the format
+    and the physics constants the attempts are played with.
+    """
+
+    return MAGIC + bytes((VERSION,)) + CONSTANTS.pack(*constants())
+
+
+def read_header(file: BinaryIO) -> Tuple[float, float, float, float, float]:
+    """
+    Reads the header of the log.
+    Returns the physics constants the log was recorded with.
+    Raises InvalidLogError if the file is not a log of this version.
+    """
+
+    data = file.read(HEADER_SIZE)
+    if len(data) < HEADER_SIZE or data[: len(MAGIC)] != MAGIC:
+        raise InvalidLogError()
+    if data[len(MAGIC)] != VERSION:
+        raise InvalidLogError()
+    return CONSTANTS.unpack(data[len(MAGIC) + 1 :])
+
+
+def parse_record(data: bytes, position: int) -> Optional[Record]:
+    """
+    Parses the record starting at the position of the data.
+    Returns the position after it, its kind, the number of the level,
+    and for attempts the angle, force and outcome, zeros otherwise.
+    Returns None if the data ends inside the record.
+    Integers of one byte, as in most records, are read in place.
+    """
+
+    size = len(data)
+    if position < size and data[position] < 0x80:
+        value = data[position]
+        position += 1
+    else:
+        head = read_varint(data, position)
+        if head is None:
+            return None
+        value, position = head
+    kind, level = value & (1 << KIND_BITS) - 1, value >> KIND_BITS
+    if kind != ATTEMPT:
+        return position, kind, level, 0, 0, 0
+    if position + 3 > size:
+        return None
+    angle, force, hit = data[position], data[position + 1], data[position + 2]
+    if hit < 0x80:
+        return position + 3, kind, level, angle, force, hit
+    result = read_varint(data, position + 2)
+    if result is None:
+        return None
+    return result[1], kind, level, angle, force, result[0]
+
+
+def read_records(file: BinaryIO) -> Iterator[Tuple[int, int, int, int, int]]:
+    """
+    Yields the records of the log, read in chunks after its header,
+    so logs of any size are never held in memory:
+    their kind, the number of the level, the angle, force and outcome.
+    A record cut short at the end of the log is left out.
+    """
+
+    read_header(file)
+    data = b""
+    while True:
+        chunk = file.read(READ_SIZE)
+        data += chunk
+        position = 0
+        while True:
+            record = parse_record(data, position)
+            if record is None:
+                break
+            position = record[0]
+            yield record[1:]
+        data = data[position:]
+        if not chunk:
+            return
+
+
+def session_blocks(
+    file: BinaryIO, block_size: int = BLOCK_SIZE
+) -> Iterator[Tuple[bytes, int]]:
+    """
+    Yields the records of the log in blocks of whole sessions,
+    each at least block_size bytes long but the last,
+    with the number of sessions starting in the block.
+    Every session starts with a START record, but the first one,
+    which may start with the first record of the log.
+    A record cut short at the end of the log is left in the last block.
+    """
+
+    read_header(file)
+    data = b""
+    position = start = sessions = 0
+    while True:
+        chunk = file.read(READ_SIZE)
+        data = data[start:] + chunk
+        position -= start
+        start = 0
+        while True:
+            record = parse_record(data, position)
+            if record is None:
+                break
+            if record[1] == START:
+                if position - start >= block_size:
+                    yield data[start:position], sessions
+                    start, sessions = position, 0
+                sessions += 1
+            elif sessions == 0:
+                sessions = 1
+            position = record[0]
+        if not chunk:
+            break
+    if len(data) > start:
+        yield data[start:], sessions
+
+
+class AttemptLog:
+    """
+    Class AttemptLog. Records the attempts of a game in an append-only
+    binary log, a few bytes per attempt, so played sessions can be
+    replayed and checked after the physics change.
+    Every record starts with the number of the level and the kind
+    of the record, packed in one variable length integer.
+    Attempts follow it with the angle and force, a byte each,
+    and the outcome, the entity hit plus one or 0 for a miss.
+    Undone attempts and the start of a new session are the head alone.
+    Contains attributes:
+    :param records: number of records written by the log
+    :param type: int
+    """
+
+    def __init__(self, target: Union[str, BinaryIO]) -> None:
+        """
+        Creates an instance of class AttemptLog.
+        Takes one argument: the path of the log, appended to if it exists,
+        or a binary file positioned at its end.
+        A new log starts with the header.
+        """
+
+        self._file = open(target, "ab") if isinstance(target, str) else target
+        if self._file.tell() == 0:
+            self._file.write(header())
+        self._records = 0
+
+    @property
+    def records(self) -> int:
+        """
+        Returns the number of records written by the log.
+        """
+
+        return self._records
+
+    def _write(self, level: int, kind: int, data: bytes = b"") -> None:
+        """
+        Writes the head of a record of the kind and the data following it.
+        """
+
+        self._file.write(varint(level << KIND_BITS | kind) + data)
+        self._records += 1
+
+    def start(self) -> None:
+        """
+        Records the start of a session, played on new levels.
+        """
+
+        self._write(0, START)
+
+    def attempt(
+        self, level: int, angle: int, force: int, hit: Optional[Target]
+    ) -> None:
+        """
+        Records the attempt made on the level with the given number
+        and the target it hit, None for a miss.
+        """
+
+        self._write(level, ATTEMPT, bytes((angle, force)) + varint(outcome(hit)))
+
+    def undo(self, level: int) -> None:
+        """
+        Records that the last attempt on the level was undone.
+        """
+
+        self._write(level, UNDO)
+
+    def flush(self) -> None:
+        """
+        Writes the recorded attempts to the file.
+        """
+
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Closes the file of the log.
+        """
+
+        self._file.close()
+
+
+def new_report() -> Dict:
+    """
+    Returns an empty report of a replay.
+    """
+
+    return {
+        "sessions": 0,
+        "attempts": 0,
+        "diverged": 0,
+        "truncated": 0,
+        "failures": [],
+    }
+
+
+def merge_report(report: Dict, other: Dict) -> None:
+    """
+    Adds the other report into the report,
+    keeping at most MAX_FAILURES failures.
+    """
+
+    for key in ("sessions", "attempts", "diverged", "truncated"):
+        report[key] += other[key]
+    room = MAX_FAILURES - len(report["failures"])
+    report["failures"].extend(other["failures"][:room])
+
+
+def start_replay(lines: List[str], engine: Union[str, Callable] = "bitboard") -> None:
+    """
+    Sets the levels the logs are replayed on in this process:
+    the lines of a level pack, played with the engine.
+    """
+
+    global _replay_pack
+    source = BytesIO("".join(line.rstrip("\n") + "\n" for line in lines).encode())
+    _replay_pack = LevelPack(source, engine)
+
+
+def replay_record(
+    pack: LevelPack, levels: Dict[int, Level], record: Record
+) -> Optional[int]:
+    """
+    Plays the record on the levels of a session,
+    starting new levels of the pack when they are first played.
+    Returns the outcome of an attempt, 0 for an undone attempt,
+    or None if the record cannot be played:
+    the level does not exist, is already won or lost,
+    the shot is not valid, or there is no attempt to undo.
+    """
+
+    _, kind, number, angle, force, _ = record
+    if number not in levels:
+        if kind != ATTEMPT:
+            return None
+        try:
+            levels[number] = pack.level(number)
+        except IndexError:
+            return None
+    level = levels[number]
+    if kind == UNDO:
+        try:
+            level.undo()
+        except NothingToUndoError:
+            return None
+        return 0
+    if level.result or level.attempts == 0:
+        return None
+    try:
+        return outcome(level.simulate_attempt(angle, force))
+    except (InvalidAngleError, InvalidForceError):
+        return None
+
+
+def replay_block(block: bytes, first_session: int) -> Dict:
+    """
+    Replays the sessions of the block on the levels set by start_replay,
+    the first of them having the given number.
+    Returns the report of the block. A session diverges at the first
+    record whose outcome is not the recorded one,
+    and the rest of it is not played.
+    """
+
+    pack = _replay_pack
+    report = new_report()
+    session = first_session - 1
+    levels = None
+    diverged = False
+    number = position = 0
+    while position < len(block):
+        record = parse_record(block, position)
+        if record is None:
+            report["truncated"] += 1
+            break
+        position = record[0]
+        if record[1] == START or levels is None:
+            session += 1
+            report["sessions"] += 1
+            levels = {}
+            diverged = False
+            number = 0
+            if record[1] == START:
+                continue
+        number += 1
+        if diverged:
+            continue
+
+        expected = record[5] if record[1] == ATTEMPT else 0
+        actual = replay_record(pack, levels, record)
+        report["attempts"] += record[1] == ATTEMPT
+        if actual != expected:
+            diverged = True
+            report["diverged"] += 1
+            if len(report["failures"]) < MAX_FAILURES:
+                report["failures"].append(
+                    {
+                        "session": session,
+                        "record": number,
+                        "level": record[2],
+                        "expected": expected,
+                        "actual": actual,
+                    }
+                )
+    return report
+
+
+def log_constants(path: str) -> Tuple[float, float, float, float, float]:
+    """
+    Returns the physics constants the log at the path was recorded with.
+    Raises InvalidLogError if the file is not a log of this version.
+    """
+
+    with open(path, "rb") as file:
+        return read_header(file)
+
+
+def log_blocks(
+    paths: Iterable[str], block_size: int = BLOCK_SIZE
+) -> Iterator[Tuple[bytes, int]]:
+    """
+    Yields the blocks of sessions of every log in turn,
+    with the number of the first session of each block,
+    counting the sessions of all the logs.
+    """
+
+    session = 0
+    for path in paths:
+        with open(path, "rb") as file:
+            for block, sessions in session_blocks(file, block_size):
+                yield block, session
+                session += sessions
+
+
+def verify_logs(
+    paths: Iterable[str],
+    lines: List[str],
+    engine: Union[str, Callable] = "bitboard",
+    workers: Optional[int] = None,
+    block_size: int = BLOCK_SIZE,
+) -> Dict:
+    """
+    Replays every session of the logs on new levels of the pack
+    given by its lines, with the engine, and checks every outcome.
+    The bitboard engine visits the cells of the stepping engine
+    the game is played with, so it finds the same outcomes, faster.
+    The logs are streamed in blocks of whole sessions,
+    replayed in a pool of worker processes, a few blocks ahead
+    of the one being reported. If workers is 1, the blocks
+    are replayed in this process.
+    Returns the report: the numbers of sessions, attempts replayed,
+    diverged sessions and logs cut short, the first
+    MAX_FAILURES records which diverged, and the physics constants
+    the logs were recorded with, by path, next to the ones replayed with.
+    """
+
+    paths = list(paths)
+    report = new_report()
+    report["constants"] = {
+        "replayed": list(constants()),
+        "recorded": {path: list(log_constants(path)) for path in paths},
+    }
+    blocks = log_blocks(paths, block_size)
+    if workers == 1:
+        start_replay(lines, engine)
+        for block, session in blocks:
+            merge_report(report, replay_block(block, session))
+        return report
+
+    ahead = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(
+        workers, initializer=start_replay, initargs=(lines, engine)
+    ) as executor:
+        pending = deque()
+        for block, session in blocks:
+            pending.append(executor.submit(replay_block, block, session))
+            if len(pending) >= ahead:
+                merge_report(report, pending.popleft().result())
+        while pending:
+            merge_report(report, pending.popleft().result())
+    return report
+
+
+def main(args: List[str]) -> int:
+    parser = ArgumentParser(
+        description="Replays attempt logs and checks every recorded outcome."
+    )
+    parser.add_argument("logs", nargs="+", help="paths of the attempt logs")
+    parser.add_argument(
+        "--pack",
+        help="level pack the logs were played on, the game's levels by default",
+    )
+    parser.add_argument("--engine", choices=list(ENGINES), default="bitboard")
+    parser.add_argument("--workers", type=int, help="processes, all CPUs by default")
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE)
+    options = parser.parse_args(args[1:])
+
+    if options.pack is None:
+        from zle_ptaki import default_levels
+
+        lines = [level_line(*level) for level in default_levels()]
+    else:
+        with open(options.pack) as file:
+            lines = [line for line in file if line.strip()]
+    report = verify_logs(
+        options.logs, lines, options.engine, options.workers, options.block_size
+    )
+    print(json.dumps(report))
+    return 1 if report["diverged"] or report["truncated"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
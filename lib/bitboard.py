@@ -0,0 +1,182 @@
+from lib.target import Target
+from lib.bullet import Bullet, MAX_X
+from lib.occupancy import OccupancyIndex, ROW_BITS, cell_bit
+from lib.atlas import ANGLES, FORCES, shot_cells
+from typing import Iterable, List, Optional, Tuple
+from array import array
+from functools import lru_cache
+
+
+CACHED_PATHS = len(ANGLES) * len(FORCES)
+LOOKED_UP_BITS = 4
+
+
+class BoardTooWideError(Exception):
+    def __init__(self) -> None:
+        super().__init__("Board has to be narrower than a row of a bitmask!")
+
+
+class PathMask:
+    """
+    Class PathMask. The cells visited by a shot of the stepping engine,
+    in flight order, and their bitmask.
+    A cell is not repeated while the bullet stays in it,
+    but one the bullet enters again after leaving it is listed again.
+    Contains attributes:
+    :param bits: the bits of the cells visited, numbered by cell_bit,
+    in flight order
+    :param type: array
+
+    :param mask: bitmask of the cells visited
+    :param type: int
+    """
+
+    __slots__ = ("_bits", "_mask")
+
+    def __init__(self, cells: Iterable[Tuple[int, int]]) -> None:
+        """
+        Creates an instance of class PathMask.
+        Takes one argument:
+        the cells visited, in flight order.
+        """
+
+        self._bits = array("H", map(cell_bit, cells))
+        self._mask = 0
+        for bit in self._bits:
+            self._mask |= 1 << bit
+
+    @property
+    def bits(self) -> array:
+        """
+        Returns the bits of the cells visited, in flight order.
+        """
+
+        return self._bits
+
+    @property
+    def mask(self) -> int:
+        """
+        Returns the bitmask of the cells visited.
+        """
+
+        return self._mask
+
+    @property
+    def cells(self) -> List[Tuple[int, int]]:
+        """
+        Returns the cells visited, in flight order.
+        """
+
+        return [(bit % ROW_BITS, bit // ROW_BITS) for bit in self._bits]
+
+    def hits(self, occupied: int) -> bool:
+        """
+        Returns True if the path enters any of the occupied cells.
+        """
+
+        return self._mask & occupied != 0
+
+    def first(self, occupied: int) -> Optional[int]:
+        """
+        Returns the position in the path of the first occupied cell
+        the bullet enters, looking up in the path the bits set
+        in both masks. If there are many, the rest of them
+        are found by scanning the path before the first found so far.
+        Returns None if the path misses them all.
+        """
+
+        hits = self._mask & occupied
+        if not hits:
+            return None
+        bits = self._bits
+        first = len(bits)
+        for _ in range(LOOKED_UP_BITS):
+            lowest = hits & -hits
+            first = min(first, bits.index(lowest.bit_length() - 1))
+            hits ^= lowest
+            if not hits:
+                return first
+        for position in range(first):
+            if hits >> bits[position] & 1:
+                return position
+        return first
+
+    def cell(self, position: int) -> Tuple[int, int]:
+        """
+        Returns the cell at the position in the path.
+        """
+
+        bit = self._bits[position]
+        return bit % ROW_BITS, bit // ROW_BITS
+
+
+def cells_mask(cells: Iterable[Tuple[int, int]]) -> int:
+    """
+    Returns the bitmask of the cells a bullet can enter.
+    The mask of a target's position is cleared from a board's mask
+    to ask what the shots would hit without the target.
+    """
+
+    mask = 0
+    for cell in cells:
+        bit = cell_bit(cell)
+        if bit >= 0:
+            mask |= 1 << bit
+    return mask
+
+
+@lru_cache(maxsize=CACHED_PATHS)
+def path_mask(angle: int, force: int) -> PathMask:
+    """
+    Returns the path of the shot and its bitmask.
+    The paths of every shot fit in the cache.
+    Raises BoardTooWideError if a row of the board
+    does not fit in ROW_BITS bits.
+    """
+
+    if MAX_X >= ROW_BITS:
+        raise BoardTooWideError()
+    data = shot_cells(angle, force)
+    return PathMask(list(zip(data[0::2], data[1::2])))
+
+
+def bitboard_trajectory(
+    bullet: Bullet, targets: List[Target], index: OccupancyIndex = None
+) -> Target:
+    """
+    Calculates the trajectory of the bullet by intersecting
+    the bitmask of its path with the bitmask of the occupied cells,
+    so only the first occupied cell is looked up in the index.
+    Moves the bullet through the path up to that cell.
+    Returns the target that was hit.
+    If the bullet missed, returns None.
+    """
+
+    if index is None:
+        index = OccupancyIndex(targets)
+    path = path_mask(bullet.angle_degrees, bullet.force_percentage)
+    first = path.first(index.mask)
+    cells = path.cells
+    if first is None:
+        bullet.pass_cells(cells)
+        return None
+    bullet.pass_cells(cells[: first + 1])
+    return index.get(cells[first])
+
+
+def first_cells(
+    occupied: int, shots: Iterable[Tuple[int, int]]
+) -> List[Optional[Tuple[int, int]]]:
+    """
+    Returns the first occupied cell entered by each of the shots,
+    given as angles and forces, or None for the shots missing
+    every occupied cell. The occupied cells can be those of any board,
+    for example a level's index.mask with some targets' bits cleared.
+    """
+
+    cells = []
+    for angle, force in shots:
+        path = path_mask(angle, force)
+        first = path.first(occupied)
+        cells.append(None if first is None else path.cell(first))
+    return cells
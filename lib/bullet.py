@@ -1,7 +1,11 @@
 from lib.target import Target
-from typing import List, Tuple
-from matplotlib import pyplot as plt
-from math import cos, sin, pi
+from lib.occupancy import OccupancyIndex
+from lib.shape import Shape
+from typing import Iterable, List, Sequence, Tuple, TYPE_CHECKING
+from math import cos, sin, sqrt, pi
+
+if TYPE_CHECKING:
+    from matplotlib.patches import Circle
 
 
 MAX_X = 32
@@ -33,6 +37,9 @@ class Bullet:
     :param trajectory: the trajectory of the bullet
     :param type: List[Tuple[float, float]]
 
+    :param trajectory_xy: the x and y coordinates of the trajectory
+    :param type: Tuple[Sequence[float], Sequence[float]]
+
     :param position_x: x position of the object
     :param type: float
 
@@ -54,13 +61,16 @@ class Bullet:
 
         if angle_degrees not in range(1, 90):
             raise InvalidAngleError()
+        self._angle_degrees = angle_degrees
         self._angle = angle_degrees * (pi / 180)
 
         if force_percentage not in range(101):
             raise InvalidForceError()
+        self._force_percentage = force_percentage
         self._force = (force_percentage / 100) * MAX_FORCE
 
         self._trajectory = []
+        self._trajectory_xy = None
         self._position_x = 0
         self._position_y = 0
 
@@ -72,6 +82,14 @@ class Bullet:
 
         return self._angle
 
+    @property
+    def angle_degrees(self) -> float:
+        """
+        Returns the angle of the bullet in degrees.
+        """
+
+        return self._angle_degrees
+
     @property
     def force(self) -> float:
         """
@@ -80,14 +98,38 @@ class Bullet:
 
         return self._force
 
+    @property
+    def force_percentage(self) -> int:
+        """
+        Returns the percentage of force of the bullet.
+        """
+
+        return self._force_percentage
+
     @property
     def trajectory(self) -> List[Tuple[float, float]]:
         """
         Returns the trajectory of the bullet.
         """
 
+        if self._trajectory_xy is not None and not self._trajectory:
+            x, y = self._trajectory_xy
+            self._trajectory = list(zip(x.tolist(), y.tolist()))
         return self._trajectory
 
+    @property
+    def trajectory_xy(self) -> Tuple[Sequence[float], Sequence[float]]:
+        """
+        Returns the x and y coordinates of the trajectory.
+        After calculate_vectorized_trajectory these are NumPy arrays.
+        """
+
+        if self._trajectory_xy is not None:
+            return self._trajectory_xy
+        x = [p[0] for p in self._trajectory]
+        y = [p[1] for p in self._trajectory]
+        return x, y
+
     @property
     def position(self) -> Tuple[int, int]:
         """
@@ -96,14 +138,21 @@ class Bullet:
 
         return round(self._position_x), round(self._position_y)
 
-    def calculate_trajectory(self, targets: List[Target]) -> Target:
+    def calculate_trajectory(
+        self, targets: List[Target], index: OccupancyIndex = None
+    ) -> Target:
         """
         Calculates the trajectory of the bullet.
         Stores the trajectory in a list.
+        Takes an optional occupancy index of the targets,
+        which is built from the targets if not given.
         Returns the target that was hit.
         If the bullet missed, returns None.
         """
 
+        if index is None:
+            index = OccupancyIndex(targets)
+
         velocity_x = self.force * cos(self.angle)
         velocity_y = self.force * sin(self.angle)
         time = 0
@@ -115,9 +164,9 @@ class Bullet:
         ):
             self._trajectory.append((self._position_x, self._position_y))
 
-            for target in targets:
-                if self.position in target.position:
-                    return target
+            target = index.get(self.position)
+            if target is not None:
+                return target
 
             self._position_x = velocity_x * time
             self._position_y = velocity_y * time
@@ -126,10 +175,178 @@ class Bullet:
 
         return None
 
+    def cell_path(self) -> List[Tuple[float, Tuple[int, int]]]:
+        """
+        Calculates, in closed form, the board cells the bullet enters.
+        A cell changes only when x or y crosses a half-integer,
+        so the crossing times are solved for directly.
+        Returns the list of entry times and cells, in flight order.
+        """
+
+        velocity_x = self.force * cos(self.angle)
+        velocity_y = self.force * sin(self.angle)
+        if velocity_x == 0:
+            return [(0, (0, 0))]
+
+        end = min(MAX_X / velocity_x, 2 * velocity_y / GRAVITY)
+        events = {0, end}
+
+        crossing = 0.5
+        while crossing / velocity_x < end:
+            events.add(crossing / velocity_x)
+            crossing += 1
+
+        crossing = 0.5
+        while crossing < velocity_y**2 / (2 * GRAVITY):
+            delta = sqrt(velocity_y**2 - 2 * GRAVITY * crossing)
+            for time in (
+                (velocity_y - delta) / GRAVITY,
+                (velocity_y + delta) / GRAVITY,
+            ):
+                if 0 < time < end:
+                    events.add(time)
+            crossing += 1
+
+        events = sorted(events)
+        path = []
+        for start, stop in zip(events, events[1:]):
+            time = (start + stop) / 2
+            position_x = velocity_x * time
+            position_y = velocity_y * time - 0.5 * GRAVITY * time**2
+            cell = (round(position_x), round(position_y))
+            if not path or path[-1][1] != cell:
+                path.append((start, cell))
+
+        return path or [(0, (0, 0))]
+
+    def calculate_exact_trajectory(
+        self, targets: List[Target], index: OccupancyIndex = None
+    ) -> Target:
+        """
+        Calculates the trajectory of the bullet in closed form.
+        Unlike calculate_trajectory, it cannot skip a cell
+        between two time steps.
+        Stores the points at which the bullet enters each cell.
+        Returns the target that was hit.
+        If the bullet missed, returns None.
+        """
+
+        if index is None:
+            index = OccupancyIndex(targets)
+
+        velocity_x = self.force * cos(self.angle)
+        velocity_y = self.force * sin(self.angle)
+
+        for time, cell in self.cell_path():
+            self._position_x = velocity_x * time
+            self._position_y = velocity_y * time - 0.5 * GRAVITY * time**2
+            self._trajectory.append((self._position_x, self._position_y))
+
+            target = index.get(cell)
+            if target is not None:
+                return target
+
+        return None
+
+    def follow_cells(
+        self,
+        cells: List[Tuple[int, int]],
+        targets: List[Target],
+        index: OccupancyIndex = None,
+    ) -> Target:
+        """
+        Moves the bullet through the given cells, in order,
+        until it enters an occupied one.
+        Stores the centres of the cells as the trajectory.
+        Returns the target that was hit.
+        If the bullet missed, returns None.
+        """
+
+        if index is None:
+            index = OccupancyIndex(targets)
+
+        for cell in cells:
+            self._position_x, self._position_y = cell
+            self._trajectory.append(cell)
+
+            target = index.get(cell)
+            if target is not None:
+                return target
+
+        return None
+
+    def pass_cells(self, cells: List[Tuple[int, int]]) -> None:
+        """
+        Moves the bullet through the given cells, in order,
+        without looking for targets in them.
+        Stores the centres of the cells as the trajectory.
+        """
+
+        if cells:
+            self._trajectory.extend(cells)
+            self._position_x, self._position_y = cells[-1]
+
+    def follow_path(
+        self, path: Iterable[Tuple[float, float]], index: OccupancyIndex
+    ) -> Target:
+        """
+        Moves the bullet through the given positions, in order,
+        until it enters an occupied cell.
+        Stores the positions as the trajectory.
+        Returns the target that was hit.
+        If the bullet missed, returns None.
+        """
+
+        for point in path:
+            self._position_x, self._position_y = point
+            self._trajectory.append(point)
+
+            target = index.get(self.position)
+            if target is not None:
+                return target
+
+        return None
+
+    def calculate_vectorized_trajectory(
+        self, targets: List[Target], index: OccupancyIndex = None
+    ) -> Target:
+        """
+        Calculates the trajectory of the bullet with NumPy.
+        Visits the same positions as calculate_trajectory,
+        but computes them and their cells in single array operations.
+        Stores the trajectory as x and y arrays.
+        Returns the target that was hit.
+        If the bullet missed, returns None.
+        """
+
+        from lib.vectorized import trajectory_arrays, first_hit
+
+        if index is None:
+            index = OccupancyIndex(targets)
+
+        velocity_x = self.force * cos(self.angle)
+        velocity_y = self.force * sin(self.angle)
+        x, y = trajectory_arrays(velocity_x, velocity_y)
+        length, target = first_hit(x[:-1], y[:-1], index)
+
+        self._trajectory_xy = (x[:length], y[:length])
+        last = length - 1 if target is not None else -1
+        self._position_x = float(x[last])
+        self._position_y = float(y[last])
+        return target
+
+    @staticmethod
+    def shape() -> Shape:
+        """
+        Returns the shape of the bullet on the board.
+        """
+
+        return Shape.circle((0, 0), 0.5, "red")
+
     @staticmethod
-    def draw() -> plt.Circle:
+    def draw() -> "Circle":
         """
         Returns a plot representation of the bullet.
         """
 
-        return plt.Circle((0, 0), 0.5, color="red")
+        return Bullet.shape().to_patch()
@@ -0,0 +1,365 @@
+from typing import Iterator, List, Sequence, Tuple
+from array import array
+from itertools import compress
+
+
+TARGET = 0
+OBSTACLE = 1
+BOSS = 2
+
+
+def entity_cells(
+    type_code: int, x: int, y: int, height: int = 1
+) -> List[Tuple[int, int]]:
+    """
+    Returns the board cells occupied by an entity
+    of the type, position and height given.
+    """
+
+    if type_code == OBSTACLE:
+        return [(x, y + dy) for dy in range(height)]
+    if type_code == BOSS:
+        return [(x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)]
+    return [(x, y)]
+
+
+class EntityStore:
+    """
+    Class EntityStore. Holds the targets of a level as a structure
+    of typed arrays, one element per entity.
+    Target, Obstacle and Boss instances are views of it,
+    created only when they are asked for.
+    Contains attributes:
+    :param types: type codes of the entities (TARGET, OBSTACLE or BOSS)
+    :param type: array
+
+    :param x: x positions of the entities
+    :param type: array
+
+    :param y: y positions of the entities
+    :param type: array
+
+    :param height: heights of the entities
+    :param type: array
+
+    :param health: health of the entities
+    :param type: array
+
+    :param alive: 1 for entities still on the board, 0 otherwise
+    :param type: bytearray
+
+    :param remaining: number of entities left on the board,
+    which are not obstacles
+    :param type: int
+    """
+
+    __slots__ = (
+        "_types",
+        "_x",
+        "_y",
+        "_height",
+        "_health",
+        "_alive",
+        "_remaining",
+        "_views",
+    )
+
+    def __init__(self) -> None:
+        """
+        Creates an empty instance of class EntityStore.
+        """
+
+        self._types = array("b")
+        self._x = array("i")
+        self._y = array("i")
+        self._height = array("i")
+        self._health = array("i")
+        self._alive = bytearray()
+        self._remaining = 0
+        self._views = {}
+
+    @property
+    def types(self) -> array:
+        """
+        Returns the type codes of the entities.
+        """
+
+        return self._types
+
+    @property
+    def x(self) -> array:
+        """
+        Returns the x positions of the entities.
+        """
+
+        return self._x
+
+    @property
+    def y(self) -> array:
+        """
+        Returns the y positions of the entities.
+        """
+
+        return self._y
+
+    @property
+    def height(self) -> array:
+        """
+        Returns the heights of the entities.
+        """
+
+        return self._height
+
+    @property
+    def health(self) -> array:
+        """
+        Returns the health of the entities.
+        """
+
+        return self._health
+
+    @property
+    def alive(self) -> bytearray:
+        """
+        Returns the flags of the entities still on the board.
+        """
+
+        return self._alive
+
+    @property
+    def remaining(self) -> int:
+        """
+        Returns the number of entities left on the board,
+        which are not obstacles.
+        """
+
+        return self._remaining
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the number of bytes taken by the arrays.
+        """
+
+        arrays = (self._types, self._x, self._y, self._height, self._health)
+        return sum(a.itemsize * len(a) for a in arrays) + len(self._alive)
+
+    def add(
+        self, type_code: int, x: int, y: int, height: int = 1, health: int = 1
+    ) -> int:
+        """
+        Adds an entity to the store.
+        Returns the number of the entity.
+        """
+
+        self._types.append(type_code)
+        self._x.append(x)
+        self._y.append(y)
+        self._height.append(height)
+        self._health.append(health)
+        self._alive.append(1)
+        if type_code != OBSTACLE:
+            self._remaining += 1
+        return len(self._alive) - 1
+
+    def adopt(self, target) -> int:
+        """
+        Copies the fields of a target not in any store yet
+        into the store and makes the target a view of the copy.
+        A target already viewing an entity of another store
+        stays a view of it, and the copy gets a view of its own.
+        Returns the number of the entity.
+        """
+
+        store, entity = target.store, target.entity
+        if store is None:
+            number = self.add(*target._fields())
+            target._bind(self, number)
+            self._views[number] = target
+            return number
+        number = self.add(
+            store.types[entity],
+            store.x[entity],
+            store.y[entity],
+            store.height[entity],
+            store.health[entity],
+        )
+        if not store.alive[entity]:
+            self.remove(number)
+        return number
+
+    def copy(self) -> "EntityStore":
+        """
+        Returns a new store holding copies of the entities,
+        without any views of them.
+        """
+
+        store = EntityStore()
+        store._types = array("b", self._types)
+        store._x = array("i", self._x)
+        store._y = array("i", self._y)
+        store._height = array("i", self._height)
+        store._health = array("i", self._health)
+        store._alive = bytearray(self._alive)
+        store._remaining = self._remaining
+        return store
+
+    def view(self, entity: int):
+        """
+        Returns the Target, Obstacle or Boss viewing the entity,
+        creating it if it does not exist yet.
+        """
+
+        view = self._views.get(entity)
+        if view is None:
+            from lib.target import Target, Obstacle, Boss
+
+            view_type = (Target, Obstacle, Boss)[self._types[entity]]
+            view = view_type.__new__(view_type)
+            view._bind(self, entity)
+            self._views[entity] = view
+        return view
+
+    def cells(self, entity: int) -> List[Tuple[int, int]]:
+        """
+        Returns the board cells occupied by the entity.
+        """
+
+        return entity_cells(
+            self._types[entity],
+            self._x[entity],
+            self._y[entity],
+            self._height[entity],
+        )
+
+    def hit(self, entity: int) -> bool:
+        """
+        Simulates the entity being hit.
+        Obstacles are never destroyed,
+        targets are always destroyed
+        and bosses lose one point of health.
+        Returns True if the entity was destroyed, False otherwise.
+        """
+
+        code = self._types[entity]
+        if code == OBSTACLE:
+            return False
+        if code == BOSS:
+            self._health[entity] -= 1
+            return self._health[entity] == 0
+        return True
+
+    def remove(self, entity: int) -> None:
+        """
+        Marks the entity as no longer on the board.
+        """
+
+        if self._alive[entity] and self._types[entity] != OBSTACLE:
+            self._remaining -= 1
+        self._alive[entity] = 0
+
+    def revive(self, entity: int) -> None:
+        """
+        Marks the entity as back on the board.
+        """
+
+        if not self._alive[entity] and self._types[entity] != OBSTACLE:
+            self._remaining += 1
+        self._alive[entity] = 1
+
+    def __len__(self) -> int:
+        """
+        Returns the number of entities in the store.
+        """
+
+        return len(self._alive)
+
+
+class EntityViews(Sequence):
+    """
+    Class EntityViews. The entities of a store still on the board,
+    in the order of their numbers, as a read-only sequence of views.
+    The views are created only when they are asked for,
+    so a store of many entities costs no objects until it is used.
+    Contains attributes:
+    :param store: the store viewed
+    :param type: EntityStore
+    """
+
+    def __init__(self, store: EntityStore) -> None:
+        """
+        Creates an instance of class EntityViews.
+        Takes one argument:
+        the store viewed.
+        """
+
+        self._store = store
+
+    @property
+    def store(self) -> EntityStore:
+        """
+        Returns the store viewed.
+        """
+
+        return self._store
+
+    def entities(self) -> Iterator[int]:
+        """
+        Yields the numbers of the entities still on the board.
+        """
+
+        alive = self._store.alive
+        return compress(range(len(alive)), alive)
+
+    def __iter__(self) -> Iterator:
+        """
+        Yields the views of the entities still on the board.
+        """
+
+        view = self._store.view
+        for entity in self.entities():
+            yield view(entity)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of entities still on the board.
+        """
+
+        return self._store.alive.count(1)
+
+    def __getitem__(self, position):
+        """
+        Returns the view, or the list of views for a slice,
+        of the entities at the positions in the sequence.
+        """
+
+        entities = list(self.entities())[position]
+        if isinstance(position, slice):
+            return [self._store.view(entity) for entity in entities]
+        return self._store.view(entities)
+
+    def __contains__(self, target) -> bool:
+        """
+        Returns True if the target is a view of an entity
+        of the store still on the board.
+        """
+
+        store = getattr(target, "store", None)
+        return store is self._store and bool(store.alive[target.entity])
+
+    def __eq__(self, other) -> bool:
+        """
+        Returns True if the other sequence holds the same views
+        in the same order.
+        """
+
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the views.
+        """
+
+        return repr(list(self))
@@ -0,0 +1,225 @@
+from lib.target import Target, Obstacle, Boss
+from lib.bullet import MAX_X, MAX_Y
+from lib.level import Level
+from lib.level_pack import target_entry
+from typing import Iterator, List, Optional, Tuple
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+import json
+import random
+import sys
+
+
+ANGLES = range(1, 90)
+FORCES = range(1, 101)
+LAYOUT_TRIES = 100
+PLACEMENT_TRIES = 20
+BANDS = {
+    "easy": {
+        "targets": (1, 2),
+        "obstacles": (0, 1),
+        "bosses": (0, 0),
+        "health": (2, 2),
+        "spare": (2, 3),
+        "fraction": (0.0, 1.0),
+    },
+    "medium": {
+        "targets": (1, 3),
+        "obstacles": (1, 3),
+        "bosses": (0, 1),
+        "health": (2, 3),
+        "spare": (1, 2),
+        "fraction": (0.0, 0.1),
+    },
+    "hard": {
+        "targets": (2, 4),
+        "obstacles": (2, 5),
+        "bosses": (1, 2),
+        "health": (2, 4),
+        "spare": (0, 1),
+        "fraction": (0.0, 0.03),
+    },
+}
+
+
+class InvalidBandError(Exception):
+    def __init__(self) -> None:
+        super().__init__("Band has to be one of: " + ", ".join(BANDS) + "!")
+
+
+def random_layout(rng: random.Random, band: str) -> List[Target]:
+    """
+    Places the obstacles, targets and bosses of the band
+    at random on the board, without sharing any cell.
+    An entity which does not fit after PLACEMENT_TRIES is left out.
+    """
+
+    limits = BANDS[band]
+    occupied = set()
+    layout = []
+
+    def place(create) -> None:
+        for _ in range(PLACEMENT_TRIES):
+            target = create()
+            cells = set(target.position)
+            if not cells & occupied:
+                occupied.update(cells)
+                layout.append(target)
+                return
+
+    for _ in range(rng.randint(*limits["obstacles"])):
+        place(lambda: Obstacle(rng.randint(2, MAX_X), rng.randint(1, MAX_Y // 2)))
+    for _ in range(rng.randint(*limits["bosses"])):
+        place(
+            lambda: Boss(
+                rng.randint(2, MAX_X - 1),
+                rng.randint(0, MAX_Y - 1),
+                rng.randint(*limits["health"]),
+            )
+        )
+    for _ in range(rng.randint(*limits["targets"])):
+        place(lambda: Target(rng.randint(2, MAX_X), rng.randint(0, MAX_Y)))
+    return layout
+
+
+def shots_needed(targets: List[Target]) -> int:
+    """
+    Returns the number of hits needed to destroy the targets and bosses.
+    """
+
+    return sum(
+        target.health if isinstance(target, Boss) else 1
+        for target in targets
+        if not isinstance(target, Obstacle)
+    )
+
+
+def winning_shots(
+    level: Level, rng: random.Random, fractions: Tuple[float, float] = (0.0, 1.0)
+) -> Tuple[Optional[List[Tuple[int, int]]], float]:
+    """
+    Plays the level until it is won and returns the shots played,
+    together with the fraction of first shots which hit a target or boss.
+    Removing a target only clears the paths of other shots,
+    so any shot hitting a target or boss keeps doing so until it is
+    destroyed, and playing such shots in any order wins in the fewest
+    attempts possible. The candidates are found by sweeping the board,
+    which is swept again only when none of them is left,
+    and every shot is confirmed by Level.simulate_attempt.
+    If the level cannot be won, or the fraction is not within fractions,
+    returns None instead of the shots.
+    """
+
+    shots = []
+    fraction = None
+    while not level.result:
+        codes = level.sweep(ANGLES, FORCES)
+        targets = level.targets
+        rows, columns = (codes >= 0).nonzero()
+        candidates = []
+        for row, column in zip(rows.tolist(), columns.tolist()):
+            target = targets[codes[row, column]]
+            if not isinstance(target, Obstacle):
+                candidates.append((ANGLES[row], FORCES[column], target))
+        if fraction is None:
+            fraction = len(candidates) / codes.size
+            if not fractions[0] <= fraction <= fractions[1]:
+                return None, fraction
+        if not candidates:
+            return None, fraction
+        rng.shuffle(candidates)
+
+        for angle, force, target in candidates:
+            if target not in level.targets:
+                continue
+            if level.attempts == 0:
+                return None, fraction
+            if level.simulate_attempt(angle, force) is not target:
+                return None, fraction
+            shots.append((angle, force))
+            if level.result:
+                break
+    return shots, fraction
+
+
+def generate_level(band: str, seed: str) -> str:
+    """
+    Generates a level of the band from the seed,
+    trying random layouts until one can be won
+    within its attempts and its fraction of winning first shots
+    lies within the band.
+    Returns the line of the level in a level pack,
+    holding also the band and the winning shots found.
+    Raises InvalidBandError if the band is not known,
+    and RuntimeError if no layout was found in LAYOUT_TRIES.
+    """
+
+    if band not in BANDS:
+        raise InvalidBandError()
+    rng = random.Random(seed)
+    for _ in range(LAYOUT_TRIES):
+        layout = random_layout(rng, band)
+        needed = shots_needed(layout)
+        if needed == 0:
+            continue
+        attempts = needed + rng.randint(*BANDS[band]["spare"])
+        entries = [target_entry(target) for target in layout]
+
+        level = Level(attempts, layout)
+        shots, _ = winning_shots(level, rng, BANDS[band]["fraction"])
+        if shots is not None:
+            level = {
+                "attempts": attempts,
+                "targets": entries,
+                "band": band,
+                "solution": [list(shot) for shot in shots],
+            }
+            return json.dumps(level) + "\n"
+    raise RuntimeError(f"No level of band {band} found for seed {seed}!")
+
+
+def _generate(arguments: Tuple[str, str]) -> str:
+    return generate_level(*arguments)
+
+
+def generate_levels(
+    count: int, bands: List[str], seed: int = 0, workers: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Generates count levels of every band, in the order of the bands,
+    in a pool of worker processes.
+    Every level has its own seed, derived from the seed,
+    so the levels do not depend on the number of workers.
+    Yields the lines of the levels in a level pack.
+    """
+
+    for band in bands:
+        if band not in BANDS:
+            raise InvalidBandError()
+    tasks = [(band, f"{seed}/{band}/{n}") for band in bands for n in range(count)]
+    if workers == 1:
+        yield from map(_generate, tasks)
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(_generate, tasks, chunksize=4)
+
+
+def main(args: List[str]) -> int:
+    parser = ArgumentParser(description="Generates a pack of levels which can be won.")
+    parser.add_argument("path", help="path of the level pack to write")
+    parser.add_argument("--count", type=int, default=10, help="levels of every band")
+    parser.add_argument("--bands", nargs="+", choices=list(BANDS), default=list(BANDS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="processes, all CPUs by default")
+    options = parser.parse_args(args[1:])
+
+    with open(options.path, "w") as file:
+        for line in generate_levels(
+            options.count, options.bands, options.seed, options.workers
+        ):
+            file.write(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,281 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+from collections import deque
+from contextlib import nullcontext
+from math import ceil
+from statistics import median
+import sys
+import time
+
+
+STAGES = (
+    "trajectory",
+    "collision",
+    "removal",
+    "render",
+    "composite",
+    "encode",
+    "pixmap",
+)
+WINDOW = 512
+
+
+class Histogram:
+    """
+    Class Histogram. Keeps the last samples of a measurement.
+    Contains attributes:
+    :param samples: the samples kept, oldest first
+    :param type: List[float]
+
+    :param count: number of samples ever added
+    :param type: int
+    """
+
+    def __init__(self, size: int = WINDOW) -> None:
+        """
+        Creates an instance of class Histogram.
+        Takes one argument:
+        the number of samples kept.
+        """
+
+        self._samples = deque(maxlen=size)
+        self._count = 0
+
+    @property
+    def samples(self) -> List[float]:
+        """
+        Returns the samples kept, oldest first.
+        """
+
+        return list(self._samples)
+
+    @property
+    def count(self) -> int:
+        """
+        Returns the number of samples ever added.
+        """
+
+        return self._count
+
+    def add(self, value: float) -> None:
+        """
+        Adds a sample, forgetting the oldest one if the histogram is full.
+        """
+
+        self._samples.append(value)
+        self._count += 1
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns the sample below which the fraction of the samples lies,
+        by the nearest rank. Returns 0 if there are no samples.
+        """
+
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[max(ceil(fraction * len(ordered)) - 1, 0)]
+
+    def bins(self, edges: Sequence[float]) -> List[int]:
+        """
+        Returns the number of samples between each pair of edges,
+        the last bin counting every sample from the last edge up.
+        """
+
+        counts = [0] * len(edges)
+        for value in self._samples:
+            for number in range(len(edges) - 1, -1, -1):
+                if value >= edges[number]:
+                    counts[number] += 1
+                    break
+        return counts
+
+
+class Stage:
+    """
+    Class Stage. Measures the wall time and the number of
+    memory blocks allocated while its block runs,
+    and records them in the recorder.
+    """
+
+    __slots__ = ("_recorder", "_name", "_start", "_blocks")
+
+    def __init__(self, recorder: "Recorder", name: str) -> None:
+        """
+        Creates an instance of class Stage.
+        """
+
+        self._recorder = recorder
+        self._name = name
+
+    def __enter__(self) -> "Stage":
+        self._blocks = sys.getallocatedblocks()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exception) -> None:
+        elapsed = time.perf_counter() - self._start
+        blocks = sys.getallocatedblocks() - self._blocks
+        self._recorder.record(self._name, elapsed, blocks)
+
+
+class Recorder:
+    """
+    Class Recorder. Keeps rolling histograms of the wall time
+    and of the allocated memory blocks of every stage.
+    Contains attributes:
+    :param times: histograms of the wall times, in seconds, by stage
+    :param type: Dict[str, Histogram]
+
+    :param blocks: histograms of the memory blocks allocated, by stage
+    :param type: Dict[str, Histogram]
+    """
+
+    def __init__(self, window: int = WINDOW) -> None:
+        """
+        Creates an instance of class Recorder.
+        Takes one argument:
+        the number of samples kept of every stage.
+        """
+
+        self._window = window
+        self._times = {name: Histogram(window) for name in STAGES}
+        self._blocks = {name: Histogram(window) for name in STAGES}
+
+    @property
+    def times(self) -> Dict[str, Histogram]:
+        """
+        Returns the histograms of the wall times by stage.
+        """
+
+        return self._times
+
+    @property
+    def blocks(self) -> Dict[str, Histogram]:
+        """
+        Returns the histograms of the allocated memory blocks by stage.
+        """
+
+        return self._blocks
+
+    def stage(self, name: str) -> Stage:
+        """
+        Returns a context manager measuring the stage.
+        """
+
+        return Stage(self, name)
+
+    def record(self, name: str, seconds: float, blocks: int = 0) -> None:
+        """
+        Adds a measurement of the stage.
+        """
+
+        if name not in self._times:
+            self._times[name] = Histogram(self._window)
+            self._blocks[name] = Histogram(self._window)
+        self._times[name].add(seconds)
+        self._blocks[name].add(blocks)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the number of measurements, the median and
+        95th percentile of the wall time and the median of
+        the allocated blocks of every stage measured.
+        """
+
+        return {
+            name: {
+                "count": times.count,
+                "median": median(times.samples),
+                "p95": times.percentile(0.95),
+                "blocks": median(self._blocks[name].samples),
+            }
+            for name, times in self._times.items()
+            if times.count
+        }
+
+
+class TimedIndex:
+    """
+    Class TimedIndex. Stands for an occupancy index
+    and adds up the time spent looking cells up in it.
+    """
+
+    def __init__(self, index) -> None:
+        """
+        Creates an instance of class TimedIndex.
+        Takes one argument:
+        the occupancy index looked up.
+        """
+
+        self._index = index
+        self._elapsed = 0.0
+
+    def get(self, cell: Tuple[int, int]):
+        start = time.perf_counter()
+        occupant = self._index.get(cell)
+        self._elapsed += time.perf_counter() - start
+        return occupant
+
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        start = time.perf_counter()
+        found = cell in self._index
+        self._elapsed += time.perf_counter() - start
+        return found
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getattr__(self, name: str):
+        return getattr(self._index, name)
+
+    def take(self) -> float:
+        """
+        Returns the time spent on lookups since the last call.
+        """
+
+        elapsed, self._elapsed = self._elapsed, 0.0
+        return elapsed
+
+
+_recorder: Optional[Recorder] = None
+_disabled = nullcontext()
+
+
+def enable(window: int = WINDOW) -> Recorder:
+    """
+    Starts recording the stages, keeping the last window samples
+    of every stage. Returns the recorder.
+    """
+
+    global _recorder
+    if _recorder is None:
+        _recorder = Recorder(window)
+    return _recorder
+
+
+def disable() -> None:
+    """
+    Stops recording the stages and forgets the measurements.
+    """
+
+    global _recorder
+    _recorder = None
+
+
+def recorder() -> Optional[Recorder]:
+    """
+    Returns the recorder, or None if recording is disabled.
+    """
+
+    return _recorder
+
+
+def stage(name: str):
+    """
+    Returns a context manager measuring the stage.
+    While recording is disabled, it is a shared one doing nothing.
+    """
+
+    if _recorder is None:
+        return _disabled
+    return _recorder.stage(name)
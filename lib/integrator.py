@@ -0,0 +1,439 @@
+from lib.target import Target
+from lib.bullet import Bullet, MAX_X, MAX_Y, MAX_FORCE, GRAVITY, TIME_STEP
+from lib.occupancy import OccupancyIndex
+from typing import Iterator, List, Optional, Tuple
+from math import cos, hypot, inf, sin, sqrt
+
+
+DRAG = 0.01
+TOLERANCE = 1e-6
+MAX_STEP = 0.1
+RESOLUTION = MAX_FORCE * TIME_STEP
+
+State = Tuple[float, float, float, float]
+
+
+class InvalidDragError(Exception):
+    def __init__(self) -> None:
+        super().__init__("Drag has to be a number not less than 0!")
+
+
+class InvalidStepError(Exception):
+    def __init__(self) -> None:
+        super().__init__("Step has to be greater than 0!")
+
+
+class Integrator:
+    """
+    Class Integrator. Moves a bullet through the board
+    by integrating its equations of motion under gravity
+    and quadratic air drag, with an explicit Runge-Kutta method.
+    An instance is a trajectory engine of a level.
+    Contains attributes:
+    :param drag: drag coefficient, the deceleration of the bullet
+    divided by the square of its speed
+    :param type: float
+    """
+
+    def __init__(self, drag: float = DRAG) -> None:
+        """
+        Creates an instance of class Integrator.
+        Takes one argument:
+        the drag coefficient, 0 for motion without air resistance.
+        Raises InvalidDragError if the drag given is negative.
+        """
+
+        if drag < 0:
+            raise InvalidDragError()
+        self._drag = drag
+
+    @property
+    def drag(self) -> float:
+        """
+        Returns the drag coefficient.
+        """
+
+        return self._drag
+
+    def acceleration(self, velocity_x: float, velocity_y: float) -> Tuple[float, float]:
+        """
+        Returns the acceleration of a bullet moving at the given velocity.
+        """
+
+        resistance = self._drag * hypot(velocity_x, velocity_y)
+        return -resistance * velocity_x, -GRAVITY - resistance * velocity_y
+
+    def step(self, state: State, time_step: float) -> Tuple[State, float]:
+        """
+        Advances the state (x, y, velocity x, velocity y)
+        of the bullet by the time step.
+        Returns the new state and the estimate of its error,
+        which is 0 for methods without an embedded estimate.
+        """
+
+        raise NotImplementedError
+
+    def path(
+        self, velocity_x: float, velocity_y: float, index: OccupancyIndex
+    ) -> Iterator[Tuple[float, float]]:
+        """
+        Yields the positions of a bullet fired from the origin
+        at the given velocity, while it is on the board.
+        """
+
+        raise NotImplementedError
+
+    def __call__(
+        self, bullet: Bullet, targets: List[Target], index: OccupancyIndex = None
+    ) -> Target:
+        """
+        Calculates the trajectory of the bullet.
+        Returns the target that was hit.
+        If the bullet missed, returns None.
+        """
+
+        if index is None:
+            index = OccupancyIndex(targets)
+        velocity_x = bullet.force * cos(bullet.angle)
+        velocity_y = bullet.force * sin(bullet.angle)
+        return bullet.follow_path(self.path(velocity_x, velocity_y, index), index)
+
+
+class FixedStepIntegrator(Integrator):
+    """
+    Class FixedStepIntegrator. Integrates with the classical
+    fourth order Runge-Kutta method and a fixed time step.
+    Without drag, it visits the positions of Bullet.calculate_trajectory.
+    Contains attributes:
+    :param time_step: the time step
+    :param type: float
+    """
+
+    def __init__(self, drag: float = DRAG, time_step: float = TIME_STEP) -> None:
+        """
+        Creates an instance of class FixedStepIntegrator.
+        Takes two arguments:
+        the drag coefficient and the time step.
+        Raises InvalidDragError if the drag given is negative.
+        Raises InvalidStepError if the time step given is not positive.
+        """
+
+        super().__init__(drag)
+        if time_step <= 0:
+            raise InvalidStepError()
+        self._time_step = time_step
+
+    @property
+    def time_step(self) -> float:
+        """
+        Returns the time step.
+        """
+
+        return self._time_step
+
+    def step(self, state: State, time_step: float) -> Tuple[State, float]:
+        x, y, velocity_x, velocity_y = state
+        acceleration = self.acceleration
+        half = time_step / 2
+        a1x, a1y = acceleration(velocity_x, velocity_y)
+        v2x, v2y = velocity_x + half * a1x, velocity_y + half * a1y
+        a2x, a2y = acceleration(v2x, v2y)
+        v3x, v3y = velocity_x + half * a2x, velocity_y + half * a2y
+        a3x, a3y = acceleration(v3x, v3y)
+        v4x, v4y = velocity_x + time_step * a3x, velocity_y + time_step * a3y
+        a4x, a4y = acceleration(v4x, v4y)
+
+        sixth = time_step / 6
+        return (
+            x + sixth * (velocity_x + 2 * (v2x + v3x) + v4x),
+            y + sixth * (velocity_y + 2 * (v2y + v3y) + v4y),
+            velocity_x + sixth * (a1x + 2 * (a2x + a3x) + a4x),
+            velocity_y + sixth * (a1y + 2 * (a2y + a3y) + a4y),
+        ), 0.0
+
+    def path(
+        self, velocity_x: float, velocity_y: float, index: OccupancyIndex
+    ) -> Iterator[Tuple[float, float]]:
+        state = (0.0, 0.0, velocity_x, velocity_y)
+        while state[0] <= MAX_X and state[1] >= 0:
+            yield state[0], state[1]
+            state, _ = self.step(state, self._time_step)
+
+
+class AdaptiveIntegrator(Integrator):
+    """
+    Class AdaptiveIntegrator. Integrates with the Dormand-Prince
+    embedded Runge-Kutta method, choosing every time step
+    to keep the estimated error below the tolerance.
+    Steps are also kept short enough not to jump over an occupied cell
+    or far past an edge of the board, so only near targets and edges
+    they shrink to moving the bullet by the resolution.
+    Contains attributes:
+    :param tolerance: the largest error of a step, in cells or cells per second
+    :param type: float
+
+    :param resolution: the longest move, in cells, near targets and edges
+    :param type: float
+
+    :param min_step: the shortest time step
+    :param type: float
+
+    :param max_step: the longest time step
+    :param type: float
+    """
+
+    def __init__(
+        self,
+        drag: float = DRAG,
+        tolerance: float = TOLERANCE,
+        resolution: float = RESOLUTION,
+        min_step: float = TIME_STEP / 10,
+        max_step: float = MAX_STEP,
+    ) -> None:
+        """
+        Creates an instance of class AdaptiveIntegrator.
+        Takes five arguments:
+        the drag coefficient, the tolerance of the error of a step,
+        the longest move near targets and edges,
+        and the shortest and longest time steps.
+        Raises InvalidDragError if the drag given is negative.
+        Raises InvalidStepError if the resolution or the steps given
+        are not positive, or the shortest step is longer than the longest.
+        """
+
+        super().__init__(drag)
+        if resolution <= 0 or min_step <= 0 or max_step < min_step:
+            raise InvalidStepError()
+        self._tolerance = tolerance
+        self._resolution = resolution
+        self._min_step = min_step
+        self._max_step = max_step
+        self._field = None
+
+    @property
+    def tolerance(self) -> float:
+        """
+        Returns the largest error of a step.
+        """
+
+        return self._tolerance
+
+    @property
+    def resolution(self) -> float:
+        """
+        Returns the longest move near targets and edges.
+        """
+
+        return self._resolution
+
+    @property
+    def min_step(self) -> float:
+        """
+        Returns the shortest time step.
+        """
+
+        return self._min_step
+
+    @property
+    def max_step(self) -> float:
+        """
+        Returns the longest time step.
+        """
+
+        return self._max_step
+
+    def step(self, state: State, time_step: float) -> Tuple[State, float]:
+        x, y, v1x, v1y = state
+        acceleration = self.acceleration
+        h = time_step
+        a1x, a1y = acceleration(v1x, v1y)
+        v2x = v1x + h * (a1x / 5)
+        v2y = v1y + h * (a1y / 5)
+        a2x, a2y = acceleration(v2x, v2y)
+        v3x = v1x + h * (3 / 40 * a1x + 9 / 40 * a2x)
+        v3y = v1y + h * (3 / 40 * a1y + 9 / 40 * a2y)
+        a3x, a3y = acceleration(v3x, v3y)
+        v4x = v1x + h * (44 / 45 * a1x - 56 / 15 * a2x + 32 / 9 * a3x)
+        v4y = v1y + h * (44 / 45 * a1y - 56 / 15 * a2y + 32 / 9 * a3y)
+        a4x, a4y = acceleration(v4x, v4y)
+        v5x = v1x + h * (
+            19372 / 6561 * a1x
+            - 25360 / 2187 * a2x
+            + 64448 / 6561 * a3x
+            - 212 / 729 * a4x
+        )
+        v5y = v1y + h * (
+            19372 / 6561 * a1y
+            - 25360 / 2187 * a2y
+            + 64448 / 6561 * a3y
+            - 212 / 729 * a4y
+        )
+        a5x, a5y = acceleration(v5x, v5y)
+        v6x = v1x + h * (
+            9017 / 3168 * a1x
+            - 355 / 33 * a2x
+            + 46732 / 5247 * a3x
+            + 49 / 176 * a4x
+            - 5103 / 18656 * a5x
+        )
+        v6y = v1y + h * (
+            9017 / 3168 * a1y
+            - 355 / 33 * a2y
+            + 46732 / 5247 * a3y
+            + 49 / 176 * a4y
+            - 5103 / 18656 * a5y
+        )
+        a6x, a6y = acceleration(v6x, v6y)
+        v7x = v1x + h * (
+            35 / 384 * a1x
+            + 500 / 1113 * a3x
+            + 125 / 192 * a4x
+            - 2187 / 6784 * a5x
+            + 11 / 84 * a6x
+        )
+        v7y = v1y + h * (
+            35 / 384 * a1y
+            + 500 / 1113 * a3y
+            + 125 / 192 * a4y
+            - 2187 / 6784 * a5y
+            + 11 / 84 * a6y
+        )
+        a7x, a7y = acceleration(v7x, v7y)
+
+        new_state = (
+            x
+            + h
+            * (
+                35 / 384 * v1x
+                + 500 / 1113 * v3x
+                + 125 / 192 * v4x
+                - 2187 / 6784 * v5x
+                + 11 / 84 * v6x
+            ),
+            y
+            + h
+            * (
+                35 / 384 * v1y
+                + 500 / 1113 * v3y
+                + 125 / 192 * v4y
+                - 2187 / 6784 * v5y
+                + 11 / 84 * v6y
+            ),
+            v7x,
+            v7y,
+        )
+        errors = [
+            71 / 57600 * k1
+            - 71 / 16695 * k3
+            + 71 / 1920 * k4
+            - 17253 / 339200 * k5
+            + 22 / 525 * k6
+            - 1 / 40 * k7
+            for k1, k3, k4, k5, k6, k7 in (
+                (v1x, v3x, v4x, v5x, v6x, v7x),
+                (v1y, v3y, v4y, v5y, v6y, v7y),
+                (a1x, a3x, a4x, a5x, a6x, a7x),
+                (a1y, a3y, a4y, a5y, a6y, a7y),
+            )
+        ]
+        return new_state, h * max(abs(error) for error in errors)
+
+    def distances(self, index: OccupancyIndex) -> Optional[List[List[float]]]:
+        """
+        Returns the distance, in cells, from every cell of the board
+        to the nearest occupied one, measured as the larger
+        of the horizontal and vertical distances, by column and row.
+        The rows reach up to the highest occupied cell,
+        every cell above is at least as far as the one below it.
+        Returns None if no cell of the board is occupied.
+        The distances are kept until the index changes.
+        """
+
+        field = self._field
+        if field is not None and field[0] is index.cells and field[1] == index.version:
+            return field[2]
+
+        occupied = [(x, y) for x, y in index.cells if 0 <= x <= MAX_X and y >= 0]
+        distances = None
+        if occupied:
+            top = max(MAX_Y, max(y for _, y in occupied))
+            distances = [[inf] * (top + 1) for _ in range(MAX_X + 1)]
+            for x, y in occupied:
+                distances[x][y] = 0
+            passes = (
+                (range(MAX_X + 1), range(top + 1), -1),
+                (range(MAX_X, -1, -1), range(top, -1, -1), 1),
+            )
+            for columns, rows, back in passes:
+                for x in columns:
+                    column = distances[x]
+                    previous = distances[x + back] if 0 <= x + back <= MAX_X else None
+                    for y in rows:
+                        nearest = column[y]
+                        if 0 <= y + back <= top:
+                            nearest = min(nearest, column[y + back] + 1)
+                        if previous is not None:
+                            for dy in (-1, 0, 1):
+                                if 0 <= y + dy <= top:
+                                    nearest = min(nearest, previous[y + dy] + 1)
+                        column[y] = nearest
+        self._field = (index.cells, index.version, distances)
+        return distances
+
+    def clearance(
+        self, x: float, y: float, distances: Optional[List[List[float]]]
+    ) -> float:
+        """
+        Returns how far, in cells along either axis,
+        the bullet at the position can move
+        without entering an occupied cell or leaving the board.
+        """
+
+        edge = min(MAX_X - x, y)
+        if distances is None:
+            return max(edge, 0.0)
+        column = distances[min(max(round(x), 0), MAX_X)]
+        cells = column[min(max(round(y), 0), len(column) - 1)]
+        return max(min(cells - 1, edge), 0.0)
+
+    def step_limit(self, state: State, clearance: float) -> float:
+        """
+        Returns the longest time step in which the bullet
+        cannot move further than the clearance, or the resolution
+        if it is larger, but not shorter than the shortest step.
+        """
+
+        clearance = max(clearance, self._resolution)
+        speed = hypot(state[2], state[3])
+        limit = (sqrt(speed**2 + 2 * GRAVITY * clearance) - speed) / GRAVITY
+        return max(limit, self._min_step)
+
+    def path(
+        self, velocity_x: float, velocity_y: float, index: OccupancyIndex
+    ) -> Iterator[Tuple[float, float]]:
+        distances = self.distances(index)
+        state = (0.0, 0.0, velocity_x, velocity_y)
+        time_step = self._max_step
+        while state[0] <= MAX_X and state[1] >= 0:
+            yield state[0], state[1]
+            clearance = self.clearance(state[0], state[1], distances)
+            time_step = min(time_step, self.step_limit(state, clearance))
+            while True:
+                new_state, error = self.step(state, time_step)
+                if error <= self._tolerance or time_step <= self._min_step:
+                    break
+                time_step = max(time_step * self.scale(error), self._min_step)
+            state = new_state
+            time_step = min(
+                max(time_step * self.scale(error), self._min_step), self._max_step
+            )
+
+    def scale(self, error: float) -> float:
+        """
+        Returns the factor by which the next time step is multiplied
+        after a step with the error estimate.
+        """
+
+        if error == 0:
+            return 5.0
+        return min(max(0.9 * (self._tolerance / error) ** 0.2, 0.2), 5.0)
@@ -1,7 +1,21 @@
 from lib.target import Target
-from lib.bullet import Bullet, MAX_X, MAX_Y
-from typing import List, Tuple
-from matplotlib import pyplot as plt
+from lib.entities import EntityStore, EntityViews
+from lib.bullet import Bullet
+from lib.occupancy import OccupancyIndex, StoreIndex
+from lib.solver import force_interval, solve_shots
+from lib.atlas import atlas_trajectory
+from lib.integrator import AdaptiveIntegrator
+from lib.bitboard import bitboard_trajectory
+from lib.instrumentation import TimedIndex, recorder, stage
+from lib.snapshot import Snapshot, ForeignSnapshotError, NothingToUndoError
+from typing import Callable, List, Sequence, Tuple, Union
+from lib.renderer import (
+    Renderer,
+    Frame,
+    RENDERERS,
+    InvalidRendererError,
+    create_renderer,
+)
 from io import BytesIO
 
 
@@ -10,11 +24,36 @@ class IvalidAttemptsError(Exception):
         super().__init__("Number of attempts cannot be less than one!")
 
 
+class InvalidEngineError(Exception):
+    def __init__(self) -> None:
+        super().__init__(
+            "Engine has to be callable or one of: " + ", ".join(ENGINES) + "!"
+        )
+
+
+ENGINES = {
+    "step": Bullet.calculate_trajectory,
+    "exact": Bullet.calculate_exact_trajectory,
+    "vectorized": Bullet.calculate_vectorized_trajectory,
+    "atlas": atlas_trajectory,
+    "drag": AdaptiveIntegrator(),
+    "bitboard": bitboard_trajectory,
+}
+
+
 class Level:
     """
     Class Level. Contains attributes:
-    :param targets: List of taargets on the board
-    :param type: List[Target]
+    :param targets: List of taargets on the board,
+    viewing the store and created as they are asked for
+    :param type: EntityViews
+
+    :param store: Store holding the targets of the level
+    :param type: EntityStore
+
+    :param index: Occupancy index of the targets on the board,
+    backed by the store
+    :param type: StoreIndex
 
     :param attempts: Number of permitted attempts for the level
     :param type: int
@@ -24,25 +63,65 @@ class Level:
 
     :param trajectory: Bullets trajectory
     :param type: trajectory: List[Tuple[float, float]]
+
+    :param renderer: Renderer of the board
+    :param type: Renderer
+
+    :param renderer_name: Name of the renderer, one of RENDERERS
+    :param type: str
+
+    :param engine: Engine calculating the trajectories
+    :param type: Union[str, Callable]
+
+    :param snapshot: Snapshot of the current state of the level
+    :param type: Snapshot
     """
 
-    def __init__(self, attempts: int, targets: List[Target]) -> None:
+    def __init__(
+        self,
+        attempts: int,
+        targets: Union[List[Target], EntityStore],
+        engine: Union[str, Callable] = "step",
+        renderer: str = "matplotlib",
+    ) -> None:
         """
         Creates an instance of class Level.
-        Takes three arguments:
+        Takes four arguments:
         the number of attempts permitted,
-        the list of targets on the board
-        and the UI window.
+        the list of targets on the board,
+        which are adopted into the store of the level,
+        or a ready store of them,
+        and the trajectory engine: either the name of one of ENGINES,
+        or a callable taking the bullet, the targets and the index,
+        and the name of the renderer of the board.
         Raises IvalidAttemptsError if the number of attempts given
         is less than 1.
+        Raises InvalidEngineError if the engine given is not known.
+        Raises InvalidRendererError if the renderer given is not known.
         """
 
         if attempts < 1:
             raise IvalidAttemptsError()
+        if not callable(engine) and engine not in ENGINES:
+            raise InvalidEngineError()
+        if renderer not in RENDERERS:
+            raise InvalidRendererError()
+        self._engine = engine
+        self._renderer_name = renderer
         self._attempts = attempts
-        self._targets = targets
-        self._trajectory = []
+        if isinstance(targets, EntityStore):
+            self._store = targets
+        else:
+            self._store = EntityStore()
+            for target in targets:
+                self._store.adopt(target)
+        self._targets = EntityViews(self._store)
+        self._index = StoreIndex(self._store)
+        self._bullet = None
+        self._timed_index = None
+        self._renderer = None
         self._result = False
+        self._snapshot = Snapshot(None, attempts, False)
 
     @property
     def attempts(self) -> int:
@@ -53,20 +132,77 @@ class Level:
         return self._attempts
 
     @property
-    def targets(self) -> List[Target]:
+    def targets(self) -> EntityViews:
         """
         Returns the list of targets in the level.
         """
 
         return self._targets
 
+    @property
+    def store(self) -> EntityStore:
+        """
+        Returns the store holding the targets of the level.
+        """
+
+        return self._store
+
+    @property
+    def renderer(self) -> Renderer:
+        """
+        Returns the renderer of the board,
+        creating it on first use.
+        """
+
+        if self._renderer is None:
+            self._renderer = create_renderer(self._renderer_name)
+            self._renderer.sync(self.targets)
+        return self._renderer
+
+    @property
+    def renderer_name(self) -> str:
+        """
+        Returns the name of the renderer of the board.
+        """
+
+        return self._renderer_name
+
+    @property
+    def index(self) -> StoreIndex:
+        """
+        Returns the occupancy index of the targets in the level.
+        """
+
+        return self._index
+
     @property
     def trajectory(self) -> List[Tuple[float, float]]:
         """
         Returns the Bullets trajectory
         """
 
-        return self._trajectory
+        if self._bullet is None:
+            return []
+        return self._bullet.trajectory
+
+    @property
+    def trajectory_xy(self) -> Tuple[Sequence[float], Sequence[float]]:
+        """
+        Returns the x and y coordinates of the Bullets trajectory.
+        With the vectorized engine these are NumPy arrays.
+        """
+
+        if self._bullet is None:
+            return [], []
+        return self._bullet.trajectory_xy
+
+    @property
+    def engine(self) -> Union[str, Callable]:
+        """
+        Returns the trajectory engine.
+        """
+
+        return self._engine
 
     @property
     def result(self) -> bool:
@@ -78,40 +214,99 @@ class Level:
 
     def draw_board(self) -> BytesIO:
         """
-        Creates a pyplot figure representing the current
-        state of the board.
+        Renders the current state of the board as a PNG image.
         """
 
-        plt.close()
-        plt.clf()
-        plt.figure(figsize=(8, 4), dpi=200)
-        plt.xlim(0, MAX_X + 1)
-        plt.ylim(0, MAX_Y + 1)
-        plt.xticks([])
-        plt.yticks([])
+        self.renderer.sync(self.targets)
+        self.renderer.hide_trajectory()
+        return self.renderer.to_png()
 
-        fig = plt.gcf()
-        ax = fig.gca()
-        ax.add_patch(Bullet.draw())
-        for target in self.targets:
-            ax.add_patch(target.draw())
+    def draw_trajectory(self) -> BytesIO:
+        """
+        Draws the bullets trajectory on the last board drawn.
+        Returns the PNG image.
+        """
 
-        buffer = BytesIO()
-        fig.savefig(buffer)
-        return buffer
+        self.renderer.set_trajectory(*self.trajectory_xy)
+        return self.renderer.to_png()
 
-    def draw_trajectory(self) -> BytesIO:
+    def render_board(self) -> Frame:
         """
-        Draws the bullets trajectory on the board.
+        Renders the current state of the board as raw RGBA pixels.
         """
 
-        x = [p[0] for p in self.trajectory]
-        y = [p[1] for p in self.trajectory]
-        plt.plot(x, y, ":", color="black")
+        self.renderer.sync(self.targets)
+        self.renderer.hide_trajectory()
+        return self.renderer.render()
+
+    def render_trajectory(self) -> Frame:
+        """
+        Renders the bullets trajectory on the last board drawn
+        as raw RGBA pixels.
+        """
+
+        self.renderer.set_trajectory(*self.trajectory_xy)
+        return self.renderer.render()
+
+    def sweep(
+        self,
+        angles: Sequence[int],
+        forces: Sequence[int],
+        code_dtype: str = "int16",
+        float_dtype: str = "float64",
+    ):
+        """
+        Calculates what every combination of angle and force
+        would hit on the current board, without changing the level.
+        Returns a NumPy array of shape (len(angles), len(forces))
+        holding the position of the first target hit in targets,
+        or -1 if the shot missed.
+        The codes are stored as code_dtype and the positions
+        are calculated as float_dtype.
+        """
 
-        buffer = BytesIO()
-        plt.savefig(buffer)
-        return buffer
+        from lib.vectorized import sweep
+
+        return sweep(self.targets, self._index, angles, forces, code_dtype, float_dtype)
+
+    def solve_shots(self, cell: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Finds every shot which reaches the cell on the current board
+        before any other occupied cell.
+        With the exact engine the shots follow its closed-form path.
+        With any other engine every force within the interval
+        solved for each angle is played with the engine of the level,
+        and a shot is kept if it hits the target in the cell,
+        or would hit one placed in the empty cell.
+        The interval ignores air drag, so with the drag engine
+        and with engines given as callables every force is played.
+        The level is not changed.
+        Returns the list of (angle, force) pairs.
+        """
+
+        calculate = self._engine
+        if calculate == "exact":
+            return solve_shots(cell, self._index)
+        scan = callable(calculate) or calculate == "drag"
+        if not callable(calculate):
+            calculate = ENGINES[calculate]
+        targets = self._targets
+        index = self._index
+        target = index.get(cell)
+        if target is None:
+            target = Target(*cell)
+            targets = list(targets) + [target]
+            index = OccupancyIndex(targets)
+
+        shots = []
+        for angle in range(1, 90):
+            forces = (1, 100) if scan else force_interval(angle, cell)
+            if forces is None:
+                continue
+            for force in range(forces[0], forces[1] + 1):
+                if calculate(Bullet(angle, force), targets, index) is target:
+                    shots.append((angle, force))
+        return shots
 
     def simulate_attempt(self, angle, force) -> Target:
         """
@@ -119,17 +314,132 @@ class Level:
         Takes the angle and force as input.
         Sets result to true if the level was won.
         Returns the Target that was hit.
+        While instrumentation is enabled, records the trajectory,
+        collision and removal stages.
         """
 
         bullet = Bullet(angle, force)
-        attempt_result = bullet.calculate_trajectory(self.targets)
-        self._trajectory = bullet.trajectory
+        calculate = self._engine
+        if not callable(calculate):
+            calculate = ENGINES[calculate]
+        index = self._index
+        if recorder() is not None:
+            if self._timed_index is None:
+                self._timed_index = TimedIndex(self._index)
+            index = self._timed_index
+        with stage("trajectory"):
+            attempt_result = calculate(bullet, self.targets, index)
+        if index is not self._index:
+            recorder().record("collision", index.take())
+        self._bullet = bullet
         self._attempts -= 1
 
+        entity = -1
+        health_before = health_after = 0
+        removed = False
         if attempt_result is not None:
-            if attempt_result.hit():
-                self._targets.remove(attempt_result)
-                if all(str(target) == "Obstacle" for target in self.targets):
-                    self._result = True
+            with stage("removal"):
+                entity = attempt_result.entity
+                health_before = self._store.health[entity]
+                removed = attempt_result.hit()
+                health_after = self._store.health[entity]
+                if removed:
+                    self._store.remove(entity)
+                    self._index.remove(attempt_result)
+                    if self._store.remaining == 0:
+                        self._result = True
 
+        self._snapshot = Snapshot(
+            self._snapshot,
+            self._attempts,
+            self._result,
+            entity,
+            health_before,
+            health_after,
+            removed,
+        )
         return attempt_result
+
+    @property
+    def snapshot(self) -> Snapshot:
+        """
+        Returns the snapshot of the current state of the level.
+        Taking it copies nothing, every attempt adds
+        one snapshot holding only what the attempt changed.
+        """
+
+        return self._snapshot
+
+    @property
+    def can_undo(self) -> bool:
+        """
+        Returns True if there is an attempt to undo.
+        """
+
+        return self._snapshot.parent is not None
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """
+        Brings the level back or forward to the state of the snapshot,
+        undoing and redoing only the attempts between
+        the current state and the snapshot.
+        Targets put back keep their places in targets and in the index.
+        The trajectory of the last attempt is forgotten.
+        Raises ForeignSnapshotError if the snapshot
+        was not taken of this level.
+        """
+
+        if snapshot.root is not self._snapshot.root:
+            raise ForeignSnapshotError()
+
+        undo, redo = self._snapshot.path(snapshot)
+        store = self._store
+        for change in undo:
+            entity = change.entity
+            if entity < 0:
+                continue
+            store.health[entity] = change.health_before
+            if change.removed:
+                store.revive(entity)
+                self._index.insert(store.view(entity))
+        for change in redo:
+            entity = change.entity
+            if entity < 0:
+                continue
+            store.health[entity] = change.health_after
+            if change.removed:
+                store.remove(entity)
+                self._index.remove(store.view(entity))
+
+        self._attempts = snapshot.attempts
+        self._result = snapshot.result
+        self._snapshot = snapshot
+        self._bullet = None
+
+    def undo(self) -> None:
+        """
+        Undoes the last attempt.
+        Raises NothingToUndoError if no attempt was made.
+        """
+
+        if not self.can_undo:
+            raise NothingToUndoError()
+        self.restore(self._snapshot.parent)
+
+    def branch(self) -> "Level":
+        """
+        Returns a new level in the current state of this one,
+        with its own copy of the targets and its own snapshots,
+        using the same engine and renderer.
+        """
+
+        level = Level(
+            max(self._attempts, 1),
+            self._store.copy(),
+            self._engine,
+            self._renderer_name,
+        )
+        level._attempts = self._attempts
+        level._result = self._result
+        level._snapshot = Snapshot(None, self._attempts, self._result)
+        return level
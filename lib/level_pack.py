@@ -0,0 +1,210 @@
+from lib.target import Target, Obstacle, Boss
+from lib.level import Level
+from lib.entities import EntityStore
+from typing import BinaryIO, Callable, Dict, Iterable, List, Tuple, Union
+import json
+
+
+TARGET_TYPES = {"Target": Target, "Obstacle": Obstacle, "Boss": Boss}
+
+
+class InvalidTargetTypeError(Exception):
+    def __init__(self) -> None:
+        super().__init__(
+            "Target type has to be one of: " + ", ".join(TARGET_TYPES) + "!"
+        )
+
+
+def parse_target(entry: dict) -> Target:
+    """
+    Creates the target described by the entry of a level pack:
+    {"type": "Target", "x": x, "y": y},
+    {"type": "Obstacle", "x": x, "height": height}
+    or {"type": "Boss", "x": x, "y": y, "health": health}.
+    Raises InvalidTargetTypeError if the type is not known,
+    and the errors of the target if it is not valid.
+    """
+
+    if entry.get("type") not in TARGET_TYPES:
+        raise InvalidTargetTypeError()
+    if entry["type"] == "Obstacle":
+        return Obstacle(entry["x"], entry["height"])
+    if entry["type"] == "Boss":
+        return Boss(entry["x"], entry["y"], entry["health"])
+    return Target(entry["x"], entry["y"])
+
+
+def target_entry(target: Target) -> dict:
+    """
+    Returns the entry describing the target in a level pack.
+    """
+
+    if isinstance(target, Obstacle):
+        return {"type": "Obstacle", "x": target.position[0][0], "height": target.height}
+    x, y = target.position[0]
+    if isinstance(target, Boss):
+        return {"type": "Boss", "x": x, "y": y, "health": target.health}
+    return {"type": "Target", "x": x, "y": y}
+
+
+def level_line(attempts: int, targets: List[Target]) -> str:
+    """
+    Returns the line of a level pack describing the level.
+    """
+
+    entries = [target_entry(target) for target in targets]
+    return json.dumps({"attempts": attempts, "targets": entries}) + "\n"
+
+
+def save_pack(path: str, levels: Iterable[Tuple[int, List[Target]]]) -> None:
+    """
+    Writes the levels, given as the number of attempts and the targets,
+    into a level pack file.
+    """
+
+    with open(path, "w") as file:
+        for attempts, targets in levels:
+            file.write(level_line(attempts, targets))
+
+
+class LevelPack:
+    """
+    Class LevelPack. A file of levels in JSON Lines,
+    one level per line:
+    {"attempts": attempts, "targets": [entries of parse_target]}.
+    Lines are found and parsed only when their level is reached,
+    so opening a pack does not depend on its size.
+    Contains attributes:
+    :param engine: Engine calculating the trajectories of the levels
+    :param type: Union[str, Callable]
+
+    :param renderer: Name of the renderer of the levels
+    :param type: str
+    """
+
+    def __init__(
+        self,
+        source: Union[str, BinaryIO],
+        engine: Union[str, Callable] = "step",
+        renderer: str = "matplotlib",
+    ) -> None:
+        """
+        Creates an instance of class LevelPack.
+        Takes three arguments:
+        the path of the pack or a binary file holding it,
+        and the engine and renderer of the levels.
+        """
+
+        self._file = open(source, "rb") if isinstance(source, str) else source
+        self._engine = engine
+        self._renderer = renderer
+        self._offsets = []
+        self._scanned = self._file.tell()
+        self._complete = False
+        self._stores: Dict[int, Tuple[int, EntityStore]] = {}
+        self._levels: Dict[int, Level] = {}
+
+    @property
+    def engine(self) -> Union[str, Callable]:
+        """
+        Returns the engine of the levels.
+        """
+
+        return self._engine
+
+    @property
+    def renderer(self) -> str:
+        """
+        Returns the name of the renderer of the levels.
+        """
+
+        return self._renderer
+
+    def _scan(self, number: int) -> bool:
+        """
+        Finds the offsets of the lines up to the given level.
+        Returns True if the level exists.
+        """
+
+        if len(self._offsets) <= number and not self._complete:
+            self._file.seek(self._scanned)
+            while len(self._offsets) <= number:
+                line = self._file.readline()
+                if not line:
+                    self._complete = True
+                    break
+                if line.strip():
+                    self._offsets.append(self._scanned)
+                self._scanned += len(line)
+        return number < len(self._offsets)
+
+    def line(self, number: int) -> str:
+        """
+        Returns the line of the level with the given number.
+        Raises IndexError if the pack has no such level.
+        """
+
+        if number < 0 or not self._scan(number):
+            raise IndexError(number)
+        self._file.seek(self._offsets[number])
+        return self._file.readline().decode()
+
+    def targets(self, number: int) -> Tuple[int, List[Target]]:
+        """
+        Parses the level with the given number.
+        Returns the number of attempts and new targets of the level.
+        Raises IndexError if the pack has no such level.
+        """
+
+        entry = json.loads(self.line(number))
+        return entry["attempts"], [parse_target(target) for target in entry["targets"]]
+
+    def store(self, number: int) -> Tuple[int, EntityStore]:
+        """
+        Returns the number of attempts and the store of the targets
+        of the level with the given number.
+        The level is parsed once, the store must not be changed.
+        """
+
+        if number not in self._stores:
+            attempts, targets = self.targets(number)
+            store = EntityStore()
+            for target in targets:
+                store.adopt(target)
+            self._stores[number] = (attempts, store)
+        return self._stores[number]
+
+    def level(self, number: int) -> Level:
+        """
+        Returns a new level with the given number, not played yet.
+        """
+
+        attempts, store = self.store(number)
+        return Level(attempts, store.copy(), self._engine, self._renderer)
+
+    def close(self) -> None:
+        """
+        Closes the file of the pack.
+        """
+
+        self._file.close()
+
+    def __getitem__(self, number: int) -> Level:
+        """
+        Returns the level with the given number,
+        the same one every time, so it keeps the state of the game.
+        """
+
+        if number not in self._levels:
+            self._levels[number] = self.level(number)
+        return self._levels[number]
+
+    def __len__(self) -> int:
+        """
+        Returns the number of levels in the pack.
+        Finds every line of the file.
+        """
+
+        while not self._complete:
+            self._scan(len(self._offsets) + 1024)
+        return len(self._offsets)
@@ -0,0 +1,145 @@
+from lib.target import Target
+from lib.bullet import Bullet, MAX_X, MAX_Y
+from lib.renderer import BoardCache, Renderer, Frame, FIGSIZE, DPI, AXES
+from lib.instrumentation import stage
+from typing import Dict, List, Sequence, Tuple
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.patches import Patch
+from matplotlib.image import imsave
+import numpy as np
+from io import BytesIO
+
+
+class MatplotlibRenderer(Renderer):
+    """
+    Class MatplotlibRenderer. Owns one matplotlib figure of the board
+    and keeps its artists alive between draws.
+    The trajectory is an animated artist, left out when the figure
+    is drawn, so the cache holds the figure's pixels copied
+    from its bounding box, and the trajectory is blitted over them.
+    Contains attributes:
+    :param figure: the figure of the board
+    :param type: Figure
+
+    :param axes: the axes of the board
+    :param type: Axes
+
+    :param artists: targets on the board mapped to their patches
+    :param type: Dict[Target, Patch]
+    """
+
+    def __init__(self, cache: BoardCache = None) -> None:
+        """
+        Creates an instance of class MatplotlibRenderer.
+        Takes one argument: the cache of the rendered boards,
+        BOARD_CACHE by default.
+        """
+
+        super().__init__(cache)
+        self._figure = Figure(figsize=FIGSIZE, dpi=DPI)
+        self._canvas = FigureCanvasAgg(self._figure)
+        left, bottom, right, top = AXES
+        self._axes = self._figure.add_axes((left, bottom, right - left, top - bottom))
+        self._axes.set_xlim(0, MAX_X + 1)
+        self._axes.set_ylim(0, MAX_Y + 1)
+        self._axes.set_xticks([])
+        self._axes.set_yticks([])
+        self._axes.add_patch(Bullet.draw())
+        (self._line,) = self._axes.plot([], [], ":", color="black")
+        self._line.set_visible(False)
+        self._line.set_animated(True)
+        self._artists = {}
+
+    @property
+    def figure(self) -> Figure:
+        """
+        Returns the figure of the board.
+        """
+
+        return self._figure
+
+    @property
+    def axes(self):
+        """
+        Returns the axes of the board.
+        """
+
+        return self._axes
+
+    @property
+    def artists(self) -> Dict[Target, Patch]:
+        """
+        Returns the targets on the board mapped to their patches.
+        """
+
+        return self._artists
+
+    def sync(self, targets: List[Target]) -> None:
+        """
+        Updates the board to show the given targets.
+        Adds patches of new targets
+        and removes patches of targets no longer on the board.
+        """
+
+        super().sync(targets)
+        remaining = set(targets)
+        for target in list(self._artists):
+            if target not in remaining:
+                self._artists.pop(target).remove()
+        for target in targets:
+            if target not in self._artists:
+                self._artists[target] = self._axes.add_patch(target.draw())
+
+    def set_trajectory(self, x: Sequence[float], y: Sequence[float]) -> None:
+        """
+        Shows the given trajectory on the board.
+        """
+
+        self._line.set_data(x, y)
+        self._line.set_visible(True)
+
+    def hide_trajectory(self) -> None:
+        """
+        Hides the trajectory from the board.
+        """
+
+        self._line.set_visible(False)
+
+    def rasterize_board(self) -> Tuple[object, int]:
+        """
+        Draws the figure, without the trajectory,
+        and copies the pixels of its bounding box.
+        """
+
+        self._canvas.draw()
+        width, height = self._canvas.get_width_height()
+        return self._canvas.copy_from_bbox(self._figure.bbox), 4 * width * height
+
+    def composite(self, board: object) -> Frame:
+        """
+        Restores the pixels of the board into the canvas
+        and draws the trajectory over them, if shown.
+        The frame shares the buffer of the canvas, so it is only valid
+        until the board is rendered again.
+        """
+
+        self._canvas.restore_region(board)
+        if self._line.get_visible():
+            self._axes.draw_artist(self._line)
+        width, height = self._canvas.get_width_height()
+        return Frame(width, height, self._canvas.buffer_rgba())
+
+    def to_png(self) -> BytesIO:
+        """
+        Renders the board as a PNG image, for export.
+        The rendered pixels are encoded as they are,
+        without drawing the figure again.
+        """
+
+        frame = self.render()
+        pixels = np.asarray(frame.data).reshape(frame.height, frame.width, 4)
+        buffer = BytesIO()
+        with stage("encode"):
+            imsave(buffer, pixels, format="png", dpi=DPI)
+        return buffer
@@ -0,0 +1,357 @@
+from lib.target import Target
+from lib.entities import EntityStore, EntityViews
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from array import array
+from bisect import bisect_left
+
+
+ROW_BITS = 64
+KEY_ROW = 1 << 32
+
+
+def cell_bit(cell: Tuple[int, int]) -> int:
+    """
+    Returns the number of the bit standing for the cell
+    in bitmasks of the board, ROW_BITS bits per row.
+    Returns -1 for cells a bullet never enters,
+    left of or below the board, or beyond the width of a row.
+    """
+
+    x, y = cell
+    if 0 <= x < ROW_BITS and y >= 0:
+        return y * ROW_BITS + x
+    return -1
+
+
+class OccupancyIndex:
+    """
+    Class OccupancyIndex. Contains attributes:
+    :param cells: board cells mapped to the target occupying them,
+    or to the list of targets, in the order they were added,
+    if there is more than one
+    :param type: Dict[Tuple[int, int], Union[Target, List[Target]]]
+
+    :param version: number of changes made to the index
+    :param type: int
+
+    :param mask: bitmask of the occupied cells a bullet can enter,
+    with the bits numbered by cell_bit
+    :param type: int
+    """
+
+    def __init__(self, targets: Iterable[Target] = ()) -> None:
+        """
+        Creates an instance of class OccupancyIndex.
+        Takes one argument:
+        the targets to be indexed.
+        """
+
+        self._cells = {}
+        self._version = 0
+        self._mask = 0
+        for target in targets:
+            self.add(target)
+
+    @property
+    def cells(self) -> Dict[Tuple[int, int], Union[Target, List[Target]]]:
+        """
+        Returns the mapping of occupied cells to targets.
+        """
+
+        return self._cells
+
+    @property
+    def version(self) -> int:
+        """
+        Returns the number of changes made to the index.
+        """
+
+        return self._version
+
+    @property
+    def mask(self) -> int:
+        """
+        Returns the bitmask of the occupied cells.
+        """
+
+        return self._mask
+
+    def add(self, target: Target) -> None:
+        """
+        Adds every cell of the target to the index.
+        """
+
+        cells = self._cells
+        for cell in target.position:
+            occupants = cells.get(cell)
+            if occupants is None:
+                cells[cell] = target
+                bit = cell_bit(cell)
+                if bit >= 0:
+                    self._mask |= 1 << bit
+            elif type(occupants) is list:
+                occupants.append(target)
+            else:
+                cells[cell] = [occupants, target]
+        self._version += 1
+
+    def insert(self, target: Target) -> None:
+        """
+        Adds every cell of the target to the index,
+        ahead of the targets sharing a cell with it
+        that are viewing later entities of the store.
+        Puts a removed target back in its place.
+        """
+
+        cells = self._cells
+        for cell in target.position:
+            occupants = cells.get(cell)
+            if occupants is None:
+                cells[cell] = target
+                bit = cell_bit(cell)
+                if bit >= 0:
+                    self._mask |= 1 << bit
+                continue
+            if type(occupants) is not list:
+                occupants = cells[cell] = [occupants]
+            position = 0
+            while (
+                position < len(occupants) and occupants[position].entity < target.entity
+            ):
+                position += 1
+            occupants.insert(position, target)
+        self._version += 1
+
+    def remove(self, target: Target) -> None:
+        """
+        Removes every cell of the target from the index.
+        """
+
+        cells = self._cells
+        for cell in target.position:
+            occupants = cells[cell]
+            if occupants is target:
+                del cells[cell]
+                bit = cell_bit(cell)
+                if bit >= 0:
+                    self._mask &= ~(1 << bit)
+                continue
+            occupants.remove(target)
+            if len(occupants) == 1:
+                cells[cell] = occupants[0]
+        self._version += 1
+
+    def get(self, cell: Tuple[int, int]) -> Optional[Target]:
+        """
+        Returns the first target occupying the cell.
+        If the cell is empty, returns None.
+        """
+
+        occupants = self._cells.get(cell)
+        if type(occupants) is list:
+            return occupants[0]
+        return occupants
+
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        """
+        Returns True if the cell is occupied.
+        """
+
+        return cell in self._cells
+
+    def __len__(self) -> int:
+        """
+        Returns the number of occupied cells.
+        """
+
+        return len(self._cells)
+
+
+def cell_key(cell: Tuple[int, int]) -> int:
+    """
+    Returns the number standing for the cell in the keys of a StoreIndex,
+    KEY_ROW numbers per row.
+    """
+
+    x, y = cell
+    return y * KEY_ROW + x
+
+
+class StoreIndex:
+    """
+    Class StoreIndex. An occupancy index backed by an EntityStore,
+    answering the same questions as OccupancyIndex
+    without an object per entity or per cell.
+    The cells of every entity of the store are kept as sorted arrays
+    of keys and entity numbers, and the entities removed from the board
+    are told apart by the alive flags of the store.
+    The bitmask of the occupied cells answers most lookups
+    of the cells a bullet enters without searching the keys.
+    Contains attributes:
+    :param store: the store indexed
+    :param type: EntityStore
+
+    :param cells: board cells mapped to the target occupying them,
+    or to the list of targets, in the order of their entities,
+    if there is more than one, built when it is asked for
+    :param type: Dict[Tuple[int, int], Union[Target, List[Target]]]
+
+    :param version: number of changes made to the index
+    :param type: int
+
+    :param mask: bitmask of the occupied cells a bullet can enter,
+    with the bits numbered by cell_bit
+    :param type: int
+    """
+
+    def __init__(self, store: EntityStore) -> None:
+        """
+        Creates an instance of class StoreIndex.
+        Takes one argument:
+        the store to be indexed.
+        Its entities are indexed once, the entities removed
+        from or put back on the board later only have to be
+        removed from or inserted into the index.
+        """
+
+        keys = array("q")
+        entities = array("i")
+        bits = bytearray()
+        alive = store.alive
+        for entity in range(len(store)):
+            for cell in store.cells(entity):
+                keys.append(cell_key(cell))
+                entities.append(entity)
+                bit = cell_bit(cell)
+                if bit >= 0 and alive[entity]:
+                    if bit >> 3 >= len(bits):
+                        bits.extend(bytes((bit >> 3) + 1 - len(bits)))
+                    bits[bit >> 3] |= 1 << (bit & 7)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys = array("q", [keys[position] for position in order])
+        self._entities = array("i", [entities[position] for position in order])
+        self._store = store
+        self._version = 0
+        self._cells = None
+        self._mask = int.from_bytes(bits, "little")
+
+    @property
+    def store(self) -> EntityStore:
+        """
+        Returns the store indexed.
+        """
+
+        return self._store
+
+    @property
+    def cells(self) -> Dict[Tuple[int, int], Union[Target, List[Target]]]:
+        """
+        Returns the mapping of occupied cells to targets,
+        building it if the index changed since it was last built.
+        """
+
+        if self._cells is None or self._cells[0] != self._version:
+            cells = OccupancyIndex(EntityViews(self._store)).cells
+            self._cells = (self._version, cells)
+        return self._cells[1]
+
+    @property
+    def version(self) -> int:
+        """
+        Returns the number of changes made to the index.
+        """
+
+        return self._version
+
+    @property
+    def mask(self) -> int:
+        """
+        Returns the bitmask of the occupied cells.
+        """
+
+        return self._mask
+
+    def first(self, cell: Tuple[int, int]) -> int:
+        """
+        Returns the number of the first entity still on the board
+        occupying the cell, or -1 if the cell is empty.
+        """
+
+        key = cell_key(cell)
+        keys = self._keys
+        alive = self._store.alive
+        position = bisect_left(keys, key)
+        while position < len(keys) and keys[position] == key:
+            entity = self._entities[position]
+            if alive[entity]:
+                return entity
+            position += 1
+        return -1
+
+    def update(self, target: Target) -> None:
+        """
+        Brings the bitmask of the cells of the target
+        in line with the alive flags of the store.
+        """
+
+        for cell in target.position:
+            bit = cell_bit(cell)
+            if bit < 0:
+                continue
+            if self.first(cell) < 0:
+                self._mask &= ~(1 << bit)
+            else:
+                self._mask |= 1 << bit
+        self._version += 1
+
+    def remove(self, target: Target) -> None:
+        """
+        Removes the target from the index,
+        after it was removed from the store.
+        """
+
+        self.update(target)
+
+    def insert(self, target: Target) -> None:
+        """
+        Puts the target back in the index,
+        after it was revived in the store.
+        It is found ahead of the targets sharing a cell with it
+        that are viewing later entities of the store.
+        """
+
+        self.update(target)
+
+    def get(self, cell: Tuple[int, int]) -> Optional[Target]:
+        """
+        Returns the first target occupying the cell.
+        If the cell is empty, returns None.
+        """
+
+        x, y = cell
+        if 0 <= x < ROW_BITS and y >= 0 and not self._mask >> y * ROW_BITS + x & 1:
+            return None
+        entity = self.first(cell)
+        if entity < 0:
+            return None
+        return self._store.view(entity)
+
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        """
+        Returns True if the cell is occupied.
+        """
+
+        bit = cell_bit(cell)
+        if bit >= 0:
+            return bool(self._mask >> bit & 1)
+        return self.first(cell) >= 0
+
+    def __len__(self) -> int:
+        """
+        Returns the number of occupied cells.
+        """
+
+        alive = self._store.alive
+        return len(
+            {key for key, entity in zip(self._keys, self._entities) if alive[entity]}
+        )
@@ -0,0 +1,48 @@
+from lib.instrumentation import STAGES, recorder
+from PySide2.QtCore import Qt
+from PySide2.QtWidgets import QLabel, QWidget
+
+
+class StatsOverlay(QLabel):
+    """
+    Class StatsOverlay. A label in the corner of the plot
+    showing the median and 95th percentile wall time
+    and the median allocated memory blocks of every stage
+    recorded by the instrumentation.
+    """
+
+    def __init__(self, plot: QWidget) -> None:
+        """
+        Creates an instance of class StatsOverlay.
+        Takes one argument:
+        the plot widget the overlay is shown on.
+        """
+
+        super().__init__(plot)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.setStyleSheet(
+            "background: rgba(255, 255, 255, 200); color: black;"
+            " font-family: monospace; padding: 4px;"
+        )
+        self.move(8, 8)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Shows the current measurements.
+        """
+
+        stats = recorder()
+        summary = {} if stats is None else stats.summary()
+        lines = ["stage        median     p95  blocks"]
+        for name in STAGES:
+            if name in summary:
+                stage = summary[name]
+                lines.append(
+                    f"{name:10} {stage['median'] * 1000:7.2f} {stage['p95'] * 1000:7.2f}"
+                    f" {stage['blocks']:7.0f}"
+                )
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.raise_()
@@ -0,0 +1,200 @@
+from lib.target import Target, Obstacle
+from lib.bullet import Bullet
+from lib.level import Level, ENGINES
+from lib.bitboard import cells_mask, path_mask, first_cells
+from lib.generator import ANGLES, FORCES
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from itertools import islice
+
+
+PATH_ENGINES = ("step", "vectorized", "atlas", "bitboard")
+MONOTONIC_ENGINES = PATH_ENGINES + ("exact",)
+
+
+class Planner:
+    """
+    Class Planner. Searches the sequences of shots which win a level,
+    with the semantics of Level.simulate_attempt.
+    Shots missing or hitting an obstacle do not change the board,
+    and every other shot takes one point of health,
+    so every winning sequence of useful shots is as long as the total
+    health left, and the search only has to find one that fits
+    in the attempts, or prove there is none.
+    The search is depth first, trying for every target
+    one shot hitting it.
+    Board states proven not to be winnable are kept
+    in a transposition table, keyed by the targets left and their health.
+    A branch is cut as soon as the health left exceeds the attempts,
+    or a target left cannot be reached by any shot.
+    With an engine whose paths do not depend on the board, removing
+    a target only clears the paths of other shots, so a useful shot
+    stays useful until its target is destroyed, and one branch
+    of every state is enough.
+    Contains attributes:
+    :param shots: the shots tried, as angles and forces
+    :param type: Sequence[Tuple[int, int]]
+
+    :param explored: number of board states searched by the last plan
+    :param type: int
+
+    :param table: the board states proven not to be winnable
+    :param type: Dict[Tuple[bytes, bytes], bool]
+    """
+
+    def __init__(self, shots: Sequence[Tuple[int, int]] = None) -> None:
+        """
+        Creates an instance of class Planner.
+        Takes one argument:
+        the shots tried, every angle and force by default.
+        """
+
+        if shots is None:
+            shots = [(angle, force) for angle in ANGLES for force in FORCES]
+        self._shots = shots
+        self._explored = 0
+        self._table = {}
+        self._paths = None
+
+    @property
+    def shots(self) -> Sequence[Tuple[int, int]]:
+        """
+        Returns the shots tried.
+        """
+
+        return self._shots
+
+    @property
+    def explored(self) -> int:
+        """
+        Returns the number of board states searched by the last plan.
+        """
+
+        return self._explored
+
+    @property
+    def table(self) -> Dict[Tuple[bytes, bytes], bool]:
+        """
+        Returns the board states proven not to be winnable.
+        """
+
+        return self._table
+
+    def plan(self, level: Level) -> Optional[List[Tuple[int, int]]]:
+        """
+        Returns the shortest sequence of shots winning the level
+        within its attempts, or None if there is none.
+        The level is searched through its snapshots
+        and left in the state it was given in.
+        """
+
+        self._explored = 0
+        self._table = {}
+        self._paths = None
+        start = level.snapshot
+        shots = []
+        try:
+            if not level.result and not self.search(level, shots):
+                return None
+        finally:
+            level.restore(start)
+        return shots
+
+    def search(self, level: Level, shots: List[Tuple[int, int]]) -> bool:
+        """
+        Plays the level from its current state until it is won,
+        appending the shots played.
+        Returns False, leaving the shots as they were,
+        if it cannot be won.
+        """
+
+        if level.result:
+            return True
+        key = (bytes(level.store.alive), level.store.health.tobytes())
+        if key in self._table:
+            return False
+        self._explored += 1
+
+        if self.health(level) <= level.attempts and self.reachable(level):
+            moves = self.moves(level)
+            if level.engine in MONOTONIC_ENGINES:
+                moves = islice(moves, 1)
+            snapshot = level.snapshot
+            for target, shot in moves:
+                hit = level.simulate_attempt(*shot)
+                shots.append(shot)
+                if hit is target and self.search(level, shots):
+                    return True
+                shots.pop()
+                level.restore(snapshot)
+
+        self._table[key] = False
+        return False
+
+    def health(self, level: Level) -> int:
+        """
+        Returns the health left of the targets and bosses of the level,
+        the number of shots still needed to win it.
+        """
+
+        store = level.store
+        return sum(
+            store.health[target.entity]
+            for target in level.targets
+            if not isinstance(target, Obstacle)
+        )
+
+    def reachable(self, level: Level) -> bool:
+        """
+        Returns False if a target or boss left cannot be reached
+        by any shot even with every other target removed.
+        Always True for engines whose paths are not known in advance.
+        """
+
+        if level.engine not in PATH_ENGINES:
+            return True
+        if self._paths is None:
+            self._paths = 0
+            for angle, force in self._shots:
+                self._paths |= path_mask(angle, force).mask
+        return all(
+            cells_mask(target.position) & self._paths
+            for target in level.targets
+            if not isinstance(target, Obstacle)
+        )
+
+    def moves(self, level: Level) -> Iterator[Tuple[Target, Tuple[int, int]]]:
+        """
+        Yields, for every target or boss hit by any of the shots
+        on the current board, the first such shot.
+        Engines visiting the cells of the stepping engine
+        are answered from the bitmasks of the paths at once,
+        and the targets hit by the fewest shots come first.
+        Other engines are run shot by shot, only as far as
+        the search asks for more moves.
+        """
+
+        index = level.index
+        if level.engine in PATH_ENGINES:
+            counts = {}
+            first = {}
+            for shot, cell in zip(self._shots, first_cells(index.mask, self._shots)):
+                target = None if cell is None else index.get(cell)
+                if target is None or isinstance(target, Obstacle):
+                    continue
+                counts[target] = counts.get(target, 0) + 1
+                first.setdefault(target, shot)
+            order = sorted(first, key=lambda target: (counts[target], target.entity))
+            for target in order:
+                yield target, first[target]
+            return
+
+        engine = level.engine
+        if not callable(engine):
+            engine = ENGINES[engine]
+        seen = set()
+        for angle, force in self._shots:
+            target = engine(Bullet(angle, force), level.targets, index)
+            if target is None or isinstance(target, Obstacle) or target in seen:
+                continue
+            seen.add(target)
+            yield target, (angle, force)
@@ -0,0 +1,176 @@
+from lib.target import Target
+from lib.bullet import Bullet, MAX_X, MAX_Y
+from lib.renderer import BoardCache, Renderer, Frame
+from lib.shape import Shape, CIRCLE
+from lib.instrumentation import stage
+from typing import List, Sequence, Tuple
+from PySide2.QtCore import QBuffer, QByteArray, QIODevice, QPointF, QRectF, Qt
+from PySide2.QtGui import QColor, QImage, QPainter, QPen, QPolygonF
+from io import BytesIO
+
+
+class QPainterRenderer(Renderer):
+    """
+    Class QPainterRenderer. Paints the board onto a QImage
+    with QPainter, following the shapes of the objects.
+    The cache holds images of the boards, which are shared
+    by the image shown until the trajectory is painted over it.
+    Contains attributes:
+    :param image: the image of the board
+    :param type: QImage
+
+    :param shapes: shapes of the targets on the board
+    :param type: List[Shape]
+    """
+
+    def __init__(self, cache: BoardCache = None) -> None:
+        """
+        Creates an instance of class QPainterRenderer.
+        Takes one argument: the cache of the rendered boards,
+        BOARD_CACHE by default.
+        """
+
+        super().__init__(cache)
+        self._image = QImage(self.width, self.height, QImage.Format_RGBA8888)
+        self._shapes = []
+        self._trajectory = None
+
+    @property
+    def image(self) -> QImage:
+        """
+        Returns the image of the board.
+        """
+
+        return self._image
+
+    @property
+    def shapes(self) -> List[Shape]:
+        """
+        Returns the shapes of the targets on the board.
+        """
+
+        return self._shapes
+
+    def sync(self, targets: List[Target]) -> None:
+        """
+        Updates the board to show the given targets.
+        """
+
+        super().sync(targets)
+        self._shapes = [target.shape for target in targets]
+
+    def set_trajectory(self, x: Sequence[float], y: Sequence[float]) -> None:
+        """
+        Shows the given trajectory on the board.
+        """
+
+        self._trajectory = (x, y)
+
+    def hide_trajectory(self) -> None:
+        """
+        Hides the trajectory from the board.
+        """
+
+        self._trajectory = None
+
+    def paint_shape(self, painter: QPainter, shape: Shape) -> None:
+        """
+        Paints the shape with the painter.
+        """
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(shape.color))
+        x, y = shape.position
+        width, height = shape.size
+        if shape.kind == CIRCLE:
+            x, y = x - width, y - height
+            width, height = 2 * width, 2 * height
+        left, top = self.to_pixel(x, y + height)
+        right, bottom = self.to_pixel(x + width, y)
+        rectangle = QRectF(left, top, right - left, bottom - top)
+        if shape.kind == CIRCLE:
+            painter.drawEllipse(rectangle)
+        else:
+            painter.drawRect(rectangle)
+
+    def paint_trajectory(self, painter: QPainter) -> None:
+        """
+        Paints the trajectory as a dotted polyline.
+        """
+
+        x, y = self._trajectory
+        points = [QPointF(*self.to_pixel(px, py)) for px, py in zip(x, y)]
+        pen = QPen(Qt.black, 4, Qt.DotLine)
+        pen.setCapStyle(Qt.RoundCap)
+        painter.setPen(pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPolyline(QPolygonF(points))
+
+    def axes_rectangle(self) -> QRectF:
+        """
+        Returns the rectangle of the axes in the image.
+        """
+
+        left, top = self.to_pixel(0, MAX_Y + 1)
+        right, bottom = self.to_pixel(MAX_X + 1, 0)
+        return QRectF(left, top, right - left, bottom - top)
+
+    def paint_axes(self, painter: QPainter) -> None:
+        """
+        Paints the frame of the axes.
+        """
+
+        painter.setClipping(False)
+        painter.setPen(QPen(Qt.black, 2))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(self.axes_rectangle())
+
+    def rasterize_board(self) -> Tuple[object, int]:
+        """
+        Paints the objects and the frame of the axes onto a new image.
+        """
+
+        image = QImage(self.width, self.height, QImage.Format_RGBA8888)
+        image.fill(Qt.white)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setClipRect(self.axes_rectangle())
+        for shape in [Bullet.shape()] + self._shapes:
+            self.paint_shape(painter, shape)
+        self.paint_axes(painter)
+        painter.end()
+        return image, image.sizeInBytes()
+
+    def composite(self, board: object) -> Frame:
+        """
+        Shows the image of the board, painting the trajectory
+        and the frame of the axes over a copy of it, if shown.
+        The frame shares the pixels of the image,
+        so it is only valid until the board is rendered again.
+        """
+
+        if self._trajectory is None:
+            self._image = QImage(board)
+        else:
+            self._image = board.copy()
+            painter = QPainter(self._image)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setClipRect(self.axes_rectangle())
+            self.paint_trajectory(painter)
+            self.paint_axes(painter)
+            painter.end()
+        return Frame(self.width, self.height, self._image.constBits())
+
+    def to_png(self) -> BytesIO:
+        """
+        Renders the board as a PNG image, for export.
+        """
+
+        self.render()
+        with stage("encode"):
+            data = QByteArray()
+            device = QBuffer(data)
+            device.open(QIODevice.WriteOnly)
+            self._image.save(device, "PNG")
+            device.close()
+            return BytesIO(data.data())
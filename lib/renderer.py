@@ -0,0 +1,356 @@
+from lib.target import Target
+from lib.bullet import MAX_X, MAX_Y
+from lib.instrumentation import stage
+from typing import Hashable, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from importlib import import_module
+from io import BytesIO
+from threading import Lock
+
+
+FIGSIZE = (8, 4)
+DPI = 200
+AXES = (0.125, 0.11, 0.9, 0.88)
+CACHE_BYTES = 64 << 20
+RENDERERS = {
+    "matplotlib": ("lib.mpl_renderer", "MatplotlibRenderer"),
+    "qpainter": ("lib.qt_renderer", "QPainterRenderer"),
+}
+
+
+class InvalidRendererError(Exception):
+    def __init__(self) -> None:
+        super().__init__("Renderer has to be one of: " + ", ".join(RENDERERS) + "!")
+
+
+class Frame:
+    """
+    Class Frame. A rendered image of the board
+    as raw, row-major RGBA pixels.
+    Contains attributes:
+    :param width: width of the image in pixels
+    :param type: int
+
+    :param height: height of the image in pixels
+    :param type: int
+
+    :param data: the pixels, four bytes each
+    :param type: memoryview
+    """
+
+    def __init__(self, width: int, height: int, data: memoryview) -> None:
+        """
+        Creates an instance of class Frame.
+        Takes three arguments:
+        the width and height of the image and its pixels.
+        The pixels are not copied.
+        """
+
+        self._width = width
+        self._height = height
+        self._data = data
+
+    @property
+    def width(self) -> int:
+        """
+        Returns the width of the image in pixels.
+        """
+
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """
+        Returns the height of the image in pixels.
+        """
+
+        return self._height
+
+    @property
+    def data(self) -> memoryview:
+        """
+        Returns the pixels of the image.
+        """
+
+        return self._data
+
+    @property
+    def bytes_per_line(self) -> int:
+        """
+        Returns the number of bytes in one row of pixels.
+        """
+
+        return 4 * self._width
+
+    def copy(self) -> "Frame":
+        """
+        Returns a frame holding a copy of the pixels,
+        which stays valid when the board is rendered again.
+        """
+
+        return Frame(self._width, self._height, memoryview(bytes(self._data)))
+
+
+class BoardCache:
+    """
+    Class BoardCache. Rendered boards without a trajectory,
+    so a board is rasterized once for every set of targets shown
+    and only the trajectory is drawn over it afterwards.
+    The boards are evicted least recently used first,
+    once their size exceeds the limit.
+    It can be shared by renderers in different threads.
+    Contains attributes:
+    :param max_bytes: the limit of the size of the boards in bytes
+    :param type: int
+
+    :param size: the size of the boards held in bytes
+    :param type: int
+
+    :param hits: number of boards found
+    :param type: int
+
+    :param misses: number of boards not found
+    :param type: int
+    """
+
+    def __init__(self, max_bytes: int = CACHE_BYTES) -> None:
+        """
+        Creates an instance of class BoardCache.
+        Takes one argument: the limit of the size of the boards in bytes.
+        """
+
+        self._max_bytes = max_bytes
+        self._boards = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        """
+        Returns the limit of the size of the boards in bytes.
+        """
+
+        return self._max_bytes
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the size of the boards held in bytes.
+        """
+
+        return self._size
+
+    @property
+    def hits(self) -> int:
+        """
+        Returns the number of boards found.
+        """
+
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Returns the number of boards not found.
+        """
+
+        return self._misses
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """
+        Returns the board stored under the key,
+        marking it as the most recently used, or None if there is none.
+        """
+
+        with self._lock:
+            entry = self._boards.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._boards.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, board: object, size: int) -> None:
+        """
+        Stores the board of the given size in bytes under the key
+        and evicts the least recently used boards over the limit.
+        A board larger than the limit is not stored.
+        """
+
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._boards.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._boards[key] = (board, size)
+            self._size += size
+            while self._size > self._max_bytes:
+                _, (_, evicted) = self._boards.popitem(last=False)
+                self._size -= evicted
+
+    def clear(self) -> None:
+        """
+        Removes every board.
+        """
+
+        with self._lock:
+            self._boards.clear()
+            self._size = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        """
+        Returns True if a board is stored under the key,
+        without marking it as used.
+        """
+
+        return key in self._boards
+
+    def __len__(self) -> int:
+        """
+        Returns the number of boards held.
+        """
+
+        return len(self._boards)
+
+
+BOARD_CACHE = BoardCache()
+
+
+def board_key(targets: List[Target]) -> Tuple:
+    """
+    Returns the fingerprint of the board showing the targets:
+    the type, cells and health of each target, in drawing order.
+    """
+
+    return tuple(
+        (str(target), tuple(target.position), target.health) for target in targets
+    )
+
+
+class Renderer:
+    """
+    Class Renderer. The interface of the board renderers.
+    A renderer keeps the state of one board between draws:
+    the targets shown and the trajectory of the last shot.
+    The board is FIGSIZE inches at DPI dots per inch,
+    and the plot takes the AXES fractions (left, bottom, right, top)
+    of the image.
+    Boards without the trajectory are kept in a cache,
+    keyed by the renderer type and the fingerprint of the targets,
+    and only the trajectory is drawn over them.
+    Contains attributes:
+    :param cache: the rendered boards, shared by all renderers by default
+    :param type: BoardCache
+    """
+
+    width = FIGSIZE[0] * DPI
+    height = FIGSIZE[1] * DPI
+
+    def __init__(self, cache: BoardCache = None) -> None:
+        """
+        Creates an instance of class Renderer.
+        Takes one argument: the cache of the rendered boards,
+        BOARD_CACHE by default.
+        """
+
+        self._cache = BOARD_CACHE if cache is None else cache
+        self._key = (type(self).__name__, ())
+
+    @property
+    def cache(self) -> BoardCache:
+        """
+        Returns the cache of the rendered boards.
+        """
+
+        return self._cache
+
+    def to_pixel(self, x: float, y: float) -> Tuple[float, float]:
+        """
+        Converts a point of the board into a point of the image,
+        counted from its top left corner.
+        """
+
+        left, bottom, right, top = AXES
+        pixel_x = (left + x / (MAX_X + 1) * (right - left)) * self.width
+        pixel_y = (1 - bottom - y / (MAX_Y + 1) * (top - bottom)) * self.height
+        return pixel_x, pixel_y
+
+    def sync(self, targets: List[Target]) -> None:
+        """
+        Updates the board to show the given targets.
+        Renderers extending it take the fingerprint of the board here.
+        """
+
+        self._key = (type(self).__name__, board_key(targets))
+
+    def set_trajectory(self, x: Sequence[float], y: Sequence[float]) -> None:
+        """
+        Shows the given trajectory on the board.
+        """
+
+        raise NotImplementedError
+
+    def hide_trajectory(self) -> None:
+        """
+        Hides the trajectory from the board.
+        """
+
+        raise NotImplementedError
+
+    def render(self) -> Frame:
+        """
+        Renders the board as raw RGBA pixels.
+        The board without the trajectory is taken from the cache,
+        or rasterized and stored if it is not there,
+        and the trajectory is drawn over it.
+        The frame is only valid until the board is rendered again.
+        """
+
+        board = self._cache.get(self._key)
+        if board is None:
+            with stage("render"):
+                board, size = self.rasterize_board()
+            self._cache.put(self._key, board, size)
+        with stage("composite"):
+            return self.composite(board)
+
+    def rasterize_board(self) -> Tuple[object, int]:
+        """
+        Rasterizes the board without the trajectory.
+        Returns the board as stored in the cache and its size in bytes.
+        """
+
+        raise NotImplementedError
+
+    def composite(self, board: object) -> Frame:
+        """
+        Draws the trajectory, if shown, over the board
+        returned by rasterize_board.
+        """
+
+        raise NotImplementedError
+
+    def to_png(self) -> BytesIO:
+        """
+        Renders the board as a PNG image, for export.
+        """
+
+        raise NotImplementedError
+
+
+def create_renderer(name: str, cache: BoardCache = None) -> Renderer:
+    """
+    Creates the renderer registered in RENDERERS under the name,
+    keeping its boards in the cache, BOARD_CACHE by default.
+    Its drawing library is imported only now.
+    Raises InvalidRendererError if the name is not known.
+    """
+
+    if name not in RENDERERS:
+        raise InvalidRendererError()
+    module, renderer_type = RENDERERS[name]
+    return getattr(import_module(module), renderer_type)(cache)
@@ -0,0 +1,105 @@
+from typing import Tuple
+
+
+CIRCLE = "circle"
+RECTANGLE = "rectangle"
+
+
+class Shape:
+    """
+    Class Shape. Describes how an object looks on the board,
+    in board units, independently of the drawing library.
+    Contains attributes:
+    :param kind: CIRCLE or RECTANGLE
+    :param type: str
+
+    :param position: centre of the circle,
+    or the lower left corner of the rectangle
+    :param type: Tuple[float, float]
+
+    :param size: width and height of the rectangle,
+    or the radius of the circle, twice
+    :param type: Tuple[float, float]
+
+    :param color: name of the color
+    :param type: str
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        position: Tuple[float, float],
+        size: Tuple[float, float],
+        color: str,
+    ) -> None:
+        """
+        Creates an instance of class Shape.
+        """
+
+        self._kind = kind
+        self._position = position
+        self._size = size
+        self._color = color
+
+    @classmethod
+    def circle(cls, position: Tuple[float, float], radius: float, color: str):
+        """
+        Returns the shape of a circle.
+        """
+
+        return cls(CIRCLE, position, (radius, radius), color)
+
+    @classmethod
+    def rectangle(
+        cls, position: Tuple[float, float], width: float, height: float, color: str
+    ):
+        """
+        Returns the shape of a rectangle.
+        """
+
+        return cls(RECTANGLE, position, (width, height), color)
+
+    @property
+    def kind(self) -> str:
+        """
+        Returns the kind of the shape.
+        """
+
+        return self._kind
+
+    @property
+    def position(self) -> Tuple[float, float]:
+        """
+        Returns the position of the shape.
+        """
+
+        return self._position
+
+    @property
+    def size(self) -> Tuple[float, float]:
+        """
+        Returns the size of the shape.
+        """
+
+        return self._size
+
+    @property
+    def color(self) -> str:
+        """
+        Returns the color of the shape.
+        """
+
+        return self._color
+
+    def to_patch(self):
+        """
+        Returns a matplotlib patch drawing the shape.
+        matplotlib is imported only now,
+        so the shapes can be used without it.
+        """
+
+        from matplotlib.patches import Circle, Rectangle
+
+        if self._kind == CIRCLE:
+            return Circle(self._position, self._size[0], color=self._color)
+        return Rectangle(self._position, *self._size, color=self._color)
@@ -0,0 +1,184 @@
+from typing import List, Optional, Tuple
+
+
+class ForeignSnapshotError(Exception):
+    def __init__(self) -> None:
+        super().__init__("Snapshot has to be taken of the same level!")
+
+
+class NothingToUndoError(Exception):
+    def __init__(self) -> None:
+        super().__init__("There is no attempt to undo!")
+
+
+class Snapshot:
+    """
+    Class Snapshot. An immutable state of a level,
+    stored as the change made by one attempt to the state before it.
+    Snapshots taken after different attempts from the same state
+    share it, so they form a tree rooted at the state
+    the level was created in.
+    Contains attributes:
+    :param parent: the state before the attempt, None for the root
+    :param type: Snapshot
+
+    :param root: the state the level was created in
+    :param type: Snapshot
+
+    :param depth: number of attempts since the root
+    :param type: int
+
+    :param attempts: number of attempts left
+    :param type: int
+
+    :param result: True if the level was won
+    :param type: bool
+
+    :param entity: number of the entity hit by the attempt, -1 if none
+    :param type: int
+
+    :param health_before: health of the entity before the attempt
+    :param type: int
+
+    :param health_after: health of the entity after the attempt
+    :param type: int
+
+    :param removed: True if the entity was destroyed by the attempt
+    :param type: bool
+    """
+
+    __slots__ = (
+        "_parent",
+        "_root",
+        "_depth",
+        "_attempts",
+        "_result",
+        "_entity",
+        "_health_before",
+        "_health_after",
+        "_removed",
+    )
+
+    def __init__(
+        self,
+        parent: Optional["Snapshot"],
+        attempts: int,
+        result: bool,
+        entity: int = -1,
+        health_before: int = 0,
+        health_after: int = 0,
+        removed: bool = False,
+    ) -> None:
+        """
+        Creates an instance of class Snapshot.
+        Takes the state before the attempt, None for the root,
+        the number of attempts left, the result of the level,
+        and the entity hit by the attempt with its health
+        before and after the attempt and whether it was destroyed.
+        """
+
+        self._parent = parent
+        self._root = self if parent is None else parent._root
+        self._depth = 0 if parent is None else parent._depth + 1
+        self._attempts = attempts
+        self._result = result
+        self._entity = entity
+        self._health_before = health_before
+        self._health_after = health_after
+        self._removed = removed
+
+    @property
+    def parent(self) -> Optional["Snapshot"]:
+        """
+        Returns the state before the attempt.
+        """
+
+        return self._parent
+
+    @property
+    def root(self) -> "Snapshot":
+        """
+        Returns the state the level was created in.
+        """
+
+        return self._root
+
+    @property
+    def depth(self) -> int:
+        """
+        Returns the number of attempts since the root.
+        """
+
+        return self._depth
+
+    @property
+    def attempts(self) -> int:
+        """
+        Returns the number of attempts left.
+        """
+
+        return self._attempts
+
+    @property
+    def result(self) -> bool:
+        """
+        Returns True if the level was won.
+        """
+
+        return self._result
+
+    @property
+    def entity(self) -> int:
+        """
+        Returns the number of the entity hit by the attempt, -1 if none.
+        """
+
+        return self._entity
+
+    @property
+    def health_before(self) -> int:
+        """
+        Returns the health of the entity before the attempt.
+        """
+
+        return self._health_before
+
+    @property
+    def health_after(self) -> int:
+        """
+        Returns the health of the entity after the attempt.
+        """
+
+        return self._health_after
+
+    @property
+    def removed(self) -> bool:
+        """
+        Returns True if the entity was destroyed by the attempt.
+        """
+
+        return self._removed
+
+    def path(self, other: "Snapshot") -> Tuple[List["Snapshot"], List["Snapshot"]]:
+        """
+        Returns the snapshots to undo, from this one up,
+        and the snapshots to redo, down to the other one,
+        to get from this state to the other through their
+        last common state.
+        """
+
+        undo, redo = [], []
+        here, there = self, other
+        while here._depth > there._depth:
+            undo.append(here)
+            here = here._parent
+        while there._depth > here._depth:
+            redo.append(there)
+            there = there._parent
+        while here is not there:
+            undo.append(here)
+            redo.append(there)
+            here = here._parent
+            there = there._parent
+        redo.reverse()
+        return undo, redo
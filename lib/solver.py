@@ -0,0 +1,100 @@
+from lib.bullet import Bullet, MAX_X, MAX_FORCE, GRAVITY
+from lib.occupancy import OccupancyIndex
+from typing import Iterable, List, Optional, Tuple
+from math import ceil, cos, floor, inf, pi, sqrt, tan
+
+
+def speed_interval(angle: int, cell: Tuple[int, int]) -> Optional[Tuple[float, float]]:
+    """
+    Solves the projectile equations for the speeds
+    at which a bullet fired at the angle passes through the cell.
+    Writing the path as y = x tan(angle) - k x^2 / v^2,
+    every x of the cell gives an interval of 1 / v^2,
+    and their union is bounded by the ends of the cell
+    or the point x = 2 y / tan(angle).
+    Returns the lowest and the highest speed.
+    If no speed reaches the cell, returns None.
+    """
+
+    cell_x, cell_y = cell
+    start_x = max(cell_x - 0.5, 0)
+    stop_x = min(cell_x + 0.5, MAX_X)
+    bottom = max(cell_y - 0.5, 0)
+    top = cell_y + 0.5
+    if start_x >= stop_x or start_x == 0 or top <= 0:
+        return None
+
+    slope = tan(angle * (pi / 180))
+    k = GRAVITY / (2 * cos(angle * (pi / 180)) ** 2)
+
+    def inverse_square(x: float, y: float) -> float:
+        return (x * slope - y) / (k * x**2)
+
+    highest = max(inverse_square(start_x, bottom), inverse_square(stop_x, bottom))
+    if start_x < 2 * bottom / slope < stop_x:
+        highest = inverse_square(2 * bottom / slope, bottom)
+    lowest = min(inverse_square(start_x, top), inverse_square(stop_x, top))
+
+    if highest <= 0:
+        return None
+    if lowest <= 0:
+        return 1 / sqrt(highest), inf
+    return 1 / sqrt(highest), 1 / sqrt(lowest)
+
+
+def force_interval(angle: int, cell: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+    """
+    Returns the lowest and the highest force percentage
+    at which a bullet fired at the angle may pass through the cell,
+    widened by one percent to absorb rounding at the cell edges.
+    If no force reaches the cell, returns None.
+    """
+
+    speeds = speed_interval(angle, cell)
+    if speeds is None:
+        return None
+
+    lowest = max(ceil(speeds[0] / MAX_FORCE * 100) - 1, 1)
+    highest = speeds[1] / MAX_FORCE * 100
+    highest = 100 if highest > 100 else min(floor(highest) + 1, 100)
+    if lowest > highest:
+        return None
+    return lowest, highest
+
+
+def reaches(bullet: Bullet, cell: Tuple[int, int], index: OccupancyIndex) -> bool:
+    """
+    Returns True if the bullet enters the cell
+    before any other occupied cell.
+    """
+
+    for _, visited in bullet.cell_path():
+        if visited == cell:
+            return True
+        if visited in index:
+            return False
+    return False
+
+
+def solve_shots(
+    cell: Tuple[int, int],
+    index: OccupancyIndex,
+    angles: Iterable[int] = range(1, 90),
+) -> List[Tuple[int, int]]:
+    """
+    Finds every shot which reaches the cell
+    before any other occupied cell.
+    Only the forces within the interval solved for each angle
+    are checked, following the closed-form path of Bullet.cell_path.
+    Returns the list of (angle, force) pairs.
+    """
+
+    shots = []
+    for angle in angles:
+        forces = force_interval(angle, cell)
+        if forces is None:
+            continue
+        for force in range(forces[0], forces[1] + 1):
+            if reaches(Bullet(angle, force), cell, index):
+                shots.append((angle, force))
+    return shots
@@ -1,5 +1,9 @@
-from typing import List, Tuple
-from matplotlib import pyplot as plt
+from lib.entities import EntityStore, TARGET, OBSTACLE, BOSS, entity_cells
+from lib.shape import Shape
+from typing import List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from matplotlib.patches import Circle, Rectangle
 
 
 class InvalidPositionError(Exception):
@@ -19,14 +23,28 @@ class InvalidHealthError(Exception):
 
 class Target:
     """
-    Class Target. Contains attributes:
+    Class Target. A view of one entity of an EntityStore.
+    A new target holds its own fields, in no store,
+    until a Level adopts it into the store of the level.
+    Contains attributes:
+    :param store: the store holding the target, None until adopted
+    :param type: EntityStore
+
+    :param entity: number of the target in the store, -1 until adopted
+    :param type: int
+
     :param position_x: x position of the object
     :param type: int
 
     :param position_y: y position of the object
     :param type: int
+
+    :param health: health left of the object
+    :param type: int
     """
 
+    __slots__ = ("_store", "_entity", "_type_code", "_x", "_y", "_height", "_health")
+
     def __init__(self, position_x: int, position_y: int) -> None:
         """
         Creates an instance of class Target.
@@ -36,11 +54,70 @@ class Target:
         is less than 0.
         """
 
-        if position_x <= 0 or position_y < 0:
+        self._create(TARGET, position_x, position_y)
+
+    def _create(
+        self, type_code: int, x: int, y: int, height: int = 1, health: int = 1
+    ) -> None:
+        """
+        Validates the position and keeps the fields of the target
+        until a store adopts it.
+        """
+
+        if x <= 0 or y < 0:
             raise InvalidPositionError()
 
-        self._position_x = position_x
-        self._position_y = position_y
+        self._store = None
+        self._entity = -1
+        self._type_code = type_code
+        self._x = x
+        self._y = y
+        self._height = height
+        self._health = health
+
+    def _fields(self) -> Tuple[int, int, int, int, int]:
+        """
+        Returns the type code, position, height and health
+        of a target in no store.
+        """
+
+        return self._type_code, self._x, self._y, self._height, self._health
+
+    def _bind(self, store: EntityStore, entity: int) -> None:
+        """
+        Makes the target a view of the entity in the store.
+        """
+
+        self._store = store
+        self._entity = entity
+
+    @property
+    def store(self) -> EntityStore:
+        """
+        Returns the store holding the target, None until it is adopted.
+        """
+
+        return self._store
+
+    @property
+    def entity(self) -> int:
+        """
+        Returns the number of the target in the store, -1 until it is adopted.
+        """
+
+        return self._entity
+
+    @property
+    def _position_x(self) -> int:
+        if self._store is None:
+            return self._x
+        return self._store.x[self._entity]
+
+    @property
+    def _position_y(self) -> int:
+        if self._store is None:
+            return self._y
+        return self._store.y[self._entity]
 
     @property
     def position(self) -> List[Tuple[int, int]]:
@@ -48,25 +125,51 @@ class Target:
         Returns the position of the target.
         """
 
-        return [(self._position_x, self._position_y)]
+        if self._store is None:
+            return entity_cells(self._type_code, self._x, self._y, self._height)
+        return self._store.cells(self._entity)
+
+    @property
+    def health(self) -> int:
+        """
+        Returns the health left of the target.
+        """
+
+        if self._store is None:
+            return self._health
+        return self._store.health[self._entity]
 
     def hit(self) -> bool:
         """
         Simulates the Target being hit.
-        Returns True, as the target is always destroyed after one hit.
+        Returns True if the target was destroyed, False otherwise.
+        A target is always destroyed after one hit.
         """
 
-        return True
+        if self._store is not None:
+            return self._store.hit(self._entity)
+        if self._type_code == BOSS:
+            self._health -= 1
+            return self._health == 0
+        return self._type_code != OBSTACLE
 
-    def draw(self) -> plt.Circle:
+    @property
+    def shape(self) -> Shape:
         """
-        Returns a plot representation of class target.
+        Returns the shape of class target on the board.
         """
 
         plot_position = self.position[0]
         radius = 0.5
         color = "green"
-        return plt.Circle(plot_position, radius, color=color)
+        return Shape.circle(plot_position, radius, color)
+
+    def draw(self) -> "Circle":
+        """
+        Returns a plot representation of class target.
+        """
+
+        return self.shape.to_patch()
 
     def __str__(self) -> str:
         """
@@ -83,6 +186,8 @@ class Obstacle(Target):
     :param type: int
     """
 
+    __slots__ = ()
+
     def __init__(self, position_x: int, height: int) -> None:
         """
         Creates an instance of class Obstacle.
@@ -96,8 +201,7 @@ class Obstacle(Target):
         if height < 1:
             raise InvalidHeightError()
 
-        self._height = height
-        super().__init__(position_x, 0)
+        self._create(OBSTACLE, position_x, 0, height=height)
 
     @property
     def height(self) -> int:
@@ -105,34 +209,28 @@ class Obstacle(Target):
         Returns the height of the obstacle.
         """
 
-        return self._height
+        if self._store is None:
+            return self._height
+        return self._store.height[self._entity]
 
     @property
-    def position(self) -> List[Tuple[int, int]]:
+    def shape(self) -> Shape:
         """
-        Returns the position of the obstacle.
+        Returns the shape of class obstacle on the board.
         """
 
-        return [(self._position_x, y) for y in range(self._height)]
-
-    def hit(self) -> bool:
-        """
-        Simulates the Obstacle being hit.
-        Returns False, as the obstacle cannot be destroyed.
-        """
-
-        return False
+        plot_position = (self._position_x - 0.5, 0)
+        width = 1
+        height = self.height - 0.5
+        color = "saddlebrown"
+        return Shape.rectangle(plot_position, width, height, color)
 
-    def draw(self) -> plt.Rectangle:
+    def draw(self) -> "Rectangle":
         """
         Returns a plot representation of class obstacle.
         """
 
-        plot_position = (self._position_x - 0.5, 0)
-        width = 1
-        height = self.height - 0.5
-        color = "saddlebrown"
-        return plt.Rectangle(plot_position, width, height, color=color)
+        return self.shape.to_patch()
 
     def __str__(self) -> str:
         """
@@ -149,6 +247,8 @@ class Boss(Target):
     :param type: int
     """
 
+    __slots__ = ()
+
     def __init__(self, position_x: int, position_y: int, health: int) -> None:
         """
         Creates an instance of class Boss.
@@ -162,49 +262,25 @@ class Boss(Target):
         if health < 1:
             raise InvalidHealthError()
 
-        self._health = health
-        super().__init__(position_x, position_y)
-
-    @property
-    def health(self) -> int:
-        """
-        Returns the health of the Boss.
-        """
-
-        return self._health
+        self._create(BOSS, position_x, position_y, health=health)
 
     @property
-    def position(self) -> Tuple[int]:
-        """
-        Returns the position of the Boss.
-        """
-
-        x = self._position_x
-        y = self._position_y
-        return [(x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)]
-
-    def hit(self) -> bool:
+    def shape(self) -> Shape:
         """
-        Simulates the boss being hit.
-        Removes one point of health from the boss.
-        Returns true if the boss was destroyed, False otherwise.
+        Returns the shape of class boss on the board.
         """
 
-        self._health -= 1
-
-        if self._health == 0:
-            return True
-        return False
+        plot_position = (self._position_x + 0.5, self._position_y + 0.5)
+        radius = 1
+        color = "blue"
+        return Shape.circle(plot_position, radius, color)
 
-    def draw(self) -> plt.Circle:
+    def draw(self) -> "Circle":
         """
         Returns a plot representation of class boss.
         """
 
-        plot_position = (self._position_x + 0.5, self._position_y + 0.5)
-        radius = 1
-        color = "blue"
-        return plt.Circle(plot_position, radius, color=color)
+        return self.shape.to_patch()
 
     def __str__(self) -> str:
         """
@@ -38,7 +38,15 @@ class Ui_MainWindow(object):
         sizePolicy.setHeightForWidth(self.button.sizePolicy().hasHeightForWidth())
         self.button.setSizePolicy(sizePolicy)
 
-        self.gridLayout_1.addWidget(self.button, 2, 0, 2, 2)
+        self.gridLayout_1.addWidget(self.button, 2, 0, 1, 2)
+
+        self.undoButton = QPushButton(self.centralwidget)
+        self.undoButton.setObjectName("undoButton")
+        self.undoButton.setEnabled(False)
+        sizePolicy.setHeightForWidth(self.undoButton.sizePolicy().hasHeightForWidth())
+        self.undoButton.setSizePolicy(sizePolicy)
+
+        self.gridLayout_1.addWidget(self.undoButton, 3, 0, 1, 2)
 
         self.AngleSpinBox = QSpinBox(self.centralwidget)
         self.AngleSpinBox.setObjectName("AngleSpinBox")
@@ -140,6 +148,7 @@ class Ui_MainWindow(object):
             QCoreApplication.translate("MainWindow", "Zle Ptaki", None)
         )
         self.button.setText(QCoreApplication.translate("MainWindow", "Start", None))
+        self.undoButton.setText(QCoreApplication.translate("MainWindow", "Undo", None))
         self.ForceLabel.setText(
             QCoreApplication.translate(
                 "MainWindow",
@@ -0,0 +1,191 @@
+from lib.target import Target
+from lib.occupancy import OccupancyIndex
+from lib.bullet import (
+    MAX_X,
+    MAX_FORCE,
+    GRAVITY,
+    TIME_STEP,
+    InvalidAngleError,
+    InvalidForceError,
+)
+from typing import List, Optional, Sequence, Tuple
+from math import cos, sin, pi
+from weakref import WeakKeyDictionary
+import numpy as np
+
+
+_grids = WeakKeyDictionary()
+
+
+def occupancy_grid(index: OccupancyIndex) -> Tuple[np.ndarray, List[Target]]:
+    """
+    Converts the occupancy index into an array of the board cells.
+    Each cell holds the number of the first target occupying it,
+    counted from one, or 0 if the cell is empty.
+    Returns the array and the list of the numbered targets.
+    The result is cached until the index changes.
+    """
+
+    cached = _grids.get(index)
+    if cached is not None and cached[0] == index.version:
+        return cached[1], cached[2]
+
+    width = max((x for x, _ in index.cells), default=0) + 1
+    height = max((y for _, y in index.cells), default=0) + 1
+    grid = np.zeros((width, height), dtype=np.int32)
+    occupants = []
+    for x, y in index.cells:
+        if x >= 0 and y >= 0:
+            occupants.append(index.get((x, y)))
+            grid[x, y] = len(occupants)
+
+    _grids[index] = (index.version, grid, occupants)
+    return grid, occupants
+
+
+def time_grid(steps: int) -> np.ndarray:
+    """
+    Returns the times at which the stepping engine samples the bullet.
+    The times are accumulated the same way as in
+    Bullet.calculate_trajectory, so the positions match it exactly.
+    """
+
+    time = np.empty(steps)
+    time[0] = 0
+    np.add.accumulate(np.full(steps - 1, TIME_STEP), out=time[1:])
+    return time
+
+
+def trajectory_arrays(
+    velocity_x: float, velocity_y: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculates the whole trajectory of the bullet at once.
+    Returns the x and y arrays of the positions
+    that Bullet.calculate_trajectory would visit before leaving the board,
+    followed by the first position outside of it.
+    """
+
+    if velocity_x == 0:
+        return np.zeros(2), np.zeros(2)
+
+    end = min(MAX_X / velocity_x, 2 * velocity_y / GRAVITY)
+    steps = int(end / TIME_STEP) + 3
+    while True:
+        time = time_grid(steps)
+        position_x = velocity_x * time
+        position_y = velocity_y * time
+        # float_power uses the C pow() like Python does, unlike time**2.
+        position_y -= 0.5 * GRAVITY * np.float_power(time, 2)
+        outside = (position_x > MAX_X) | (position_y < 0)
+        if outside[-1]:
+            break
+        steps *= 2
+
+    length = int(np.argmax(outside)) + 1
+    position_x = np.concatenate(([0.0], position_x[:length]))
+    position_y = np.concatenate(([0.0], position_y[:length]))
+    return position_x, position_y
+
+
+def first_hit(
+    position_x: np.ndarray, position_y: np.ndarray, index: OccupancyIndex
+) -> Tuple[int, Optional[Target]]:
+    """
+    Finds the first position whose cell is occupied.
+    Returns the number of positions up to and including it,
+    and the target occupying it.
+    If no cell is occupied, returns the number of all positions and None.
+    """
+
+    grid, occupants = occupancy_grid(index)
+    cell_x = np.rint(position_x).astype(np.intp)
+    cell_y = np.rint(position_y).astype(np.intp)
+    inside = (cell_x < grid.shape[0]) & (cell_y < grid.shape[1])
+
+    hits = np.zeros(len(position_x), dtype=grid.dtype)
+    hits[inside] = grid[cell_x[inside], cell_y[inside]]
+    occupied = np.flatnonzero(hits)
+    if len(occupied) == 0:
+        return len(position_x), None
+
+    step = int(occupied[0])
+    return step + 1, occupants[hits[step] - 1]
+
+
+MISS = -1
+
+
+def sweep(
+    targets: List[Target],
+    index: OccupancyIndex,
+    angles: Sequence[int],
+    forces: Sequence[int],
+    code_dtype: np.dtype = np.int16,
+    float_dtype: np.dtype = np.float64,
+    chunk_size: int = 8,
+) -> np.ndarray:
+    """
+    Calculates what every combination of angle and force hits.
+    Returns an array of shape (len(angles), len(forces)) holding
+    the position of the first target hit in the targets list,
+    or MISS if the shot missed.
+    The codes are stored as code_dtype and the positions
+    are calculated as float_dtype, in chunks of chunk_size angles.
+    Raises InvalidAngleError or InvalidForceError
+    if any angle or force is not permitted for a Bullet.
+    """
+
+    angles = np.asarray(angles)
+    forces = np.asarray(forces)
+    if not np.isin(angles, range(1, 90)).all():
+        raise InvalidAngleError()
+    if not np.isin(forces, range(101)).all():
+        raise InvalidForceError()
+
+    grid, occupants = occupancy_grid(index)
+    positions = {id(target): number for number, target in enumerate(targets)}
+    codes = np.array(
+        [MISS] + [positions[id(target)] for target in occupants], dtype=code_dtype
+    )
+
+    # The same scalar operations as in Bullet, so float64 sweeps match it exactly.
+    radians = [angle * (pi / 180) for angle in angles.tolist()]
+    speeds = np.array([(force / 100) * MAX_FORCE for force in forces.tolist()])
+    velocity_x = np.outer([cos(angle) for angle in radians], speeds)
+    velocity_y = np.outer([sin(angle) for angle in radians], speeds)
+
+    end = max(MAX_X / MAX_FORCE, 2 * MAX_FORCE / GRAVITY)
+    moving = velocity_x > 0
+    if moving.any():
+        end = np.minimum(
+            MAX_X / velocity_x[moving], 2 * velocity_y[moving] / GRAVITY
+        ).max()
+    steps = int(end / TIME_STEP) + 3
+    time = time_grid(steps)
+    time_squared = np.float_power(time, 2).astype(float_dtype)
+    time = time.astype(float_dtype)
+    velocity_x = velocity_x.astype(float_dtype)
+    velocity_y = velocity_y.astype(float_dtype)
+    gravity = np.asarray(0.5 * GRAVITY, dtype=float_dtype)
+
+    result = np.empty(velocity_x.shape, dtype=code_dtype)
+    for start in range(0, len(angles), chunk_size):
+        rows = slice(start, start + chunk_size)
+        position_x = velocity_x[rows, :, None] * time
+        position_y = velocity_y[rows, :, None] * time
+        position_y -= gravity * time_squared
+        left = np.logical_or.accumulate(
+            (position_x > MAX_X) | (position_y < 0), axis=-1
+        )
+
+        cell_x = np.rint(position_x).astype(np.intp)
+        cell_y = np.rint(position_y).astype(np.intp)
+        inside = ~left & (cell_x < grid.shape[0]) & (cell_y < grid.shape[1])
+        hits = np.zeros(position_x.shape, dtype=grid.dtype)
+        hits[inside] = grid[cell_x[inside], cell_y[inside]]
+
+        first = np.argmax(hits > 0, axis=-1)
+        result[rows] = codes[np.take_along_axis(hits, first[..., None], -1)[..., 0]]
+
+    return result
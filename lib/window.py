@@ -0,0 +1,423 @@
+from lib.target import Target
+from lib.level import Level
+from lib.level_pack import LevelPack
+from lib.analyzer import analyze_lines, level_lines, pack_lines
+from lib.renderer import Frame
+from lib.ui_zle_ptaki import Ui_MainWindow
+from lib.animation import TrajectoryReplay
+from lib.worker import AttemptWorker, AttemptOutcome
+from lib.overlay import StatsOverlay
+from lib.instrumentation import enable, stage
+from lib.attempt_log import AttemptLog
+from typing import Dict, List, Union
+from PySide2.QtCore import QThreadPool
+from PySide2.QtWidgets import QMainWindow, QMessageBox
+from PySide2.QtGui import QImage, QPixmap
+from io import BytesIO
+
+
+class ZlePtakiWindow(QMainWindow):
+    """
+    Class ZlePtakiWindow. Contains attributes:
+    :param levels: List of levels, or the pack they are read from
+    :param type: Union[List[Level], LevelPack]
+
+    :param current_level: Number of the current level
+    :param type: int
+
+    :param renderer: Name of the renderer drawing the levels
+    :param type: str
+
+    :param replay: Overlay replaying the shots, None if shots are not animated
+    :param type: TrajectoryReplay
+
+    :param overlay: Overlay showing the instrumentation, None if not shown
+    :param type: StatsOverlay
+
+    :param log: Log recording the attempts, None if not recorded
+    :param type: AttemptLog
+    """
+
+    def __init__(
+        self,
+        parent=None,
+        renderer: str = "qpainter",
+        animate: bool = True,
+        stats: bool = False,
+        log: str = None,
+    ) -> None:
+        """
+        Creates an instance of class ZlePtakiWindow.
+        The levels are drawn with the given renderer,
+        QPainter by default, which needs no matplotlib.
+        If animate is True, every shot is replayed
+        before its result is shown.
+        If stats is True, the instrumentation is enabled
+        and its measurements are shown over the plot.
+        If log is given, the attempts and undos are appended
+        to the attempt log at that path, every game started
+        as a new session.
+        """
+
+        super().__init__(parent)
+        self._renderer = renderer
+        self.ui = Ui_MainWindow()
+        self.ui.setupUi(self)
+        self.resetSliders()
+        self.ui.AngleSlider.valueChanged.connect(self.updateAngleSpinBox)
+        self.ui.ForceSlider.valueChanged.connect(self.updateForceSpinBox)
+        self.ui.undoButton.clicked.connect(self.undoAttempt)
+        self._levels = []
+        self._current_level = 0
+        self._attempt_result = None
+        self._shot = None
+        self._board = None
+        self._worker = None
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._replay = None
+        if animate:
+            self._replay = TrajectoryReplay(self.ui.plot)
+            self._replay.finished.connect(self.finishAttempt)
+        self._overlay = None
+        if stats:
+            enable()
+            self._overlay = StatsOverlay(self.ui.plot)
+        self._log = None
+        if log is not None:
+            self._log = AttemptLog(log)
+
+    @property
+    def levels(self) -> Union[List[Level], LevelPack]:
+        """
+        Returns the list of levels.
+        """
+
+        return self._levels
+
+    @property
+    def current_level(self) -> int:
+        """
+        Returns the number of the current level.
+        """
+
+        return self._current_level
+
+    @property
+    def replay(self) -> TrajectoryReplay:
+        """
+        Returns the overlay replaying the shots.
+        """
+
+        return self._replay
+
+    @property
+    def overlay(self) -> StatsOverlay:
+        """
+        Returns the overlay showing the instrumentation.
+        """
+
+        return self._overlay
+
+    @property
+    def log(self) -> AttemptLog:
+        """
+        Returns the log recording the attempts.
+        """
+
+        return self._log
+
+    @property
+    def number_of_levels(self) -> int:
+        """
+        Returns the current number of levels
+        """
+
+        return len(self.levels)
+
+    def resetSliders(self) -> None:
+        """
+        Resets the sliders to starting positions.
+        """
+
+        self.ui.AngleSlider.setValue(1)
+        self.ui.ForceSlider.setValue(1)
+        self.updateAngleSpinBox()
+        self.updateForceSpinBox()
+
+    def updateAngleSpinBox(self) -> None:
+        """
+        Updates the Angle spinBox value.
+        """
+
+        self.ui.AngleSpinBox.setValue(self.ui.AngleSlider.value())
+
+    def updateForceSpinBox(self) -> None:
+        """
+        Updates the Force spinBox value.
+        """
+
+        self.ui.ForceSpinBox.setValue(self.ui.ForceSlider.value())
+
+    def setPlot(self, image: Union[Frame, BytesIO]) -> None:
+        """
+        Sets the plot to given image.
+        Takes either a raw RGBA frame, which is wrapped without copying,
+        or a buffer with an encoded image.
+        """
+
+        with stage("pixmap"):
+            if isinstance(image, Frame):
+                qimage = QImage(
+                    image.data,
+                    image.width,
+                    image.height,
+                    image.bytes_per_line,
+                    QImage.Format_RGBA8888,
+                )
+                self.ui.plot.setPixmap(QPixmap.fromImage(qimage))
+            else:
+                pixmap = QPixmap()
+                if pixmap.loadFromData(image.getvalue()):
+                    self.ui.plot.setPixmap(pixmap)
+        if self._overlay is not None:
+            self._overlay.refresh()
+
+    def addLevel(self, attempts: int, targets: List[Target]) -> None:
+        """
+        Adds a level to the levels list.
+        """
+
+        level = Level(attempts, targets, renderer=self._renderer)
+        self._levels.append(level)
+
+    def analyzeLevels(self, workers: int = None) -> List[Dict]:
+        """
+        Reports the difficulty of every level of the game,
+        calculated in a pool of processes and cached by level content.
+        """
+
+        if isinstance(self._levels, LevelPack):
+            lines = pack_lines(self._levels)
+        else:
+            lines = level_lines(self._levels)
+        return analyze_lines(lines, workers)
+
+    def loadPack(self, path: str) -> None:
+        """
+        Replaces the levels with the levels of the pack.
+        Each level is read when the player reaches it.
+        """
+
+        self._levels = LevelPack(path, renderer=self._renderer)
+
+    def gameWonPage(self) -> None:
+        """
+        Creates a page informing the player, that he won the game.
+        """
+
+        self.ui.plot.setText("Congratulations!\nYou have won the game!")
+        self.ui.button.setText("Exit")
+        self.ui.button.clicked.connect(self.close)
+
+    def gameOverPage(self) -> None:
+        """
+        Creates a page informing the player, that he lost the game.
+        """
+
+        self.ui.plot.setText("Game Over!")
+        self.ui.button.setText("Try again")
+        self.ui.button.clicked.connect(self.restartGame)
+
+    def nextLevel(self) -> None:
+        """
+        Changes the level to the next on the list.
+        Checks if last level was won.
+        Checks if the player completed all levels.
+        """
+
+        level = self.levels[self.current_level]
+        if not level.result:
+            self.gameOverPage()
+            return
+
+        self._current_level += 1
+        if self.current_level == self.number_of_levels:
+            self.gameWonPage()
+            return
+
+        self.ui.plot.setText("Level Completed!")
+        self.ui.button.setText("Next")
+        self.ui.button.clicked.connect(self.startLevel)
+
+    def startAttempt(self) -> None:
+        """
+        Starts the attempt.
+        The attempt is simulated and the boards are rendered
+        by a worker in the background, while the button is busy.
+        """
+
+        level = self.levels[self.current_level]
+        angle = self.ui.AngleSlider.value()
+        force = self.ui.ForceSlider.value()
+        self._shot = (angle, force)
+
+        self.setBusy(True)
+        self._worker = AttemptWorker(level, angle, force, self._replay is None)
+        self._worker.signals.finished.connect(self.showAttempt)
+        self._worker.signals.failed.connect(self.attemptFailed)
+        self._pool.start(self._worker)
+
+    def closeEvent(self, event) -> None:
+        """
+        Waits for the attempt being calculated before closing
+        and closes the attempt log.
+        """
+
+        self._pool.waitForDone()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        super().closeEvent(event)
+
+    def setBusy(self, busy: bool) -> None:
+        """
+        Disables the buttons while an attempt is calculated or replayed.
+        """
+
+        self.ui.button.setEnabled(not busy)
+        self.ui.button.setText("Wait..." if busy else "Go")
+        if busy:
+            self.ui.undoButton.setEnabled(False)
+        else:
+            self.updateUndoButton()
+
+    def updateUndoButton(self) -> None:
+        """
+        Enables the undo button if the current level
+        is still being played and has an attempt to undo.
+        """
+
+        level = self.levels[self.current_level]
+        self.ui.undoButton.setEnabled(
+            level.can_undo and not level.result and level.attempts > 0
+        )
+
+    def undoAttempt(self) -> None:
+        """
+        Undoes the last attempt of the current level
+        and shows the board as it was before it.
+        """
+
+        level = self.levels[self.current_level]
+        level.undo()
+        if self._log is not None:
+            self._log.undo(self.current_level)
+            self._log.flush()
+        self.setPlot(level.render_board())
+        self.updateUndoButton()
+
+    def showAttempt(self, outcome: AttemptOutcome) -> None:
+        """
+        Shows the attempt calculated by the worker.
+        If shots are animated, replays the trajectory
+        and finishes the attempt when the replay ends.
+        """
+
+        level = self.levels[self.current_level]
+        self._worker = None
+        self._attempt_result = outcome.result
+        self._board = outcome.board
+        if self._log is not None:
+            self._log.attempt(self.current_level, *self._shot, outcome.result)
+            self._log.flush()
+
+        if self._replay is None:
+            self.setPlot(outcome.trajectory)
+            self.finishAttempt()
+            return
+
+        self._replay.start(level.renderer, *level.trajectory_xy)
+
+    def attemptFailed(self, error: Exception) -> None:
+        """
+        Informs the player that the attempt could not be calculated.
+        """
+
+        self._worker = None
+        self.setBusy(False)
+        QMessageBox.critical(self, "Attempt error", str(error))
+
+    def finishAttempt(self) -> None:
+        """
+        Shows the result of the attempt.
+        """
+
+        level = self.levels[self.current_level]
+        attempt_result = self._attempt_result
+        if attempt_result is None:
+            QMessageBox.information(
+                self, "Attempt info", f"Missed!\nRemaining attempts: {level.attempts}"
+            )
+        else:
+            QMessageBox.information(
+                self,
+                "Attempt info",
+                f"{attempt_result} hit!\nRemaining attempts: {level.attempts}",
+            )
+
+        if self._replay is not None:
+            self._replay.stop()
+        self.setBusy(False)
+        self.setPlot(self._board)
+        self.resetSliders()
+        if level.result or level.attempts == 0:
+            self.ui.button.clicked.disconnect()
+            self.nextLevel()
+
+    def startLevel(self) -> None:
+        """
+        Starts the current level.
+        """
+
+        level = self.levels[self.current_level]
+        self.ui.button.clicked.disconnect()
+        self.ui.button.setText("Go")
+        self.resetSliders()
+        self.setPlot(level.render_board())
+        QMessageBox.information(
+            self,
+            f"Level {self.current_level + 1}",
+            f"Number of attempts: {level.attempts}",
+        )
+        self.ui.button.clicked.connect(self.startAttempt)
+
+    def restartGame(self) -> None:
+        """
+        Starts the game again after it was lost.
+        """
+
+        self.ui.button.clicked.disconnect()
+        self.startGame()
+
+    def startGame(self) -> None:
+        """
+        Starts the game.
+        The levels played are brought back to the state
+        they were created in, so a game tried again
+        is played on new levels, as recorded in the log.
+        """
+
+        for number in range(self._current_level + 1):
+            try:
+                level = self.levels[number]
+            except IndexError:
+                break
+            level.restore(level.snapshot.root)
+        self._current_level = 0
+        if self._log is not None:
+            self._log.start()
+            self._log.flush()
+        self.ui.plot.setText("Welcome to Zle Ptaki!")
+        self.ui.button.setText("Start")
+        self.ui.button.clicked.connect(self.startLevel)
@@ -0,0 +1,117 @@
+from lib.target import Target
+from lib.level import Level
+from lib.renderer import Frame
+from PySide2.QtCore import QObject, QRunnable, Signal
+
+
+class AttemptOutcome:
+    """
+    Class AttemptOutcome. What an attempt calculated in the background
+    hands back to the window.
+    Contains attributes:
+    :param result: the target that was hit, None if the bullet missed
+    :param type: Target
+
+    :param trajectory: the board with the trajectory, None if not rendered
+    :param type: Frame
+
+    :param board: the board after the attempt
+    :param type: Frame
+    """
+
+    def __init__(self, result: Target, trajectory: Frame, board: Frame) -> None:
+        """
+        Creates an instance of class AttemptOutcome.
+        """
+
+        self._result = result
+        self._trajectory = trajectory
+        self._board = board
+
+    @property
+    def result(self) -> Target:
+        """
+        Returns the target that was hit.
+        """
+
+        return self._result
+
+    @property
+    def trajectory(self) -> Frame:
+        """
+        Returns the board with the trajectory.
+        """
+
+        return self._trajectory
+
+    @property
+    def board(self) -> Frame:
+        """
+        Returns the board after the attempt.
+        """
+
+        return self._board
+
+
+class AttemptSignals(QObject):
+    """
+    Class AttemptSignals. Signals of an AttemptWorker,
+    delivered in the thread the worker was created in.
+    """
+
+    finished = Signal(object)
+    failed = Signal(object)
+
+
+class AttemptWorker(QRunnable):
+    """
+    Class AttemptWorker. Simulates an attempt and renders the boards
+    in a thread of a QThreadPool.
+    The level must not be used elsewhere until the worker finishes.
+    Contains attributes:
+    :param signals: emits the AttemptOutcome when finished,
+    or the exception raised when failed
+    :param type: AttemptSignals
+    """
+
+    def __init__(
+        self, level: Level, angle: int, force: int, trajectory: bool = True
+    ) -> None:
+        """
+        Creates an instance of class AttemptWorker.
+        Takes four arguments:
+        the level, the angle and force of the shot,
+        and whether the board with the trajectory is rendered.
+        """
+
+        super().__init__()
+        self._level = level
+        self._angle = angle
+        self._force = force
+        self._trajectory = trajectory
+        self._signals = AttemptSignals()
+
+    @property
+    def signals(self) -> AttemptSignals:
+        """
+        Returns the signals of the worker.
+        """
+
+        return self._signals
+
+    def run(self) -> None:
+        """
+        Simulates the attempt and renders the boards.
+        The frames are copied, as the renderer reuses its pixels.
+        """
+
+        try:
+            result = self._level.simulate_attempt(self._angle, self._force)
+            trajectory = None
+            if self._trajectory:
+                trajectory = self._level.render_trajectory().copy()
+            board = self._level.render_board().copy()
+        except Exception as error:
+            self._signals.failed.emit(error)
+            return
+        self._signals.finished.emit(AttemptOutcome(result, trajectory, board))
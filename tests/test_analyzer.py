@@ -0,0 +1,50 @@
+from lib.analyzer import analyze_line, analyze_lines, content_key, level_lines, rejected
+from lib.level_pack import level_line
+from lib.target import Target, Obstacle, Boss
+from lib.level import Level
+import json
+
+
+def test_content_key():
+    line = level_line(2, [Target(32, 0)])
+    extra = json.dumps({"band": "easy", **json.loads(line)})
+    assert content_key(line) == content_key(extra)
+    assert content_key(line) != content_key(level_line(3, [Target(32, 0)]))
+
+
+def test_analyze_line():
+    report = analyze_line(level_line(3, [Obstacle(32, 16), Target(32, 16)]))
+    assert [target["type"] for target in report["targets"]] == ["Obstacle", "Target"]
+    assert 0 < report["targets"][1]["fraction"] < report["targets"][0]["fraction"]
+    assert report["win_fraction"] == report["targets"][1]["fraction"]
+    assert report["min_shots"] == 1
+    assert report["sufficient"] is True
+
+
+def test_analyze_line_insufficient():
+    report = analyze_line(level_line(2, [Boss(16, 0, 3), Target(8, 4)]))
+    assert report["min_shots"] == 4
+    assert report["winnable"] is True
+    assert report["sufficient"] is False
+    assert rejected(report) == "insufficient attempts"
+
+
+def test_rejected():
+    report = {"winnable": True, "sufficient": True, "win_fraction": 0.5}
+    assert rejected(report) == "trivial"
+    assert rejected(report, trivial=0.6) is None
+    assert rejected({"winnable": False}) == "unwinnable"
+
+
+def test_analyze_lines_cache(tmp_path):
+    lines = level_lines([Level(2, [Target(32, 0)]), Level(1, [Target(16, 8)])])
+    reports = analyze_lines(lines, workers=2, cache=str(tmp_path))
+    assert [report["attempts"] for report in reports] == [2, 1]
+
+    path = tmp_path / (reports[0]["key"] + ".json")
+    cached = json.loads(path.read_text())
+    assert cached == reports[0]
+    cached["min_shots"] = 42
+    path.write_text(json.dumps(cached))
+    assert analyze_lines(lines, cache=str(tmp_path))[0]["min_shots"] == 42
+    assert analyze_lines(lines, workers=1, cache=None)[0]["min_shots"] == 1
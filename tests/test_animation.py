@@ -0,0 +1,51 @@
+from pytest import importorskip
+from lib.target import Target
+from lib.level import Level
+import os
+
+importorskip("PySide2")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from lib.animation import TrajectoryReplay  # noqa: E402
+from lib.renderer import Renderer  # noqa: E402
+from PySide2.QtWidgets import QApplication, QLabel  # noqa: E402
+
+app = QApplication.instance() or QApplication([])
+
+
+def replay_shot(speed):
+    level = Level(1, [Target(32, 0)], renderer="qpainter")
+    level.simulate_attempt(45, 50)
+    plot = QLabel()
+    plot.resize(800, 400)
+    replay = TrajectoryReplay(plot, speed)
+    replay.start(level.renderer, *level.trajectory_xy)
+    return level, plot, replay
+
+
+def test_replay_start():
+    level, plot, replay = replay_shot(1)
+    assert replay.shown == 1
+    assert replay.parentWidget() is plot
+    assert replay.scale() == (0.5, 0.5)
+    replay.stop()
+    assert replay.shown == 0
+
+
+def test_replay_finishes():
+    level, plot, replay = replay_shot(1000)
+    finished = []
+    replay.finished.connect(lambda: finished.append(True))
+    while not finished:
+        app.processEvents()
+    assert replay.shown == len(level.trajectory_xy[0])
+
+
+def test_replay_segment_rect():
+    level, plot, replay = replay_shot(1)
+    renderer = Renderer()
+    x, y = level.trajectory_xy
+    rect = replay.segment_rect(0, 2)
+    left, top = renderer.to_pixel(x[0], max(y[0], y[1]))
+    assert rect.left() <= left / 2 <= rect.right()
+    assert rect.top() <= top / 2 <= rect.bottom()
@@ -0,0 +1,57 @@
+from lib.bullet import Bullet
+from lib.target import Target, Obstacle, Boss
+from lib.level import Level
+from lib.atlas import Atlas, StaleAtlasError, build_atlas, load_atlas, HEADER
+from pytest import fixture, raises
+
+
+@fixture(scope="module")
+def atlas_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("atlas") / "atlas.bin")
+    build_atlas(path)
+    return path
+
+
+def test_atlas_cells(atlas_path):
+    atlas = Atlas(atlas_path)
+    cells = atlas.cells(45, 100)
+    assert cells[0] == (0, 0)
+    assert cells[-1] == (32, 16)
+    assert len(set(cells)) == len(cells)
+    assert atlas.cells(45, 0) == [(0, 0)]
+    atlas.close()
+
+
+def test_atlas_matches_stepping(atlas_path):
+    atlas = Atlas(atlas_path)
+    targets = [Obstacle(32, 16), Target(32, 16), Obstacle(8, 4), Boss(16, 0, 3)]
+    for angle in range(1, 90, 8):
+        for force in range(1, 101, 9):
+            bullet = Bullet(angle, force)
+            assert atlas(bullet, targets) is Bullet(angle, force).calculate_trajectory(
+                targets
+            )
+    atlas.close()
+
+
+def test_atlas_stale(atlas_path, tmp_path):
+    with open(atlas_path, "rb") as file:
+        data = bytearray(file.read())
+    header = list(HEADER.unpack_from(data))
+    header[5] = 1.62
+    HEADER.pack_into(data, 0, *header)
+    path = tmp_path / "stale.bin"
+    path.write_bytes(data)
+    with raises(StaleAtlasError):
+        Atlas(str(path))
+    atlas = load_atlas(str(path))
+    assert atlas.cells(45, 100)[-1] == (32, 16)
+
+
+def test_level_atlas_engine(atlas_path):
+    target = Target(32, 16)
+    obstacle = Obstacle(32, 16)
+    level = Level(1, [target, obstacle], Atlas(atlas_path))
+    assert level.simulate_attempt(45, 100) is target
+    assert level.trajectory[-1] == (32, 16)
+    assert level.result is True
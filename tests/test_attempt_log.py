@@ -0,0 +1,220 @@
+from lib.attempt_log import (
+    ATTEMPT,
+    CONSTANTS,
+    START,
+    UNDO,
+    AttemptLog,
+    InvalidLogError,
+    header,
+    main,
+    parse_record,
+    read_header,
+    read_records,
+    read_varint,
+    replay_block,
+    session_blocks,
+    start_replay,
+    varint,
+    verify_logs,
+)
+from lib.atlas import constants
+from lib.entities import EntityStore
+from lib.level_pack import level_line
+from lib.target import Target
+from zle_ptaki import default_levels
+from zle_ptaki_cli import default_pack, run
+from io import BytesIO, StringIO
+from pytest import raises
+import json
+
+
+def pack_lines():
+    return [level_line(attempts, targets) for attempts, targets in default_levels()]
+
+
+def attempt(level, angle, force, hit):
+    return varint(level << 2 | ATTEMPT) + bytes((angle, force)) + varint(hit)
+
+
+def record_scripts(path, scripts):
+    log = AttemptLog(str(path))
+    run(scripts, StringIO(), default_pack(), log=log)
+    log.close()
+    return str(path)
+
+
+def test_varint():
+    for value in (0, 1, 127, 128, 300, 1 << 20):
+        data = varint(value)
+        assert read_varint(data, 0) == (value, len(data))
+    assert len(varint(127)) == 1
+    assert len(varint(128)) == 2
+    assert read_varint(varint(300)[:1], 0) is None
+
+
+def test_header():
+    file = BytesIO(header())
+    assert read_header(file) == constants()
+    with raises(InvalidLogError):
+        read_header(BytesIO(b"ZPLOG"))
+    with raises(InvalidLogError):
+        read_header(BytesIO(b"x" * 100))
+
+
+def test_attempt_log_records(tmp_path):
+    path = tmp_path / "attempts.log"
+    hit = Target(1, 1)
+    EntityStore().adopt(hit)
+    log = AttemptLog(str(path))
+    log.start()
+    log.attempt(3, 45, 100, hit)
+    log.attempt(130, 89, 1, None)
+    log.undo(3)
+    assert log.records == 4
+    log.close()
+
+    data = path.read_bytes()
+    assert len(data) == len(header()) + 1 + 4 + 5 + 1
+    with open(path, "rb") as file:
+        assert list(read_records(file)) == [
+            (START, 0, 0, 0, 0),
+            (ATTEMPT, 3, 45, 100, 1),
+            (ATTEMPT, 130, 89, 1, 0),
+            (UNDO, 3, 0, 0, 0),
+        ]
+
+
+def test_attempt_log_appends(tmp_path):
+    path = tmp_path / "attempts.log"
+    record_scripts(path, [[(15, 100)]])
+    record_scripts(path, [[(1, 1)]])
+    with open(path, "rb") as file:
+        records = list(read_records(file))
+    assert records == [
+        (START, 0, 0, 0, 0),
+        (ATTEMPT, 0, 15, 100, 1),
+        (START, 0, 0, 0, 0),
+        (ATTEMPT, 0, 1, 1, 0),
+    ]
+
+
+def test_parse_record_cut_short():
+    record = varint(ATTEMPT) + bytes((45, 100)) + varint(200)
+    assert parse_record(record, 0) == (len(record), ATTEMPT, 0, 45, 100, 200)
+    for end in range(len(record)):
+        assert parse_record(record[:end], 0) is None
+
+
+def test_session_blocks():
+    sessions = [varint(START) + varint(ATTEMPT) + bytes((1, 1, 0))] * 10
+    file = BytesIO(header() + b"".join(sessions))
+    blocks = list(session_blocks(file, 10))
+    assert [count for _, count in blocks] == [2, 2, 2, 2, 2]
+    assert b"".join(block for block, _ in blocks) == b"".join(sessions)
+
+
+def test_session_blocks_without_start():
+    records = varint(ATTEMPT) + bytes((1, 1, 0)) + varint(START)
+    blocks = list(session_blocks(BytesIO(header() + records), 1))
+    assert blocks == [(records[:4], 1), (records[4:], 1)]
+
+
+def test_replay_block_matches():
+    start_replay(pack_lines())
+    block = varint(START) + attempt(0, 1, 1, 0) + attempt(0, 15, 100, 1)
+    block += attempt(1, 45, 93, 1) + varint(1 << 2 | UNDO) + attempt(1, 45, 99, 2)
+    report = replay_block(block, 0)
+    assert report == {
+        "sessions": 1,
+        "attempts": 4,
+        "diverged": 0,
+        "truncated": 0,
+        "failures": [],
+    }
+
+
+def test_replay_block_diverged():
+    start_replay(pack_lines())
+    block = (varint(START) + attempt(0, 1, 1, 1) + attempt(0, 15, 100, 1)) * 2
+    report = replay_block(block, 5)
+    assert report["sessions"] == 2
+    assert report["attempts"] == 2
+    assert report["diverged"] == 2
+    assert report["failures"][1] == {
+        "session": 6,
+        "record": 1,
+        "level": 0,
+        "expected": 1,
+        "actual": 0,
+    }
+
+
+def test_replay_block_unplayable_records():
+    start_replay(pack_lines())
+    blocks = [
+        varint(UNDO),
+        attempt(9, 1, 1, 0),
+        attempt(0, 15, 100, 1) + attempt(0, 1, 1, 0),
+        attempt(0, 0, 1, 0),
+    ]
+    report = replay_block(b"".join(varint(START) + block for block in blocks), 0)
+    assert report["diverged"] == 4
+    assert [failure["actual"] for failure in report["failures"]] == [None] * 4
+
+
+def test_replay_block_truncated():
+    start_replay(pack_lines())
+    record = attempt(0, 1, 1, 0)
+    report = replay_block(varint(START) + record + record[:2], 0)
+    assert report["attempts"] == 1
+    assert report["truncated"] == 1
+    assert report["diverged"] == 0
+
+
+def test_verify_logs(tmp_path):
+    scripts = [
+        [(1, 1), (15, 100), (45, 93), (45, 99)],
+        [(15, 100), (47, 71), (34, 97)],
+        [(1, 1), (1, 1)],
+    ]
+    paths = [record_scripts(tmp_path / f"{n}.log", scripts) for n in range(3)]
+    with open(paths[0], "ab") as file:
+        file.write(varint(START) + attempt(0, 1, 1, 1))
+    report = verify_logs(paths, pack_lines(), workers=1, block_size=4)
+    assert report["sessions"] == 10
+    assert report["attempts"] == 28
+    assert report["diverged"] == 1
+    assert report["failures"][0]["session"] == 3
+    assert report["constants"] == {
+        "replayed": list(constants()),
+        "recorded": {path: list(constants()) for path in paths},
+    }
+
+    parallel = verify_logs(paths, pack_lines(), workers=2, block_size=4)
+    assert parallel == report
+
+
+def test_verify_logs_other_engine(tmp_path):
+    path = record_scripts(tmp_path / "game.log", [[(15, 100), (45, 99)]])
+    assert verify_logs([path], pack_lines(), workers=1)["diverged"] == 0
+    report = verify_logs([path], pack_lines(), "drag", workers=1)
+    assert report["diverged"] == 1
+
+
+def test_verify_logs_recorded_constants(tmp_path):
+    path = str(tmp_path / "old.log")
+    with open(path, "wb") as file:
+        file.write(header()[:6] + CONSTANTS.pack(1, 2, 3, 4, 5))
+    report = verify_logs([path], pack_lines(), workers=1)
+    assert report["constants"]["recorded"] == {path: [1, 2, 3, 4, 5]}
+    assert report["sessions"] == 0
+
+
+def test_main(tmp_path, capsys):
+    path = record_scripts(tmp_path / "game.log", [[(15, 100), (45, 99)]])
+    assert main(["attempt_log", path, "--workers", "1"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["attempts"] == 2
+    with open(path, "ab") as file:
+        file.write(attempt(1, 1, 1, 1))
+    assert main(["attempt_log", path, "--workers", "1"]) == 1
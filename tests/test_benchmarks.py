@@ -0,0 +1,29 @@
+from benchmarks.harness import percentile, measure, compare, save_results, load_results
+
+
+def test_percentile():
+    samples = list(range(1, 101))
+    assert percentile(samples, 0.95) == 95
+    assert percentile(samples, 0.5) == 50
+    assert percentile([3.0], 0.95) == 3.0
+
+
+def test_measure_setup_and_warmup():
+    calls = []
+    result = measure(calls.append, lambda: (len(calls),), warmup=2, repeat=3)
+    assert calls == [0, 1, 2, 3, 4]
+    assert result["runs"] == 3
+    assert result["min"] <= result["median"] <= result["p95"]
+
+
+def test_compare_flags_regressions():
+    baseline = {"a": {"median": 1.0}, "b": {"median": 1.0}, "old": {"median": 1.0}}
+    current = {"a": {"median": 1.1}, "b": {"median": 1.5}, "new": {"median": 1.0}}
+    rows = compare(baseline, current, threshold=0.2)
+    assert [(row[0], row[4]) for row in rows] == [("a", False), ("b", True)]
+
+
+def test_results_roundtrip(tmp_path):
+    results = {"a": {"median": 1.0, "p95": 2.0, "min": 0.5, "runs": 3}}
+    save_results(str(tmp_path / "results.json"), results)
+    assert load_results(str(tmp_path / "results.json")) == results
@@ -0,0 +1,89 @@
+from lib.bitboard import (
+    PathMask,
+    bitboard_trajectory,
+    cells_mask,
+    first_cells,
+    path_mask,
+)
+from lib.bullet import Bullet
+from lib.target import Target, Obstacle, Boss
+from lib.occupancy import OccupancyIndex, cell_bit
+from lib.level import Level
+
+
+def test_path_mask_init():
+    path = PathMask([(0, 0), (1, 0), (1, 1)])
+    assert path.cells == [(0, 0), (1, 0), (1, 1)]
+    assert path.mask == cells_mask([(0, 0), (1, 0), (1, 1)])
+    assert path.cell(2) == (1, 1)
+
+
+def test_path_mask_first():
+    path = PathMask([(0, 0), (1, 0), (1, 1), (2, 1), (3, 2)])
+    assert path.first(0) is None
+    assert path.first(cells_mask([(5, 5)])) is None
+    assert path.first(cells_mask([(3, 2), (1, 1)])) == 2
+    assert path.hits(cells_mask([(3, 2)]))
+    assert not path.hits(cells_mask([(3, 3)]))
+
+
+def test_path_mask_cell_entered_again():
+    path = path_mask(14, 52)
+    assert path.cells[4:7] == [(4, 0), (4, 1), (4, 0)]
+    assert path.first(cells_mask([(4, 0)])) == 4
+
+
+def test_path_mask_first_many_hits():
+    cells = [(x, 0) for x in range(20)]
+    path = PathMask(cells)
+    assert path.first(cells_mask(cells[3:])) == 3
+    assert path.first(cells_mask(cells[::-1][:10])) == 10
+
+
+def test_cells_mask_skips_unreachable_cells():
+    assert cells_mask([(-1, 0), (0, -1)]) == 0
+    assert cells_mask([(2, 1)]) == 1 << cell_bit((2, 1))
+
+
+def test_path_mask_follows_stepping_engine():
+    bullet = Bullet(45, 100)
+    bullet.calculate_trajectory([])
+    visited = []
+    for cell in ((round(x), round(y)) for x, y in bullet.trajectory):
+        if not visited or visited[-1] != cell:
+            visited.append(cell)
+    assert path_mask(45, 100).cells == visited
+
+
+def test_bitboard_trajectory_matches_stepping():
+    targets = [Target(20, 3), Obstacle(25, 4), Boss(12, 6, 2), Target(30, 14)]
+    index = OccupancyIndex(targets)
+    for angle in range(5, 90, 6):
+        for force in range(10, 101, 9):
+            stepped = Bullet(angle, force)
+            masked = Bullet(angle, force)
+            hit = stepped.calculate_trajectory(targets, index)
+            assert bitboard_trajectory(masked, targets, index) is hit
+            if hit is not None:
+                assert masked.position == stepped.position
+
+
+def test_bitboard_trajectory_after_removal():
+    obstacle = Obstacle(32, 16)
+    target = Target(32, 16)
+    level = Level(2, [target, obstacle], "bitboard")
+    assert level.simulate_attempt(45, 90) is obstacle
+    assert level.simulate_attempt(45, 100) is target
+    assert level.result is True
+    assert level.index.mask == cells_mask(obstacle.position)
+
+
+def test_first_cells_what_if():
+    wall = Obstacle(10, 10)
+    target = Target(20, 0)
+    index = OccupancyIndex([wall, target])
+    shots = [(45, 50), (45, 60)]
+    assert first_cells(index.mask, shots)[0] is not None
+    without_wall = index.mask & ~cells_mask(wall.position)
+    cells = first_cells(without_wall, shots)
+    assert all(cell in (None, (20, 0)) for cell in cells)
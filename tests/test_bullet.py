@@ -1,5 +1,6 @@
 from lib.bullet import Bullet, InvalidAngleError, InvalidForceError
 from lib.target import Target, Obstacle, Boss
+from lib.occupancy import OccupancyIndex
 from matplotlib import pyplot as plt
 from math import pi
 from pytest import raises, approx
@@ -87,3 +88,76 @@ def test_calculate_trajectory_multiple():
 def test_bullet_draw():
     circle = plt.Circle((0, 0), 0.5, color="red")
     assert str(Bullet.draw()) == str(circle)
+
+
+def test_cell_path_starts_at_origin():
+    bullet = Bullet(45, 100)
+    path = bullet.cell_path()
+    assert path[0] == (0, (0, 0))
+    assert path[-1][1] == (32, 16)
+
+
+def test_cell_path_adjacent_cells():
+    bullet = Bullet(30, 100)
+    cells = [cell for _, cell in bullet.cell_path()]
+    for (x1, y1), (x2, y2) in zip(cells, cells[1:]):
+        assert abs(x2 - x1) + abs(y2 - y1) == 1
+
+
+def test_calculate_exact_trajectory_empty():
+    bullet = Bullet(45, 100)
+    assert bullet.calculate_exact_trajectory([]) is None
+    assert bullet.trajectory[0] == (0, 0)
+
+
+def test_calculate_exact_trajectory_obstacle_target():
+    targets = [Obstacle(32, 16), Target(32, 16)]
+    assert Bullet(45, 100).calculate_exact_trajectory(targets) is targets[1]
+    assert Bullet(45, 96).calculate_exact_trajectory(targets) is targets[0]
+    assert Bullet(45, 69).calculate_exact_trajectory(targets) is None
+
+
+def test_calculate_exact_trajectory_boss():
+    targets = [Obstacle(32, 16), Target(32, 16), Boss(28, 0, 2)]
+    assert Bullet(45, 69).calculate_exact_trajectory(targets) is targets[2]
+    assert Bullet(45, 50).calculate_exact_trajectory(targets) is None
+
+
+def test_calculate_exact_trajectory_multiple():
+    bullet = Bullet(45, 71)
+    targets = [Target(32, 0), Obstacle(16, 8), Target(16, 8)]
+    assert bullet.calculate_exact_trajectory(targets) is targets[2]
+
+
+def test_follow_cells():
+    bullet = Bullet(45, 100)
+    targets = [Target(2, 1)]
+    cells = [(0, 0), (1, 0), (1, 1), (2, 1), (3, 1)]
+    assert bullet.follow_cells(cells, targets) is targets[0]
+    assert bullet.trajectory == cells[:4]
+    assert bullet.position == (2, 1)
+
+
+def test_pass_cells():
+    bullet = Bullet(45, 100)
+    bullet.pass_cells([(0, 0), (1, 0), (1, 1)])
+    assert bullet.trajectory == [(0, 0), (1, 0), (1, 1)]
+    assert bullet.position == (1, 1)
+    bullet.pass_cells([])
+    assert bullet.position == (1, 1)
+
+
+def test_follow_path():
+    bullet = Bullet(45, 100)
+    targets = [Target(2, 1)]
+    points = [(0, 0), (0.8, 0.4), (1.6, 0.8), (2.4, 1.2)]
+    assert bullet.follow_path(points, OccupancyIndex(targets)) is targets[0]
+    assert bullet.trajectory == points[:3]
+    assert bullet.position == (2, 1)
+
+
+def test_follow_path_miss():
+    bullet = Bullet(45, 100)
+    points = [(0, 0), (0.8, 0.4)]
+    assert bullet.follow_path(iter(points), OccupancyIndex([Target(5, 5)])) is None
+    assert bullet.trajectory == points
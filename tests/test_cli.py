@@ -0,0 +1,88 @@
+from zle_ptaki_cli import default_pack, play_script, read_scripts, run
+from lib.level_pack import LevelPack, save_pack
+from lib.target import Target, Obstacle
+from io import BytesIO, StringIO
+import json
+
+
+def test_read_scripts():
+    lines = ["[[45, 80], [30, 50]]\n", "\n", "[]\n"]
+    assert list(read_scripts(lines)) == [[(45, 80), (30, 50)], []]
+
+
+def test_play_script_lost():
+    records = list(play_script(default_pack(), [(45, 80), (45, 90), (45, 100)]))
+    assert [record["attempts"] for record in records[:-1]] == [1, 0]
+    assert records[-1] == {"script": 0, "result": "lost", "levels_won": 0}
+
+
+def test_play_script_next_level():
+    records = list(
+        play_script(default_pack(), [(45, 71), (45, 100)], trajectories=True)
+    )
+    assert records[0]["hit"] == "Target"
+    assert records[0]["won"] is True
+    assert records[1]["level"] == 2
+    assert records[1]["trajectory"][0] == [0, 0]
+    assert records[-1]["result"] == "unfinished"
+
+
+def test_play_script_invalid_shot():
+    records = list(play_script(default_pack(), [(0, 50)]))
+    assert "error" in records[0]
+    assert records[-1]["result"] == "invalid"
+
+
+def test_run_new_levels_per_script():
+    output = StringIO()
+    run([[(45, 71)], [(45, 71)]], output, default_pack())
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [record.get("won") for record in records] == [True, None, True, None]
+
+
+def test_run_boards(tmp_path):
+    run([[(45, 80)]], StringIO(), default_pack(), boards=str(tmp_path))
+    assert [path.name for path in tmp_path.iterdir()] == ["script0_level1_shot0.png"]
+
+
+def test_run_boards_show_targets_left(tmp_path):
+    targets = [Obstacle(16, 8), Target(16, 8), Target(32, 0)]
+    save_pack(tmp_path / "pack.jsonl", [(3, targets)])
+    pack = LevelPack(str(tmp_path / "pack.jsonl"))
+    shots = [(45, 80), (45, 71)]
+    records = list(play_script(pack, shots, boards=str(tmp_path)))
+    assert records[1]["hit"] == "Target"
+
+    level = pack.level(0)
+    for angle, force in shots:
+        level.simulate_attempt(angle, force)
+    level.draw_board()
+    expected = level.draw_trajectory().getvalue()
+    assert (tmp_path / "script0_level1_shot1.png").read_bytes() == expected
+
+
+def test_play_script_won(tmp_path):
+    save_pack(tmp_path / "pack.jsonl", [(1, [Target(32, 0)])])
+    records = list(play_script(LevelPack(str(tmp_path / "pack.jsonl")), [(45, 71)]))
+    assert records[-1] == {"script": 0, "result": "won", "levels_won": 1}
+
+
+def test_play_script_empty_pack():
+    records = list(play_script(LevelPack(BytesIO(b"")), [(45, 71)]))
+    assert records == [{"script": 0, "result": "won", "levels_won": 0}]
+
+
+def test_run_flushes_every_record():
+    class Output(StringIO):
+        def flush(self):
+            lines.append(self.getvalue().count("\n"))
+
+    lines = []
+
+    def shots():
+        yield 45, 80
+        assert lines == [1]
+        yield 45, 90
+
+    run([shots()], Output(), default_pack())
+    assert lines == [1, 2, 3]
@@ -0,0 +1,129 @@
+from lib.entities import EntityStore, EntityViews, TARGET, OBSTACLE, BOSS
+from lib.target import Target, Obstacle, Boss
+
+
+def test_store_init():
+    store = EntityStore()
+    assert len(store) == 0
+    assert store.remaining == 0
+    assert store.nbytes == 0
+
+
+def test_store_add():
+    store = EntityStore()
+    assert store.add(TARGET, 1, 2) == 0
+    assert store.add(OBSTACLE, 3, 0, height=4) == 1
+    assert store.add(BOSS, 5, 0, health=2) == 2
+    assert list(store.types) == [TARGET, OBSTACLE, BOSS]
+    assert list(store.height) == [1, 4, 1]
+    assert list(store.health) == [1, 1, 2]
+    assert store.remaining == 2
+
+
+def test_store_cells():
+    store = EntityStore()
+    store.add(OBSTACLE, 3, 0, height=2)
+    store.add(BOSS, 5, 1, health=2)
+    assert store.cells(0) == [(3, 0), (3, 1)]
+    assert store.cells(1) == [(5, 1), (6, 1), (5, 2), (6, 2)]
+
+
+def test_store_hit_remove():
+    store = EntityStore()
+    store.add(OBSTACLE, 3, 0, height=2)
+    store.add(BOSS, 5, 1, health=2)
+    assert store.hit(0) is False
+    assert store.hit(1) is False
+    assert store.hit(1) is True
+    store.remove(1)
+    store.remove(1)
+    assert list(store.alive) == [1, 0]
+    assert store.remaining == 0
+
+
+def test_store_revive():
+    store = EntityStore()
+    store.add(OBSTACLE, 3, 0, height=2)
+    store.add(BOSS, 5, 1, health=2)
+    store.remove(1)
+    store.revive(1)
+    store.revive(1)
+    assert list(store.alive) == [1, 1]
+    assert store.remaining == 1
+
+
+def test_store_adopt():
+    store = EntityStore()
+    store.add(TARGET, 1, 1)
+    boss = Boss(4, 2, 3)
+    assert store.adopt(boss) == 1
+    assert boss.store is store
+    assert boss.entity == 1
+    assert boss.hit() is False
+    assert store.health[1] == 2
+    assert store.view(1) is boss
+
+
+def test_store_view():
+    store = EntityStore()
+    store.add(OBSTACLE, 3, 0, height=2)
+    obstacle = store.view(0)
+    assert isinstance(obstacle, Obstacle)
+    assert obstacle.height == 2
+    assert obstacle.position == [(3, 0), (3, 1)]
+    assert store.view(0) is obstacle
+
+
+def test_store_nbytes():
+    store = EntityStore()
+    for x in range(1, 100001):
+        store.add(TARGET, x, 0)
+    assert store.nbytes < 2 * 1024 * 1024
+
+
+def test_entity_store_copy():
+    store = EntityStore()
+    store.add(TARGET, 1, 2)
+    store.add(BOSS, 3, 0, health=2)
+    store.view(0)
+    copy = store.copy()
+    copy.hit(1)
+    copy.remove(0)
+    assert list(copy.health) == [1, 1]
+    assert list(store.health) == [1, 2]
+    assert (store.remaining, copy.remaining) == (2, 1)
+    assert copy.view(0) is not store.view(0)
+
+
+def test_store_adopt_from_store():
+    first = EntityStore()
+    boss = Boss(4, 2, 3)
+    first.adopt(boss)
+    first.remove(0)
+    second = EntityStore()
+    assert second.adopt(boss) == 0
+    assert boss.store is first
+    assert first.view(0) is boss
+    assert list(second.alive) == [0]
+    copy = second.view(0)
+    assert copy is not boss
+    assert copy.hit() is False
+    assert (boss.health, copy.health) == (3, 2)
+
+
+def test_entity_views():
+    store = EntityStore()
+    for x in (1, 2, 3):
+        store.add(TARGET, x, 0)
+    views = EntityViews(store)
+    assert views.store is store
+    store.remove(1)
+    assert len(views) == 2
+    assert list(views.entities()) == [0, 2]
+    assert views[1] is store.view(2)
+    assert views[-1] is store.view(2)
+    assert views[:1] == [store.view(0)]
+    assert views == [store.view(0), store.view(2)]
+    assert store.view(0) in views
+    assert store.view(1) not in views
+    assert Target(1, 0) not in views
@@ -0,0 +1,47 @@
+from lib.generator import (
+    InvalidBandError,
+    generate_level,
+    generate_levels,
+    random_layout,
+    shots_needed,
+)
+from lib.level_pack import LevelPack
+from lib.target import Target, Obstacle, Boss
+from lib.bullet import MAX_X, MAX_Y
+from pytest import raises
+from io import BytesIO
+import json
+import random
+
+
+def test_random_layout():
+    layout = random_layout(random.Random(1), "hard")
+    cells = [cell for target in layout for cell in target.position]
+    assert len(cells) == len(set(cells))
+    assert all(0 < x <= MAX_X and 0 <= y <= MAX_Y for x, y in cells)
+
+
+def test_shots_needed():
+    assert shots_needed([Target(1, 1), Obstacle(2, 3), Boss(4, 0, 3)]) == 4
+
+
+def test_generate_level_deterministic():
+    assert generate_level("medium", "seed") == generate_level("medium", "seed")
+    with raises(InvalidBandError):
+        generate_level("impossible", "seed")
+
+
+def test_generate_level_solution():
+    line = generate_level("medium", "solution")
+    entry = json.loads(line)
+    level = LevelPack(BytesIO(line.encode())).level(0)
+    assert len(entry["solution"]) <= entry["attempts"]
+    for angle, force in entry["solution"]:
+        assert level.simulate_attempt(angle, force) is not None
+    assert level.result is True
+
+
+def test_generate_levels_workers():
+    lines = list(generate_levels(2, ["easy", "medium"], seed=3, workers=2))
+    assert [json.loads(line)["band"] for line in lines] == ["easy"] * 2 + ["medium"] * 2
+    assert lines == list(generate_levels(2, ["easy", "medium"], seed=3, workers=1))
@@ -0,0 +1,65 @@
+from lib.instrumentation import (
+    Histogram,
+    Recorder,
+    TimedIndex,
+    enable,
+    disable,
+    recorder,
+    stage,
+)
+from lib.occupancy import OccupancyIndex
+from lib.target import Target, Obstacle
+from lib.level import Level
+
+
+def test_histogram_rolling():
+    histogram = Histogram(3)
+    for value in (5, 1, 2, 3):
+        histogram.add(value)
+    assert histogram.samples == [1, 2, 3]
+    assert histogram.count == 4
+    assert histogram.percentile(0.95) == 3
+    assert histogram.bins([0, 2, 3]) == [1, 1, 1]
+
+
+def test_recorder_stage():
+    stats = Recorder()
+    with stats.stage("render"):
+        [0] * 1000
+    stats.record("custom", 0.5, 2)
+    summary = stats.summary()
+    assert summary["render"]["count"] == 1
+    assert summary["custom"] == {"count": 1, "median": 0.5, "p95": 0.5, "blocks": 2}
+    assert "pixmap" not in summary
+
+
+def test_stage_disabled():
+    disable()
+    assert recorder() is None
+    assert stage("trajectory") is stage("render")
+
+
+def test_timed_index():
+    target = Target(3, 4)
+    index = TimedIndex(OccupancyIndex([target]))
+    assert index.get((3, 4)) is target
+    assert (1, 1) not in index
+    assert len(index) == 1
+    assert index.version == 1
+    assert index.take() > 0
+    assert index.take() == 0
+
+
+def test_level_records_stages():
+    stats = enable()
+    try:
+        level = Level(2, [Target(32, 16), Obstacle(32, 16)])
+        level.simulate_attempt(45, 100)
+        level.simulate_attempt(45, 90)
+        summary = stats.summary()
+        assert summary["trajectory"]["count"] == 2
+        assert summary["collision"]["count"] == 2
+        assert summary["removal"]["count"] == 2
+        assert summary["collision"]["median"] <= summary["trajectory"]["median"]
+    finally:
+        disable()
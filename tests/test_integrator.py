@@ -0,0 +1,136 @@
+from lib.integrator import (
+    Integrator,
+    FixedStepIntegrator,
+    AdaptiveIntegrator,
+    InvalidDragError,
+    InvalidStepError,
+)
+from lib.bullet import Bullet, MAX_X, GRAVITY
+from lib.target import Target, Obstacle
+from lib.occupancy import OccupancyIndex
+from lib.level import Level
+from math import cos, sin
+from pytest import approx, raises
+
+
+def parabola(bullet: Bullet, x: float) -> float:
+    velocity_x = bullet.force * cos(bullet.angle)
+    velocity_y = bullet.force * sin(bullet.angle)
+    time = x / velocity_x
+    return velocity_y * time - 0.5 * GRAVITY * time**2
+
+
+def test_integrator_init_errors():
+    with raises(InvalidDragError):
+        AdaptiveIntegrator(drag=-1)
+    with raises(InvalidStepError):
+        FixedStepIntegrator(time_step=0)
+    with raises(InvalidStepError):
+        AdaptiveIntegrator(min_step=0.1, max_step=0.01)
+
+
+def test_integrator_acceleration():
+    assert Integrator(0).acceleration(3, 4) == (0, -GRAVITY)
+    assert Integrator(0.1).acceleration(3, 4) == approx((-1.5, -GRAVITY - 2))
+
+
+def test_fixed_step_without_drag_matches_stepping():
+    targets = [Target(20, 3), Obstacle(25, 4)]
+    for angle, force in [(30, 80), (45, 100), (60, 70)]:
+        stepped = Bullet(angle, force)
+        integrated = Bullet(angle, force)
+        hit = stepped.calculate_trajectory(targets)
+        assert FixedStepIntegrator(0)(integrated, targets) is hit
+        # the stepping engine visits the origin twice
+        assert len(integrated.trajectory) == len(stepped.trajectory) - 1
+        for point, expected in zip(integrated.trajectory, stepped.trajectory[1:]):
+            assert point == approx(expected, abs=1e-9)
+
+
+def test_adaptive_without_drag_stays_on_parabola():
+    bullet = Bullet(45, 100)
+    assert AdaptiveIntegrator(0)(bullet, []) is None
+    for x, y in bullet.trajectory:
+        assert y == approx(parabola(bullet, x), abs=1e-9)
+    assert MAX_X - bullet.trajectory[-1][0] < 1
+
+
+def test_adaptive_takes_long_steps_away_from_targets():
+    stepped = Bullet(45, 100)
+    integrated = Bullet(45, 100)
+    stepped.calculate_trajectory([])
+    AdaptiveIntegrator(0)(integrated, [])
+    assert len(integrated.trajectory) * 4 < len(stepped.trajectory)
+
+
+def test_adaptive_steps_shrink_near_targets():
+    integrator = AdaptiveIntegrator(0)
+    bullet = Bullet(45, 100)
+    target = Target(20, 14)
+    assert integrator(bullet, [target]) is target
+    x = [point[0] for point in bullet.trajectory]
+    steps = [b - a for a, b in zip(x, x[1:])]
+    assert max(steps) > 1
+    assert steps[-1] <= integrator.resolution
+
+
+def test_adaptive_does_not_jump_over_a_wall():
+    wall = Obstacle(10, 40)
+    index = OccupancyIndex([wall])
+    for force in range(50, 101, 10):
+        assert AdaptiveIntegrator(drag=0)(Bullet(45, force), [wall], index) is wall
+
+
+def test_adaptive_distances():
+    integrator = AdaptiveIntegrator()
+    index = OccupancyIndex([Target(5, 5)])
+    distances = integrator.distances(index)
+    assert distances[5][5] == 0
+    assert distances[7][4] == 2
+    assert distances[0][16] == 11
+    assert integrator.distances(index) is distances
+    assert integrator.distances(OccupancyIndex()) is None
+    assert integrator.clearance(10, 8, None) == 8
+
+
+def test_adaptive_distances_updated():
+    integrator = AdaptiveIntegrator()
+    target = Target(5, 5)
+    index = OccupancyIndex([target, Target(30, 0)])
+    integrator.distances(index)
+    index.remove(target)
+    assert integrator.distances(index)[5][5] == 25
+    assert integrator.clearance(5, 5, integrator.distances(index)) == 5
+
+
+def test_adaptive_drag_matches_fine_fixed_step():
+    bullet = Bullet(45, 100)
+    reference = Bullet(45, 100)
+    AdaptiveIntegrator()(bullet, [])
+    FixedStepIntegrator(time_step=0.001)(reference, [])
+    x, y = reference.trajectory_xy
+    for px, py in bullet.trajectory:
+        number = min(range(len(x)), key=lambda n: abs(x[n] - px))
+        slope = (y[number + 1] - y[number]) / (x[number + 1] - x[number])
+        assert py == approx(y[number] + slope * (px - x[number]), abs=1e-4)
+
+
+def test_drag_shortens_the_flight():
+    plain = Bullet(45, 60)
+    dragged = Bullet(45, 60)
+    AdaptiveIntegrator(0)(plain, [])
+    AdaptiveIntegrator(0.05)(dragged, [])
+    assert dragged.trajectory[-1][0] < plain.trajectory[-1][0] - 1
+
+
+def test_drag_engine():
+    target = Target(20, 0)
+    level = Level(100, [target], "drag")
+    assert level.engine == "drag"
+    hit = None
+    for force in range(1, 101):
+        hit = level.simulate_attempt(45, force)
+        if hit is not None:
+            break
+    assert hit is target
+    assert level.result is True
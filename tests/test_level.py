@@ -1,6 +1,12 @@
-from lib.target import Target, Obstacle
-from lib.level import Level, IvalidAttemptsError
+from lib.target import Target, Obstacle, Boss
+from lib.level import Level, IvalidAttemptsError, InvalidEngineError
+from lib.snapshot import ForeignSnapshotError, NothingToUndoError
+from lib.entities import EntityStore, TARGET, OBSTACLE
 from pytest import raises
+import subprocess
+import sys
+import os
+import tracemalloc
 
 
 def test_level_init():
@@ -32,3 +38,232 @@ def test_simulate_attempt_miss():
     assert level.simulate_attempt(45, 90) is obstacle
     assert level.attempts == 0
     assert level.result is False
+
+
+def test_simulate_attempt_updates_index():
+    target = Target(32, 16)
+    obstacle = Obstacle(32, 16)
+    level = Level(2, [target, obstacle])
+    level.simulate_attempt(45, 100)
+    assert (32, 16) not in level.index
+    assert level.index.get((32, 15)) is obstacle
+
+
+def test_level_init_engine_error():
+    with raises(InvalidEngineError):
+        Level(1, [], "euler")
+
+
+def test_simulate_attempt_exact_engine():
+    target = Target(32, 16)
+    obstacle = Obstacle(32, 16)
+    level = Level(2, [target, obstacle], "exact")
+    assert level.engine == "exact"
+    assert level.simulate_attempt(45, 90) is obstacle
+    assert level.simulate_attempt(45, 100) is target
+    assert level.result is True
+
+
+def test_simulate_attempt_vectorized_engine():
+    target = Target(32, 16)
+    obstacle = Obstacle(32, 16)
+    level = Level(1, [target, obstacle], "vectorized")
+    assert level.simulate_attempt(45, 100) is target
+    x, y = level.trajectory_xy
+    assert len(x) == len(level.trajectory)
+    assert level.result is True
+
+
+def test_level_sweep():
+    target = Target(32, 16)
+    obstacle = Obstacle(32, 16)
+    level = Level(1, [target, obstacle])
+    result = level.sweep([45], [90, 100])
+    assert list(result[0]) == [1, 0]
+    assert level.attempts == 1
+
+
+def test_level_solve_shots():
+    target = Target(32, 16)
+    obstacle = Obstacle(32, 16)
+    level = Level(1, [target, obstacle])
+    assert (45, 100) in level.solve_shots((32, 16))
+    assert level.solve_shots((16, 40)) == []
+
+
+def test_level_solve_shots_hit_with_level_engine():
+    for engine in ("step", "vectorized", "bitboard"):
+        shots = Level(1, [Target(32, 16)], engine=engine).solve_shots((32, 16))
+        assert shots
+        for angle, force in shots:
+            target = Target(32, 16)
+            level = Level(1, [target], engine=engine)
+            assert level.simulate_attempt(angle, force) is target
+
+
+def test_level_solve_shots_brute_force():
+    def level():
+        return Level(2, [Obstacle(16, 8), Target(16, 8), Target(32, 0)])
+
+    hits = []
+    for angle in range(1, 90):
+        for force in range(1, 101):
+            played = level()
+            target = played.targets[1]
+            if played.simulate_attempt(angle, force) is target:
+                hits.append((angle, force))
+    shots = level().solve_shots((16, 8))
+    assert shots == hits
+    assert (35, 91) in shots
+
+
+def test_level_solve_shots_empty_cell():
+    level = Level(1, [Target(32, 16)])
+    shots = level.solve_shots((20, 10))
+    assert shots
+    assert len(level.targets) == 1
+    assert len(level.index) == 1
+    for angle, force in shots:
+        target = Target(20, 10)
+        assert Level(1, [target]).simulate_attempt(angle, force) is target
+
+
+def test_level_memory():
+    tracemalloc.start()
+    try:
+        store = EntityStore()
+        for number in range(100000):
+            store.add(TARGET, number % 63 + 1, number // 63)
+        level = Level(1, store)
+        level.simulate_attempt(45, 100)
+        memory, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(level.targets) == 99999
+    assert memory < 4 * 1024 * 1024
+
+
+def test_level_init_targets_of_other_level():
+    boss = Boss(28, 0, 2)
+    level = Level(2, [Obstacle(32, 16), boss])
+    other = Level(2, list(level.targets))
+    assert boss.store is level.store
+    assert list(level.targets) == [level.store.view(0), boss]
+    assert all(target.store is other.store for target in other.targets)
+    assert other.simulate_attempt(45, 69) is other.targets[1]
+    assert boss.health == 2
+
+
+def test_level_init_store():
+    store = EntityStore()
+    store.add(TARGET, 32, 16)
+    store.add(OBSTACLE, 32, 0, height=16)
+    level = Level(1, store)
+    assert level.store is store
+    assert [str(target) for target in level.targets] == ["Target", "Obstacle"]
+    assert str(level.simulate_attempt(45, 100)) == "Target"
+    assert level.result is True
+    assert list(store.alive) == [0, 1]
+
+
+def test_simulate_attempt_boss():
+    boss = Boss(28, 0, 2)
+    level = Level(2, [Obstacle(32, 16), boss])
+    assert level.simulate_attempt(45, 69) is boss
+    assert level.result is False
+    assert boss.health == 1
+    assert level.simulate_attempt(45, 69) is boss
+    assert level.result is True
+    assert level.targets == [level.store.view(0)]
+
+
+def test_level_undo_boss_hit():
+    boss = Boss(28, 0, 2)
+    level = Level(2, [Obstacle(32, 16), boss])
+    assert not level.can_undo
+    level.simulate_attempt(45, 69)
+    level.simulate_attempt(45, 69)
+    assert level.result is True
+    level.undo()
+    assert level.result is False
+    assert level.attempts == 1
+    assert boss.health == 1
+    assert level.targets == [level.store.view(0), boss]
+    assert level.index.get((29, 1)) is boss
+    assert level.trajectory == []
+    level.undo()
+    assert boss.health == 2
+    assert level.attempts == 2
+    with raises(NothingToUndoError):
+        level.undo()
+
+
+def test_level_restore_branches():
+    obstacle = Obstacle(32, 16)
+    target = Target(32, 16)
+    level = Level(3, [target, obstacle])
+    start = level.snapshot
+    assert level.simulate_attempt(45, 100) is target
+    won = level.snapshot
+    level.restore(start)
+    assert level.simulate_attempt(45, 90) is obstacle
+    missed = level.snapshot
+    assert level.targets == [target, obstacle]
+    level.restore(won)
+    assert level.result is True
+    assert level.targets == [obstacle]
+    assert level.attempts == 2
+    level.restore(missed)
+    assert level.result is False
+    assert level.store.remaining == 1
+    assert level.index.get((32, 16)) is target
+
+
+def test_level_restore_keeps_hit_order():
+    first = Target(32, 16)
+    second = Target(32, 16)
+    level = Level(1, [first, second])
+    start = level.snapshot
+    assert level.simulate_attempt(45, 100) is first
+    assert level.index.get((32, 16)) is second
+    level.restore(start)
+    assert level.index.cells[(32, 16)] == [first, second]
+    assert level.targets == [first, second]
+
+
+def test_level_restore_foreign_snapshot():
+    level = Level(1, [])
+    with raises(ForeignSnapshotError):
+        level.restore(Level(1, []).snapshot)
+
+
+def test_level_branch():
+    boss = Boss(28, 0, 2)
+    level = Level(2, [Obstacle(32, 16), boss])
+    level.simulate_attempt(45, 69)
+    branch = level.branch()
+    copy = branch.targets[1]
+    assert branch.attempts == 1
+    assert copy is not boss
+    assert copy.health == 1
+    assert branch.simulate_attempt(45, 69) is copy
+    assert branch.result is True
+    assert level.result is False
+    assert boss.health == 1
+    assert branch.snapshot.root is not level.snapshot.root
+
+
+def test_level_import_is_headless():
+    code = (
+        "import sys, lib.level, zle_ptaki; "
+        "print([m for m in ('matplotlib', 'numpy', 'PySide2') if m in sys.modules])"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=root,
+    )
+    assert output.stdout.strip() == "[]"
@@ -0,0 +1,88 @@
+from lib.level_pack import (
+    LevelPack,
+    InvalidTargetTypeError,
+    parse_target,
+    target_entry,
+    save_pack,
+)
+from lib.target import (
+    Target,
+    Obstacle,
+    Boss,
+    InvalidPositionError,
+    InvalidHeightError,
+    InvalidHealthError,
+)
+from zle_ptaki import default_levels
+from pytest import raises
+from io import BytesIO
+
+
+def test_parse_target():
+    target = parse_target({"type": "Target", "x": 3, "y": 4})
+    obstacle = parse_target({"type": "Obstacle", "x": 5, "height": 2})
+    boss = parse_target({"type": "Boss", "x": 6, "y": 1, "health": 3})
+    assert (type(target), target.position) == (Target, [(3, 4)])
+    assert (type(obstacle), obstacle.position) == (Obstacle, [(5, 0), (5, 1)])
+    assert (type(boss), boss.health) == (Boss, 3)
+
+
+def test_parse_target_errors():
+    with raises(InvalidTargetTypeError):
+        parse_target({"type": "Bird", "x": 1, "y": 1})
+    with raises(InvalidPositionError):
+        parse_target({"type": "Target", "x": -1, "y": 1})
+    with raises(InvalidHeightError):
+        parse_target({"type": "Obstacle", "x": 1, "height": 0})
+    with raises(InvalidHealthError):
+        parse_target({"type": "Boss", "x": 1, "y": 1, "health": 0})
+
+
+def test_target_entry():
+    for target in (Target(3, 4), Obstacle(5, 2), Boss(6, 1, 3)):
+        parsed = parse_target(target_entry(target))
+        assert type(parsed) is type(target)
+        assert parsed.position == target.position
+
+
+def test_level_pack_roundtrip(tmp_path):
+    path = str(tmp_path / "pack.jsonl")
+    save_pack(path, default_levels())
+    pack = LevelPack(path)
+    assert len(pack) == 5
+    for number, (attempts, targets) in enumerate(default_levels()):
+        level = pack.level(number)
+        assert level.attempts == attempts
+        assert [str(t) for t in level.targets] == [str(t) for t in targets]
+        assert [t.position for t in level.targets] == [t.position for t in targets]
+    pack.close()
+
+
+def test_level_pack_lazy():
+    lines = b'{"attempts": 1, "targets": []}\n\n{"attempts": 2, "targets": []}\n'
+    pack = LevelPack(BytesIO(lines + b"not json\n"))
+    assert pack.level(1).attempts == 2
+    assert pack[0] is pack[0]
+    assert pack.level(0) is not pack.level(0)
+    with raises(IndexError):
+        pack.targets(3)
+    with raises(ValueError):
+        pack.targets(2)
+
+
+def test_level_pack_new_levels():
+    pack = LevelPack(
+        BytesIO(b'{"attempts": 2, "targets": [{"type": "Target", "x": 32, "y": 0}]}\n')
+    )
+    played = pack[0]
+    played.simulate_attempt(45, 71)
+    assert played.result is True
+    assert pack.level(0).result is False
+    assert len(pack.level(0).targets) == 1
+
+
+def test_level_pack_line():
+    pack = LevelPack(BytesIO(b'\n{"attempts": 1, "targets": []}\n'))
+    assert pack.line(0) == '{"attempts": 1, "targets": []}\n'
+    with raises(IndexError):
+        pack.line(1)
@@ -0,0 +1,139 @@
+from lib.target import Target, Obstacle, Boss
+from lib.entities import EntityStore
+from lib.occupancy import OccupancyIndex, StoreIndex, ROW_BITS, cell_bit
+
+
+def test_occupancy_init_empty():
+    index = OccupancyIndex()
+    assert len(index) == 0
+    assert index.get((1, 0)) is None
+
+
+def test_occupancy_init():
+    obstacle = Obstacle(2, 3)
+    boss = Boss(4, 0, 2)
+    index = OccupancyIndex([obstacle, boss])
+    assert len(index) == 7
+    assert index.get((2, 2)) is obstacle
+    assert index.get((5, 1)) is boss
+    assert (2, 3) not in index
+
+
+def test_occupancy_get_first_added():
+    obstacle = Obstacle(1, 2)
+    target = Target(1, 1)
+    index = OccupancyIndex([obstacle, target])
+    assert index.get((1, 1)) is obstacle
+
+
+def test_occupancy_remove():
+    obstacle = Obstacle(1, 2)
+    target = Target(1, 1)
+    index = OccupancyIndex([obstacle, target])
+    index.remove(obstacle)
+    assert index.get((1, 1)) is target
+    assert (1, 0) not in index
+    index.remove(target)
+    assert len(index) == 0
+
+
+def test_occupancy_version():
+    target = Target(1, 1)
+    index = OccupancyIndex([target])
+    assert index.version == 1
+    index.remove(target)
+    assert index.version == 2
+
+
+def test_cell_bit():
+    assert cell_bit((0, 0)) == 0
+    assert cell_bit((3, 2)) == 2 * ROW_BITS + 3
+    assert cell_bit((-1, 2)) == -1
+    assert cell_bit((1, -1)) == -1
+    assert cell_bit((ROW_BITS, 0)) == -1
+
+
+def test_occupancy_mask():
+    boss = Boss(4, 0, 2)
+    index = OccupancyIndex([boss])
+    bits = [cell_bit(cell) for cell in boss.position]
+    assert index.mask == sum(1 << bit for bit in bits)
+
+
+def test_occupancy_mask_shared_cell():
+    obstacle = Obstacle(1, 2)
+    target = Target(1, 1)
+    index = OccupancyIndex([obstacle, target])
+    index.remove(target)
+    assert index.mask == 1 << cell_bit((1, 0)) | 1 << cell_bit((1, 1))
+    index.remove(obstacle)
+    assert index.mask == 0
+
+
+def test_occupancy_insert():
+    obstacle = Obstacle(1, 2)
+    target = Target(1, 1)
+    boss = Boss(1, 1, 1)
+    index = OccupancyIndex([obstacle, target, boss])
+    index.remove(obstacle)
+    index.remove(target)
+    index.insert(target)
+    index.insert(obstacle)
+    assert index.cells[(1, 1)] == [obstacle, target, boss]
+    assert index.get((1, 0)) is obstacle
+    assert index.mask & 1 << cell_bit((1, 0))
+
+
+def store_of(targets):
+    store = EntityStore()
+    for target in targets:
+        store.adopt(target)
+    return store
+
+
+def test_store_index_init():
+    obstacle = Obstacle(1, 2)
+    target = Target(1, 1)
+    boss = Boss(70, 0, 1)
+    store = store_of([obstacle, target, boss])
+    index = StoreIndex(store)
+    assert index.store is store
+    assert len(index) == 6
+    assert index.get((1, 1)) is obstacle
+    assert index.get((71, 1)) is boss
+    assert index.get((2, 2)) is None
+    assert (71, 0) in index
+    assert (72, 0) not in index
+    assert index.mask == 1 << cell_bit((1, 0)) | 1 << cell_bit((1, 1))
+    assert index.cells == OccupancyIndex([obstacle, target, boss]).cells
+
+
+def test_store_index_remove_insert():
+    obstacle = Obstacle(1, 2)
+    target = Target(1, 1)
+    boss = Boss(1, 1, 1)
+    store = store_of([obstacle, target, boss])
+    index = StoreIndex(store)
+    for entity, view in ((0, obstacle), (1, target)):
+        store.remove(entity)
+        index.remove(view)
+    assert index.get((1, 1)) is boss
+    assert not index.mask & 1 << cell_bit((1, 0))
+    assert index.version == 2
+    store.revive(1)
+    index.insert(target)
+    assert index.get((1, 1)) is target
+    assert index.cells[(1, 1)] == [target, boss]
+    store.remove(2)
+    index.remove(boss)
+    assert (2, 1) not in index
+    assert index.mask == 1 << cell_bit((1, 1))
+
+
+def test_store_index_skips_removed_entities():
+    store = store_of([Target(1, 1), Target(2, 1)])
+    store.remove(0)
+    index = StoreIndex(store)
+    assert (1, 1) not in index
+    assert index.get((2, 1)) is store.view(1)
+    assert len(index) == 1
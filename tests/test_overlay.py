@@ -0,0 +1,24 @@
+from pytest import importorskip
+from lib.instrumentation import enable, disable
+import os
+
+importorskip("PySide2")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from lib.overlay import StatsOverlay  # noqa: E402
+from PySide2.QtWidgets import QApplication, QLabel  # noqa: E402
+
+app = QApplication.instance() or QApplication([])
+
+
+def test_overlay_refresh():
+    plot = QLabel()
+    stats = enable()
+    try:
+        overlay = StatsOverlay(plot)
+        assert "trajectory" not in overlay.text()
+        stats.record("trajectory", 0.002, 10)
+        overlay.refresh()
+        assert "trajectory    2.00" in overlay.text()
+    finally:
+        disable()
@@ -0,0 +1,102 @@
+from lib.planner import Planner
+from lib.level import Level
+from lib.target import Target, Obstacle, Boss
+import random
+import time
+
+
+def play(level, shots):
+    for angle, force in shots:
+        level.simulate_attempt(angle, force)
+    return level.result
+
+
+def test_planner_init():
+    planner = Planner([(45, 100)])
+    assert planner.shots == [(45, 100)]
+    assert planner.explored == 0
+    assert planner.table == {}
+    assert len(Planner().shots) == 89 * 100
+
+
+def test_plan_wins_in_fewest_shots():
+    level = Level(6, [Target(16, 0), Boss(20, 0, 3), Obstacle(8, 2)])
+    shots = Planner().plan(level)
+    assert len(shots) == 4
+    assert level.attempts == 6
+    assert not level.result
+    assert play(level, shots)
+
+
+def test_plan_leaves_level_unchanged():
+    level = Level(5, [Target(16, 0), Target(20, 0)])
+    level.simulate_attempt(1, 1)
+    snapshot = level.snapshot
+    shots = Planner().plan(level)
+    assert len(shots) == 2
+    assert level.snapshot is snapshot
+    assert level.attempts == 4
+    assert len(level.targets) == 2
+
+
+def test_plan_won_level():
+    level = Level(1, [Target(16, 0)])
+    level.simulate_attempt(*Planner().plan(level)[0])
+    assert level.result
+    assert Planner().plan(level) == []
+
+
+def test_plan_not_enough_attempts():
+    level = Level(3, [Target(16, 0), Boss(20, 0, 3)])
+    planner = Planner()
+    assert planner.plan(level) is None
+    assert planner.explored == 1
+
+
+def test_plan_unreachable_target():
+    level = Level(5, [Target(16, 0), Target(10, 16)])
+    planner = Planner([(angle, 100) for angle in range(1, 30)])
+    assert planner.plan(level) is None
+    assert planner.explored == 1
+    assert len(planner.table) == 1
+
+
+def test_plan_backtracks_on_board_dependent_engine():
+    first, second = Target(10, 0), Target(20, 0)
+
+    def engine(bullet, targets, index):
+        if bullet.angle_degrees == 1:
+            return first if first in targets else None
+        return second if first in targets and second in targets else None
+
+    level = Level(2, [first, second], engine=engine)
+    planner = Planner([(1, 50), (2, 50)])
+    assert planner.plan(level) == [(2, 50), (1, 50)]
+    assert len(planner.table) == 1
+    assert play(level, [(2, 50), (1, 50)])
+
+
+def test_plan_proves_board_dependent_level_lost():
+    first, second = Target(10, 0), Target(20, 0)
+
+    def engine(bullet, targets, index):
+        if first not in targets or second not in targets:
+            return None
+        return first if bullet.angle_degrees == 1 else second
+
+    level = Level(2, [first, second], engine=engine)
+    planner = Planner([(1, 50), (2, 50)])
+    assert planner.plan(level) is None
+    assert planner.explored == 3
+
+
+def test_plan_dozen_targets_in_seconds():
+    rng = random.Random(3)
+    targets = [Target(rng.randint(3, 32), rng.randint(0, 16)) for _ in range(12)]
+    targets.append(Boss(32, 0, 3))
+    level = Level(20, targets)
+    start = time.perf_counter()
+    shots = Planner().plan(level)
+    assert time.perf_counter() - start < 10
+    assert len(shots) == 15
+    assert play(level, shots)
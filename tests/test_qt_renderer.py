@@ -0,0 +1,52 @@
+from pytest import importorskip
+from lib.target import Target, Obstacle, Boss
+from lib.level import Level
+from lib.renderer import BoardCache
+
+importorskip("PySide2")
+
+from lib.qt_renderer import QPainterRenderer  # noqa: E402
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def test_qt_renderer_sync():
+    renderer = QPainterRenderer()
+    target = Target(1, 1)
+    renderer.sync([target, Obstacle(2, 2)])
+    assert [shape.color for shape in renderer.shapes] == ["green", "saddlebrown"]
+    renderer.sync([])
+    assert renderer.shapes == []
+
+
+def test_qt_renderer_render():
+    renderer = QPainterRenderer()
+    renderer.sync([Boss(4, 0, 2)])
+    frame = renderer.render()
+    assert (frame.width, frame.height) == (1600, 800)
+    assert len(frame.data) == 1600 * 800 * 4
+
+
+def test_qt_renderer_to_png():
+    renderer = QPainterRenderer()
+    assert renderer.to_png().getvalue().startswith(PNG_SIGNATURE)
+
+
+def test_level_qt_renderer():
+    level = Level(2, [Target(32, 16)], renderer="qpainter")
+    board = bytes(level.render_board().data)
+    level.simulate_attempt(45, 100)
+    assert bytes(level.render_trajectory().data) != board
+
+
+def test_qt_renderer_caches_boards():
+    cache = BoardCache()
+    renderer = QPainterRenderer(cache)
+    renderer.sync([Target(1, 1)])
+    board = bytes(renderer.render().data)
+    renderer.set_trajectory([0, 10], [0, 10])
+    assert bytes(renderer.render().data) != board
+    renderer.hide_trajectory()
+    assert bytes(renderer.render().data) == board
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache.size == 1600 * 800 * 4
@@ -0,0 +1,181 @@
+from lib.target import Target, Obstacle, Boss
+from lib.mpl_renderer import MatplotlibRenderer
+from lib.renderer import (
+    BoardCache,
+    Renderer,
+    Frame,
+    InvalidRendererError,
+    board_key,
+    create_renderer,
+)
+from lib.level import Level
+from pytest import raises, approx
+import numpy as np
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def test_renderer_init():
+    renderer = MatplotlibRenderer()
+    assert renderer.artists == {}
+    assert renderer.axes.get_xlim() == (0, 33)
+    assert renderer.axes.get_ylim() == (0, 17)
+
+
+def test_renderer_sync():
+    target = Target(1, 1)
+    obstacle = Obstacle(2, 2)
+    renderer = MatplotlibRenderer()
+    renderer.sync([target, obstacle])
+    patch = renderer.artists[target]
+    assert patch in renderer.axes.patches
+    renderer.sync([obstacle])
+    assert target not in renderer.artists
+    assert patch not in renderer.axes.patches
+    assert len(renderer.axes.patches) == 2
+
+
+def test_renderer_to_png():
+    renderer = MatplotlibRenderer()
+    renderer.sync([Boss(4, 0, 2)])
+    assert renderer.to_png().getvalue().startswith(PNG_SIGNATURE)
+
+
+def test_level_draw_trajectory():
+    target = Target(32, 16)
+    level = Level(2, [target, Obstacle(32, 16)])
+    level.draw_board()
+    level.simulate_attempt(45, 100)
+    assert level.draw_trajectory().getvalue().startswith(PNG_SIGNATURE)
+    assert target in level.renderer.artists
+    line = level.renderer.axes.lines[0]
+    assert line.get_visible()
+    assert len(line.get_xdata()) == len(level.trajectory)
+    level.draw_board()
+    assert target not in level.renderer.artists
+    assert not line.get_visible()
+
+
+def test_renderer_render():
+    renderer = MatplotlibRenderer()
+    renderer.sync([Target(1, 1)])
+    frame = renderer.render()
+    assert (frame.width, frame.height) == (1600, 800)
+    assert frame.bytes_per_line == 6400
+    assert frame.data.nbytes == 1600 * 800 * 4
+
+
+def test_level_render_board():
+    target = Target(32, 16)
+    level = Level(2, [target])
+    frame = level.render_board()
+    board = bytes(frame.data)
+    level.simulate_attempt(45, 100)
+    assert bytes(level.render_trajectory().data) != board
+    assert bytes(level.render_board().data) != board
+
+
+def test_renderer_to_pixel():
+    renderer = Renderer()
+    assert renderer.to_pixel(0, 0) == (200, 712)
+    assert renderer.to_pixel(33, 17) == approx((1440, 96))
+
+
+def test_renderer_to_pixel_matches_matplotlib():
+    renderer = MatplotlibRenderer()
+    x, y = renderer.axes.transData.transform((16, 8))
+    assert renderer.to_pixel(16, 8) == approx((x, renderer.height - y))
+
+
+def test_create_renderer():
+    assert isinstance(create_renderer("matplotlib"), MatplotlibRenderer)
+
+
+def test_create_renderer_error():
+    with raises(InvalidRendererError):
+        create_renderer("svg")
+
+
+def test_level_renderer_error():
+    with raises(InvalidRendererError):
+        Level(1, [], renderer="svg")
+
+
+def test_frame_copy():
+    data = bytearray(4 * 2 * 3)
+    frame = Frame(2, 3, memoryview(data))
+    copy = frame.copy()
+    data[0] = 255
+    assert (copy.width, copy.height) == (2, 3)
+    assert bytes(copy.data) == bytes(4 * 2 * 3)
+
+
+def test_board_cache_lru():
+    cache = BoardCache(30)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 10)
+    cache.put("c", 3, 10)
+    assert cache.get("a") == 1
+    cache.put("d", 4, 10)
+    assert "b" not in cache
+    assert len(cache) == 3
+    assert cache.size == 30
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_board_cache_limit():
+    cache = BoardCache(30)
+    cache.put("a", 1, 40)
+    assert len(cache) == 0
+    cache.put("a", 1, 10)
+    cache.put("a", 2, 20)
+    assert cache.get("a") == 2
+    assert cache.size == 20
+    cache.clear()
+    assert cache.size == 0
+    assert len(cache) == 0
+
+
+def test_board_key():
+    boss = Boss(4, 0, 2)
+    target = Target(1, 1)
+    key = board_key([target, boss])
+    assert key == board_key([Target(1, 1), Boss(4, 0, 2)])
+    assert key != board_key([boss, target])
+    boss.hit()
+    assert board_key([target, boss]) != key
+    assert board_key([Obstacle(2, 2)]) != board_key([Obstacle(2, 3)])
+
+
+def test_renderer_caches_boards():
+    cache = BoardCache()
+    target = Target(32, 16)
+    level = Level(3, [target])
+    level._renderer = MatplotlibRenderer(cache)
+    board = bytes(level.render_board().data)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    assert level.simulate_attempt(20, 60) is None
+    trajectory = bytes(level.render_trajectory().data)
+    assert trajectory != board
+    assert bytes(level.render_board().data) == board
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    level.simulate_attempt(45, 100)
+    assert bytes(level.render_board().data) != board
+    assert len(cache) == 2
+
+
+def test_renderer_composite_matches_draw():
+    level = Level(2, [Obstacle(8, 4), Boss(16, 0, 3)])
+    level.simulate_attempt(45, 80)
+    renderer = MatplotlibRenderer(BoardCache())
+    renderer.sync(level.targets)
+    renderer.set_trajectory(*level.trajectory_xy)
+    frame = np.asarray(renderer.render().data)
+
+    renderer.axes.lines[0].set_animated(False)
+    renderer.figure.canvas.draw()
+    drawn = np.asarray(renderer.figure.canvas.buffer_rgba())
+    assert (frame != drawn).any(axis=2).sum() < 10
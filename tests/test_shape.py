@@ -0,0 +1,24 @@
+from lib.shape import Shape, CIRCLE, RECTANGLE
+from lib.target import Obstacle, Boss
+from matplotlib import pyplot as plt
+
+
+def test_shape_circle():
+    shape = Shape.circle((1, 2), 0.5, "green")
+    assert shape.kind == CIRCLE
+    assert shape.position == (1, 2)
+    assert shape.size == (0.5, 0.5)
+    assert str(shape.to_patch()) == str(plt.Circle((1, 2), 0.5, color="green"))
+
+
+def test_shape_rectangle():
+    shape = Shape.rectangle((0.5, 0), 1, 1.5, "saddlebrown")
+    assert shape.kind == RECTANGLE
+    assert shape.size == (1, 1.5)
+    rectangle = plt.Rectangle((0.5, 0), 1, 1.5, color="saddlebrown")
+    assert str(shape.to_patch()) == str(rectangle)
+
+
+def test_target_shapes():
+    assert Obstacle(1, 2).shape.position == (0.5, 0)
+    assert Boss(1, 0, 2).shape.color == "blue"
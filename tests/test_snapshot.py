@@ -0,0 +1,27 @@
+from lib.snapshot import Snapshot
+
+
+def test_snapshot_init():
+    root = Snapshot(None, 3, False)
+    child = Snapshot(root, 2, True, 1, 1, 0, True)
+    assert root.root is root
+    assert root.depth == 0
+    assert child.parent is root
+    assert child.root is root
+    assert child.depth == 1
+    assert child.attempts == 2
+    assert child.result is True
+    assert (child.entity, child.health_before, child.health_after) == (1, 1, 0)
+    assert child.removed is True
+
+
+def test_snapshot_path():
+    root = Snapshot(None, 3, False)
+    a = Snapshot(root, 2, False)
+    b = Snapshot(a, 1, False)
+    c = Snapshot(root, 2, False)
+    d = Snapshot(c, 1, False)
+    assert b.path(d) == ([b, a], [c, d])
+    assert b.path(root) == ([b, a], [])
+    assert root.path(b) == ([], [a, b])
+    assert b.path(b) == ([], [])
@@ -0,0 +1,45 @@
+from lib.bullet import Bullet
+from lib.target import Target, Obstacle, Boss
+from lib.occupancy import OccupancyIndex
+from lib.solver import speed_interval, force_interval, reaches, solve_shots
+
+
+def test_speed_interval():
+    lowest, highest = speed_interval(45, (32, 16))
+    assert 0 < lowest < 25 < highest
+
+
+def test_speed_interval_unreachable():
+    assert speed_interval(45, (33, 0)) is None
+    assert speed_interval(1, (16, 16)) is None
+
+
+def test_force_interval():
+    assert force_interval(45, (32, 16)) == (98, 100)
+
+
+def test_reaches():
+    index = OccupancyIndex([Obstacle(32, 16), Target(32, 16)])
+    assert reaches(Bullet(45, 100), (32, 16), index) is True
+    assert reaches(Bullet(45, 96), (32, 16), index) is False
+
+
+def test_solve_shots_matches_brute_force():
+    targets = [Boss(16, 0, 2), Obstacle(8, 15), Target(8, 15)]
+    index = OccupancyIndex(targets)
+    for cell in [(8, 15), (16, 1)]:
+        expected = [
+            (angle, force)
+            for angle in range(1, 90)
+            for force in range(1, 101)
+            if reaches(Bullet(angle, force), cell, index)
+        ]
+        assert solve_shots(cell, index) == expected
+
+
+def test_solve_shots_hit_target():
+    targets = [Obstacle(32, 16), Target(32, 16)]
+    index = OccupancyIndex(targets)
+    for angle, force in solve_shots((32, 16), index):
+        bullet = Bullet(angle, force)
+        assert bullet.calculate_exact_trajectory(targets) is targets[1]
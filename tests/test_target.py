@@ -14,6 +14,9 @@ def test_target_init():
     target = Target(1, 0)
     assert target._position_x == 1
     assert target._position_y == 0
+    assert target.store is None
+    assert target.entity == -1
+    assert target.health == 1
 
 
 def test_target_init_error_x():
@@ -0,0 +1,105 @@
+from lib.bullet import Bullet, InvalidAngleError, InvalidForceError
+from lib.target import Target, Obstacle, Boss
+from lib.occupancy import OccupancyIndex
+from lib.vectorized import occupancy_grid, trajectory_arrays, first_hit, sweep, MISS
+from pytest import mark, raises
+import numpy as np
+
+
+def test_occupancy_grid():
+    obstacle = Obstacle(2, 2)
+    target = Target(3, 1)
+    index = OccupancyIndex([obstacle, target])
+    grid, occupants = occupancy_grid(index)
+    assert grid.shape == (4, 2)
+    assert occupants[grid[2, 1] - 1] is obstacle
+    assert occupants[grid[3, 1] - 1] is target
+    assert grid[3, 0] == 0
+
+
+def test_occupancy_grid_updated():
+    target = Target(3, 1)
+    index = OccupancyIndex([target])
+    occupancy_grid(index)
+    index.remove(target)
+    grid, occupants = occupancy_grid(index)
+    assert not grid.any()
+    assert occupants == []
+
+
+def test_trajectory_arrays_zero_force():
+    x, y = trajectory_arrays(0, 0)
+    assert list(x) == [0, 0]
+    assert list(y) == [0, 0]
+
+
+@mark.parametrize("angle", [1, 30, 45, 60, 89])
+@mark.parametrize("force", [1, 50, 100])
+def test_trajectory_arrays_match_stepping(angle, force):
+    bullet = Bullet(angle, force)
+    bullet.calculate_trajectory([])
+    vectorized = Bullet(angle, force)
+    vectorized.calculate_vectorized_trajectory([])
+    assert vectorized.trajectory == bullet.trajectory
+    assert vectorized.position == bullet.position
+
+
+def test_first_hit_miss():
+    x, y = trajectory_arrays(10, 10)
+    assert x[-1] > 32 or y[-1] < 0
+    assert first_hit(x, y, OccupancyIndex()) == (len(x), None)
+
+
+@mark.parametrize(
+    "angle, force, targets, expected",
+    [
+        (45, 100, [Obstacle(32, 16), Target(32, 16)], 1),
+        (45, 69, [Obstacle(32, 16), Target(32, 16)], None),
+        (45, 69, [Obstacle(32, 16), Target(32, 16), Boss(28, 0, 2)], 2),
+        (45, 71, [Target(32, 0), Obstacle(16, 8), Target(16, 8)], 2),
+    ],
+)
+def test_calculate_vectorized_trajectory(angle, force, targets, expected):
+    bullet = Bullet(angle, force)
+    result = bullet.calculate_vectorized_trajectory(targets)
+    if expected is None:
+        assert result is None
+    else:
+        assert result is targets[expected]
+    stepping = Bullet(angle, force)
+    stepping.calculate_trajectory(targets)
+    assert bullet.trajectory == stepping.trajectory
+
+
+def test_sweep_matches_stepping():
+    targets = [Obstacle(32, 16), Target(32, 16), Obstacle(8, 4), Boss(16, 0, 3)]
+    index = OccupancyIndex(targets)
+    angles = list(range(1, 90, 4))
+    forces = list(range(0, 101, 5))
+    result = sweep(targets, index, angles, forces)
+    assert result.shape == (len(angles), len(forces))
+    assert result.dtype == np.int16
+    for i, angle in enumerate(angles):
+        for j, force in enumerate(forces[1:], 1):
+            hit = Bullet(angle, force).calculate_trajectory(targets)
+            expected = MISS if hit is None else targets.index(hit)
+            assert result[i, j] == expected
+    assert (result[:, 0] == MISS).all()
+
+
+def test_sweep_float32():
+    targets = [Obstacle(16, 8), Target(16, 8), Target(32, 0)]
+    index = OccupancyIndex(targets)
+    result = sweep(targets, index, [45], [71, 100], "int8", "float32")
+    assert result.dtype == np.int8
+    assert list(result[0]) == [1, MISS]
+
+
+def test_sweep_angle_error():
+    with raises(InvalidAngleError):
+        sweep([], OccupancyIndex(), [0, 45], [50])
+
+
+def test_sweep_force_error():
+    with raises(InvalidForceError):
+        sweep([], OccupancyIndex(), [45], [101])
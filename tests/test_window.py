@@ -0,0 +1,128 @@
+from pytest import importorskip
+from lib.target import Target, Obstacle
+from lib.attempt_log import ATTEMPT, START, UNDO, read_records, verify_logs
+from lib.level_pack import level_line
+from io import BytesIO
+import os
+import time
+
+importorskip("PySide2")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from lib.window import ZlePtakiWindow  # noqa: E402
+from PySide2.QtWidgets import QApplication, QMessageBox  # noqa: E402
+
+app = QApplication.instance() or QApplication([])
+
+
+def test_window_undo(monkeypatch):
+    monkeypatch.setattr(QMessageBox, "information", lambda *args: None)
+    window = ZlePtakiWindow(animate=False)
+    window.addLevel(3, [Obstacle(32, 16), Target(32, 16)])
+    window.startGame()
+    window.startLevel()
+    assert not window.ui.undoButton.isEnabled()
+
+    window.ui.AngleSlider.setValue(45)
+    window.ui.ForceSlider.setValue(90)
+    window.startAttempt()
+    assert not window.ui.undoButton.isEnabled()
+    for _ in range(500):
+        app.processEvents()
+        if not window.ui.button.text() == "Wait...":
+            break
+        time.sleep(0.01)
+
+    level = window.levels[0]
+    assert level.attempts == 2
+    assert window.ui.undoButton.isEnabled()
+    window.ui.undoButton.click()
+    assert level.attempts == 3
+    assert not window.ui.undoButton.isEnabled()
+    window.close()
+
+
+def test_window_log(monkeypatch, tmp_path):
+    monkeypatch.setattr(QMessageBox, "information", lambda *args: None)
+    path = str(tmp_path / "game.log")
+    window = ZlePtakiWindow(animate=False, log=path)
+    window.addLevel(3, [Obstacle(32, 16), Target(32, 16)])
+    window.startGame()
+    window.startLevel()
+    window.ui.AngleSlider.setValue(45)
+    window.ui.ForceSlider.setValue(90)
+    window.startAttempt()
+    for _ in range(500):
+        app.processEvents()
+        if not window.ui.button.text() == "Wait...":
+            break
+        time.sleep(0.01)
+    window.ui.undoButton.click()
+    window.close()
+
+    with open(path, "rb") as file:
+        records = list(read_records(file))
+    assert [record[:3] for record in records] == [
+        (START, 0, 0),
+        (ATTEMPT, 0, 45),
+        (UNDO, 0, 0),
+    ]
+    assert window.log is None
+
+
+def shoot(window, angle, force):
+    window.ui.AngleSlider.setValue(angle)
+    window.ui.ForceSlider.setValue(force)
+    window.ui.button.click()
+    for _ in range(500):
+        app.processEvents()
+        if not window.ui.button.text() == "Wait...":
+            break
+        time.sleep(0.01)
+
+
+def test_window_log_retried_game(monkeypatch, tmp_path):
+    monkeypatch.setattr(QMessageBox, "information", lambda *args: None)
+    path = str(tmp_path / "game.log")
+    window = ZlePtakiWindow(animate=False, log=path)
+    window.addLevel(2, [Target(16, 0), Target(32, 16)])
+    window.startGame()
+    window.ui.button.click()
+    shoot(window, 8, 95)
+    shoot(window, 10, 10)
+    assert window.ui.button.text() == "Try again"
+
+    window.ui.button.click()
+    level = window.levels[0]
+    assert level.attempts == 2
+    assert len(level.targets) == 2
+    window.ui.button.click()
+    shoot(window, 8, 95)
+    window.close()
+
+    with open(path, "rb") as file:
+        records = list(read_records(file))
+    kinds = [record[0] for record in records]
+    assert kinds == [START, ATTEMPT, ATTEMPT, START, ATTEMPT]
+    assert records[-1][-1] == 1
+    lines = [level_line(2, [Target(16, 0), Target(32, 16)])]
+    report = verify_logs([path], lines, workers=1)
+    assert report["sessions"] == 2
+    assert report["diverged"] == 0
+
+
+def test_window_start_game_reads_first_level_only():
+    class PackFile(BytesIO):
+        lines = 0
+
+        def readline(self, *args):
+            PackFile.lines += 1
+            return super().readline(*args)
+
+    line = level_line(1, [Target(16, 0)]).encode()
+    window = ZlePtakiWindow(animate=False)
+    window.loadPack(PackFile(line * 1000))
+    window.startGame()
+    window.startGame()
+    assert PackFile.lines <= 2
+    window.close()
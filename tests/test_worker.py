@@ -0,0 +1,51 @@
+from pytest import importorskip
+from lib.target import Target
+from lib.level import Level
+import os
+
+importorskip("PySide2")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from lib.worker import AttemptWorker  # noqa: E402
+from PySide2.QtCore import QThreadPool  # noqa: E402
+from PySide2.QtWidgets import QApplication  # noqa: E402
+
+app = QApplication.instance() or QApplication([])
+
+
+def test_worker_run():
+    target = Target(32, 0)
+    level = Level(2, [target], renderer="qpainter")
+    outcomes = []
+    worker = AttemptWorker(level, 45, 71)
+    worker.signals.finished.connect(outcomes.append)
+    worker.run()
+    outcome = outcomes[0]
+    assert outcome.result is target
+    assert level.result is True
+    assert (outcome.board.width, outcome.board.height) == (1600, 800)
+    assert bytes(outcome.trajectory.data) != bytes(outcome.board.data)
+
+
+def test_worker_failed():
+    level = Level(2, [Target(32, 0)], renderer="qpainter")
+    errors = []
+    worker = AttemptWorker(level, 0, 71, trajectory=False)
+    worker.signals.failed.connect(errors.append)
+    worker.run()
+    assert "Angle" in str(errors[0])
+    assert level.attempts == 2
+
+
+def test_worker_in_pool():
+    level = Level(2, [Target(32, 0)], renderer="qpainter")
+    outcomes = []
+    worker = AttemptWorker(level, 45, 80, trajectory=False)
+    worker.signals.finished.connect(outcomes.append)
+    pool = QThreadPool()
+    pool.start(worker)
+    pool.waitForDone()
+    app.processEvents()
+    assert outcomes[0].result is None
+    assert outcomes[0].trajectory is None
+    assert level.attempts == 1
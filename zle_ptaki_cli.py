@@ -0,0 +1,186 @@
+from lib.level import ENGINES
+from lib.level_pack import LevelPack, level_line
+from lib.renderer import RENDERERS
+from lib.bullet import InvalidAngleError, InvalidForceError
+from lib.attempt_log import AttemptLog
+from zle_ptaki import default_levels
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+from argparse import ArgumentParser
+from io import BytesIO
+import json
+import os
+import sys
+
+
+def default_pack(engine: str = "step", renderer: str = "matplotlib") -> LevelPack:
+    """
+    Returns the levels of the game, as played by main() in zle_ptaki.py,
+    as a level pack held in memory.
+    """
+
+    lines = "".join(
+        level_line(attempts, targets) for attempts, targets in default_levels()
+    )
+    return LevelPack(BytesIO(lines.encode()), engine, renderer)
+
+
+def play_script(
+    pack: LevelPack,
+    shots: Iterable[Tuple[int, int]],
+    trajectories: bool = False,
+    boards: Optional[str] = None,
+    script: int = 0,
+    log: Optional[AttemptLog] = None,
+) -> Iterator[dict]:
+    """
+    Plays the shots through new levels of the pack, the way the game does:
+    the next level starts when the current one is won,
+    and the game ends when a level runs out of attempts.
+    A pack without levels is won before the first shot.
+    Yields one record per attempt and a final record of the script.
+    If trajectories is True, the attempt records hold the trajectories.
+    If boards is given, the board after every attempt
+    is saved as a PNG image in that directory.
+    If log is given, the script is recorded in it as a session.
+    """
+
+    if log is not None:
+        log.start()
+    current = 0
+    result = "unfinished"
+    try:
+        level = pack.level(current)
+    except IndexError:
+        level = None
+        result = "won"
+    for number, (angle, force) in enumerate(shots):
+        if level is None:
+            break
+        try:
+            hit = level.simulate_attempt(angle, force)
+        except (InvalidAngleError, InvalidForceError) as error:
+            yield {"script": script, "shot": number, "error": str(error)}
+            result = "invalid"
+            break
+        if log is not None:
+            log.attempt(current, angle, force, hit)
+
+        record = {
+            "script": script,
+            "shot": number,
+            "level": current + 1,
+            "angle": angle,
+            "force": force,
+            "hit": None if hit is None else str(hit),
+            "attempts": level.attempts,
+            "won": level.result,
+        }
+        if trajectories:
+            record["trajectory"] = [list(point) for point in level.trajectory]
+        if boards is not None:
+            name = f"script{script}_level{current + 1}_shot{number}.png"
+            level.renderer.sync(level.targets)
+            with open(os.path.join(boards, name), "wb") as file:
+                file.write(level.draw_trajectory().getbuffer())
+        yield record
+
+        if level.result:
+            current += 1
+            try:
+                level = pack.level(current)
+            except IndexError:
+                level = None
+                result = "won"
+        elif level.attempts == 0:
+            result = "lost"
+            break
+
+    yield {"script": script, "result": result, "levels_won": current}
+
+
+def read_scripts(lines: Iterable[str]) -> Iterator[List[Tuple[int, int]]]:
+    """
+    Reads the scripts, one per line,
+    each a JSON array of [angle, force] pairs.
+    Blank lines are skipped.
+    """
+
+    for line in lines:
+        if line.strip():
+            yield [(angle, force) for angle, force in json.loads(line)]
+
+
+def run(
+    scripts: Iterable[List[Tuple[int, int]]],
+    output: TextIO,
+    pack: LevelPack,
+    trajectories: bool = False,
+    boards: Optional[str] = None,
+    log: Optional[AttemptLog] = None,
+) -> None:
+    """
+    Plays every script on new levels of the pack
+    and writes the records as JSON Lines to the output,
+    flushing each record as soon as its attempt is played.
+    If log is given, every script is recorded in it as a session.
+    """
+
+    if boards is not None:
+        os.makedirs(boards, exist_ok=True)
+    for number, shots in enumerate(scripts):
+        for record in play_script(pack, shots, trajectories, boards, number, log):
+            output.write(json.dumps(record, separators=(",", ":")) + "\n")
+            output.flush()
+
+
+def main(args: List[str]) -> int:
+    parser = ArgumentParser(
+        description="Plays scripted attempts through the levels without the GUI."
+    )
+    parser.add_argument(
+        "scripts",
+        nargs="?",
+        default="-",
+        help="file with one JSON array of [angle, force] pairs per line, "
+        "standard input by default",
+    )
+    parser.add_argument(
+        "--pack", help="level pack to play instead of the levels of the game"
+    )
+    parser.add_argument("--engine", choices=list(ENGINES), default="step")
+    parser.add_argument("--renderer", choices=list(RENDERERS), default="matplotlib")
+    parser.add_argument(
+        "--trajectories", action="store_true", help="include the trajectories"
+    )
+    parser.add_argument(
+        "--boards", metavar="DIRECTORY", help="save the boards as PNG images"
+    )
+    parser.add_argument("--log", help="append the attempts to this attempt log")
+    options = parser.parse_args(args[1:])
+
+    if options.pack is None:
+        pack = default_pack(options.engine, options.renderer)
+    else:
+        pack = LevelPack(options.pack, options.engine, options.renderer)
+    source = sys.stdin if options.scripts == "-" else open(options.scripts)
+    log = None if options.log is None else AttemptLog(options.log)
+    try:
+        run(
+            read_scripts(source),
+            sys.stdout,
+            pack,
+            options.trajectories,
+            options.boards,
+            log,
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if log is not None:
+            log.close()
+        pack.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))